@@ -0,0 +1,139 @@
+"""
+Measures the rows per second of `Imp.bulk_load` filling a large SQLite table,
+and of `Imp.export_model` in each format, with the peak memory of the process
+after each step.
+
+For comparison, the last step loads every row as a model instance, as an ad-hoc
+export script would. Peak memory only grows, so it runs last.
+
+Usage: python benchmarks/bench_export.py [--rows 1000000] [--batch-size 1000]
+"""
+
+import argparse
+import json
+import resource
+import sys
+import tempfile
+import typing as t
+from datetime import datetime, timedelta
+from pathlib import Path
+from time import perf_counter
+
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+
+from flask_imp import Imp
+from flask_imp.config import ImpConfig
+
+db = SQLAlchemy()
+
+
+class Event(db.Model):  # type: ignore[name-defined]
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(50))
+    value = db.Column(db.Float)
+    created = db.Column(db.DateTime)
+
+
+def peak_memory_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes on Linux
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def build_app(database: Path) -> t.Tuple[Flask, Imp]:
+    app = Flask("bench_export", instance_path=str(database.parent / "instance"))
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{database}"
+    imp = Imp(app, ImpConfig())
+    imp.model_registry.add("Event", Event)
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+
+    return app, imp
+
+
+def event_rows(rows: int) -> t.Iterator[t.Dict[str, t.Any]]:
+    start = datetime(2024, 1, 1)
+    for i in range(rows):
+        yield {
+            "name": f"event-{i}",
+            "value": i / 3,
+            "created": start + timedelta(seconds=i),
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    results: t.List[t.Dict[str, t.Any]] = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app, imp = build_app(Path(tmp) / "events.sqlite")
+
+        with app.app_context():
+            start = perf_counter()
+            imp.bulk_load("Event", event_rows(args.rows), batch_size=10_000)
+            seconds = perf_counter() - start
+            results.append(
+                {
+                    "method": "bulk_load",
+                    "seconds": seconds,
+                    "rows_per_second": args.rows / seconds,
+                    "peak_memory_mb": peak_memory_mb(),
+                }
+            )
+
+            for fmt in ("jsonl", "csv"):
+                output = Path(tmp) / f"events.{fmt}"
+                start = perf_counter()
+                imp.export_model_to_file("Event", output, batch_size=args.batch_size)
+                seconds = perf_counter() - start
+                results.append(
+                    {
+                        "method": f"export_model {fmt}",
+                        "seconds": seconds,
+                        "rows_per_second": args.rows / seconds,
+                        "peak_memory_mb": peak_memory_mb(),
+                    }
+                )
+
+            output = Path(tmp) / "events_all.jsonl"
+            start = perf_counter()
+            with output.open("w", encoding="utf-8") as f:
+                for event in db.session.execute(db.select(Event)).scalars().all():
+                    f.write(
+                        json.dumps(
+                            {
+                                "id": event.id,
+                                "name": event.name,
+                                "value": event.value,
+                                "created": event.created.isoformat(),
+                            }
+                        )
+                        + "\n"
+                    )
+            seconds = perf_counter() - start
+            results.append(
+                {
+                    "method": "load all jsonl",
+                    "seconds": seconds,
+                    "rows_per_second": args.rows / seconds,
+                    "peak_memory_mb": peak_memory_mb(),
+                }
+            )
+
+    print(f"{'method':<20} {'rows/s':>12} {'seconds':>9} {'peak memory':>14}")
+    for result in results:
+        print(
+            f"{result['method']:<20} {result['rows_per_second']:>12,.0f} "
+            f"{result['seconds']:>9.2f} {result['peak_memory_mb']:>11.1f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Measures the latency of reading a deep page of a large SQLite table with
+`Imp.paginate`, against the same page read with LIMIT and OFFSET.
+
+Each method reads the page at `--page` (1-based) of `--page-size` rows, ordered
+by primary key, and by a non-unique indexed column with the primary key as a
+tie-breaker. The keyset cursor for the page is taken from the last row of the
+page before it, as a client would have it. The median of `--repeat` reads is
+reported.
+
+Usage: python benchmarks/bench_pagination.py [--rows 1000000] [--page 1000] [--page-size 50]
+"""
+
+import argparse
+import statistics
+import tempfile
+import typing as t
+from datetime import datetime, timedelta
+from pathlib import Path
+from time import perf_counter
+
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+
+from flask_imp import Imp
+from flask_imp._pagination import encode_cursor, parse_order_by
+from flask_imp.config import ImpConfig
+
+db = SQLAlchemy()
+
+
+class Order(db.Model):  # type: ignore[name-defined]
+    id = db.Column(db.Integer, primary_key=True)
+    customer = db.Column(db.String(50))
+    total = db.Column(db.Float)
+    created = db.Column(db.DateTime, nullable=False)
+
+    __table_args__ = (db.Index("order_created_id", "created", "id"),)
+
+
+def build_app(database: Path) -> t.Tuple[Flask, Imp]:
+    app = Flask("bench_pagination", instance_path=str(database.parent / "instance"))
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{database}"
+    imp = Imp(app, ImpConfig())
+    imp.model_registry.add("Order", Order)
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+
+    return app, imp
+
+
+def order_rows(rows: int) -> t.Iterator[t.Dict[str, t.Any]]:
+    start = datetime(2024, 1, 1)
+    for i in range(rows):
+        yield {
+            "customer": f"customer-{i % 1000}",
+            "total": i / 7,
+            # ten orders a minute, so created is not unique
+            "created": start + timedelta(minutes=i // 10),
+        }
+
+
+def median_ms(read: t.Callable[[], t.List[t.Any]], repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        db.session.expunge_all()
+        start = perf_counter()
+        rows = read()
+        timings.append(perf_counter() - start)
+        assert rows
+    return statistics.median(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--page", type=int, default=1000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    offset = (args.page - 1) * args.page_size
+    results: t.List[t.Tuple[str, str, float]] = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        app, imp = build_app(Path(tmp) / "orders.sqlite")
+
+        with app.app_context():
+            imp.bulk_load("Order", order_rows(args.rows), batch_size=10_000)
+            meta = imp.model_meta("Order")
+
+            for order_by in ("id", "-created"):
+                order = parse_order_by(meta, order_by)
+                ordering = [
+                    getattr(Order, key).desc() if descending else getattr(Order, key)
+                    for key, descending in order
+                ]
+
+                def read_offset() -> t.List[t.Any]:
+                    return list(
+                        db.session.scalars(
+                            db.select(Order)
+                            .order_by(*ordering)
+                            .limit(args.page_size)
+                            .offset(offset)
+                        )
+                    )
+
+                last = db.session.scalars(
+                    db.select(Order).order_by(*ordering).offset(offset - 1).limit(1)
+                ).one()
+                cursor = encode_cursor(order, [getattr(last, key) for key, _ in order])
+
+                def read_keyset() -> t.List[t.Any]:
+                    return imp.paginate(
+                        "Order", order_by=order_by, after=cursor, limit=args.page_size
+                    ).items
+
+                assert [o.id for o in read_offset()] == [o.id for o in read_keyset()]
+
+                results.append(
+                    (order_by, "offset", median_ms(read_offset, args.repeat))
+                )
+                results.append(
+                    (order_by, "keyset", median_ms(read_keyset, args.repeat))
+                )
+
+    print(f"page {args.page} of {args.page_size} rows, {args.rows:,} rows in the table")
+    print(f"{'order_by':<10} {'method':<8} {'median':>10}")
+    for order_by, method, ms in results:
+        print(f"{order_by:<10} {method:<8} {ms:>7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
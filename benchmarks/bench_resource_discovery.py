@@ -0,0 +1,147 @@
+"""
+Compares the scandir-based resource discovery against the previous
+pathlib-based implementation on a synthetic tree of 10k files.
+
+Usage: python benchmarks/bench_resource_discovery.py [--folders 100] [--files 100]
+"""
+
+import argparse
+import tempfile
+import typing as t
+from pathlib import Path
+from timeit import repeat
+
+from flask_imp._utilities import discover_resources
+
+
+def legacy_process_scope(path: Path, scope: t.Union[t.List[str], str]) -> t.List[Path]:
+    if path.is_dir():
+        if path.name.startswith("."):
+            return []
+
+    if isinstance(scope, str):
+        if path.is_file():
+            if path.name == scope and path.suffix == ".py" or scope == "*":
+                return [path]
+
+        if path.is_dir():
+            return [
+                resource
+                for resource in path.iterdir()
+                if resource.name == scope
+                or scope == "*"
+                and resource.is_file()
+                and resource.suffix == ".py"
+            ]
+
+    result: list[Path] = []
+
+    if path.is_file():
+        if path.name in scope and path.suffix == ".py" or "*" in scope:
+            return [path]
+
+        return []
+
+    if path.is_dir():
+        for resource in path.iterdir():
+            if resource.name.startswith("."):
+                continue
+
+            if resource.name.startswith("__"):
+                continue
+
+            if (
+                resource.name in scope
+                or "*" in scope
+                and resource.is_file()
+                and resource.suffix == ".py"
+            ):
+                result.append(resource)
+
+    return result
+
+
+def legacy_process_folder_file_scope(
+    resources_fof: Path, scope_import: t.Dict[str, t.Union[t.List[str], str]]
+) -> t.List[Path]:
+    result: list[Path] = []
+
+    if "." in scope_import.keys():
+        if root_folder_scopes := legacy_process_scope(resources_fof, scope_import["."]):
+            result.extend(root_folder_scopes)
+
+    if "*" in scope_import.keys():
+        for resource in resources_fof.iterdir():
+            if resource in result:
+                continue
+
+            if all_folders_scopes := legacy_process_scope(resource, scope_import["*"]):
+                result.extend(all_folders_scopes)
+
+    else:
+        for resource in resources_fof.iterdir():
+            if resource.name in scope_import.keys():
+                if named_scopes := legacy_process_scope(
+                    resource, scope_import[resource.name]
+                ):
+                    result.extend(named_scopes)
+
+    return list(set(result))
+
+
+def build_tree(root: Path, folders: int, files: int) -> None:
+    for folder in range(folders):
+        path = root / f"folder_{folder}"
+        path.mkdir()
+        (path / "__init__.py").touch()
+        for file in range(files):
+            (path / f"module_{file}.py").touch()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--folders", type=int, default=100)
+    parser.add_argument("--files", type=int, default=100)
+    parser.add_argument("--number", type=int, default=5)
+    args = parser.parse_args()
+
+    scopes: t.Dict[str, t.Dict[str, t.Union[t.List[str], str]]] = {
+        "all": {"*": ["*"]},
+        "root and all": {".": ["*"], "*": ["*"]},
+        "named": {f"folder_{i}": ["*"] for i in range(0, args.folders, 2)},
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        build_tree(root, args.folders, args.files)
+        print(f"{args.folders * args.files} files in {args.folders} folders")
+
+        for label, scope_import in scopes.items():
+            legacy = legacy_process_folder_file_scope(root, scope_import)
+            current, _ = discover_resources(root, scope_import)
+            assert sorted(legacy) == current, label
+
+            legacy_time = min(
+                repeat(
+                    lambda: legacy_process_folder_file_scope(root, scope_import),
+                    number=1,
+                    repeat=args.number,
+                )
+            )
+            current_time = min(
+                repeat(
+                    lambda: discover_resources(root, scope_import),
+                    number=1,
+                    repeat=args.number,
+                )
+            )
+            print(
+                f"{label:>14}: {len(current):>6} paths, "
+                f"legacy {legacy_time * 1000:8.2f} ms, "
+                f"scandir {current_time * 1000:8.2f} ms, "
+                f"{legacy_time / current_time:5.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
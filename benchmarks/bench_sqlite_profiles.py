@@ -0,0 +1,155 @@
+"""
+Measures concurrent read and write throughput of a SQLite database with each
+`SQLiteDatabaseConfig(performance_profile=...)`.
+
+Reader and writer processes run against the same database file for a fixed time,
+each with its own engine built from the config. Readers select a random row by
+primary key, writers insert a row per transaction. Operations that fail with
+"database is locked" are counted as errors.
+
+The "fast + readonly" run uses the fast profile for writers and the readonly
+profile for readers.
+
+Usage: python benchmarks/bench_sqlite_profiles.py [--readers 4] [--writers 1] [--seconds 5]
+"""
+
+import argparse
+import multiprocessing
+import random
+import tempfile
+import typing as t
+from pathlib import Path
+from time import perf_counter
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from flask_imp.config import SQLiteDatabaseConfig
+
+RUNS: t.List[t.Tuple[str, t.Optional[str], t.Optional[str]]] = [
+    ("default", None, None),
+    ("safe", "safe", "safe"),
+    ("fast", "fast", "fast"),
+    ("fast + readonly", "fast", "readonly"),
+]
+
+ROWS = 100_000
+
+
+def engine_for(folder: Path, profile: t.Optional[str]) -> t.Any:
+    config = SQLiteDatabaseConfig(location=folder, performance_profile=profile)
+    return create_engine(config.uri(folder), **config.engine_options)
+
+
+def prepare(folder: Path, profile: t.Optional[str]) -> None:
+    engine = engine_for(folder, profile)
+    with engine.begin() as connection:
+        connection.execute(
+            text("create table items (id integer primary key, name text, value real)")
+        )
+        connection.execute(
+            text("insert into items (name, value) values (:name, :value)"),
+            [{"name": f"item-{i}", "value": i / 7} for i in range(ROWS)],
+        )
+    engine.dispose()
+
+
+def worker(
+    folder: Path,
+    profile: t.Optional[str],
+    kind: str,
+    seconds: float,
+    results: "multiprocessing.Queue[t.Tuple[str, int, int]]",
+) -> None:
+    engine = engine_for(folder, profile)
+    operations = errors = 0
+    end = perf_counter() + seconds
+
+    with engine.connect() as connection:
+        while perf_counter() < end:
+            try:
+                if kind == "read":
+                    connection.execute(
+                        text("select name, value from items where id = :id"),
+                        {"id": random.randint(1, ROWS)},
+                    ).one()
+                    connection.rollback()
+                else:
+                    connection.execute(
+                        text("insert into items (name, value) values ('new', 1)")
+                    )
+                    connection.commit()
+                operations += 1
+            except OperationalError:
+                connection.rollback()
+                errors += 1
+
+    engine.dispose()
+    results.put((kind, operations, errors))
+
+
+def run(
+    writer_profile: t.Optional[str],
+    reader_profile: t.Optional[str],
+    readers: int,
+    writers: int,
+    seconds: float,
+) -> t.Dict[str, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = Path(tmp)
+        prepare(folder, writer_profile)
+
+        results: "multiprocessing.Queue[t.Tuple[str, int, int]]" = (
+            multiprocessing.Queue()
+        )
+        processes = [
+            multiprocessing.Process(
+                target=worker, args=(folder, reader_profile, "read", seconds, results)
+            )
+            for _ in range(readers)
+        ] + [
+            multiprocessing.Process(
+                target=worker, args=(folder, writer_profile, "write", seconds, results)
+            )
+            for _ in range(writers)
+        ]
+
+        for process in processes:
+            process.start()
+
+        totals = {"read": 0, "write": 0, "errors": 0}
+        for _ in processes:
+            kind, operations, errors = results.get()
+            totals[kind] += operations
+            totals["errors"] += errors
+
+        for process in processes:
+            process.join()
+
+    return {
+        "reads_per_second": totals["read"] / seconds,
+        "writes_per_second": totals["write"] / seconds,
+        "errors": totals["errors"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=1)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{'profile':<18} {'reads/s':>12} {'writes/s':>12} {'errors':>8}")
+    for name, writer_profile, reader_profile in RUNS:
+        result = run(
+            writer_profile, reader_profile, args.readers, args.writers, args.seconds
+        )
+        print(
+            f"{name:<18} {result['reads_per_second']:>12,.0f} "
+            f"{result['writes_per_second']:>12,.0f} {result['errors']:>8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""
+Measures how the startup time of an Imp app scales with the size of the app.
+
+Apps are generated using the same file templates as the flask-imp CLI, with
+N blueprints x M resource files x K models, and blueprints nested D levels deep.
+
+Each measurement runs in a new process, so module imports are not cached.
+The median of each step is reported as JSON.
+
+Usage: python benchmarks/bench_startup.py --blueprints 1,10,50 --resources 1,10 \
+    --models 1,20 --depth 0,2 --repeat 3 --output startup.json
+"""
+
+import argparse
+import io
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import typing as t
+from contextlib import redirect_stdout
+from pathlib import Path
+from time import perf_counter
+
+from flask_imp import __version__
+from flask_imp._cli.blueprint import add_blueprint
+from flask_imp._cli.filelib.blueprint import blueprint_resources_index_py
+from flask_imp._cli.filelib.extensions import extensions_init_full_py
+from flask_imp._cli.filelib.init import init_full_py
+from flask_imp._cli.filelib.models import models_example_user_table_py
+from flask_imp._cli.filelib.resources import resources_routes_py
+
+STEPS = [
+    "init_app",
+    "import_resources",
+    "import_blueprints",
+    "import_models",
+    "first_request",
+]
+
+
+def generate_blueprint(
+    parent: Path, name: str, folder: str, resources: int, depth: int
+) -> None:
+    add_blueprint(name=name, folder=folder, _cwd=parent)
+    blueprint = parent / folder / name if folder != "." else parent / name
+
+    for i in range(1, resources):
+        (blueprint / "resources" / f"index_{i}.py").write_text(
+            blueprint_resources_index_py()
+            .replace('"/"', f'"/page-{i}"')
+            .replace("def index()", f"def index_{i}()"),
+            encoding="utf-8",
+        )
+
+    if depth > 0:
+        nested = f"{name}_nested"
+        generate_blueprint(blueprint, nested, ".", resources, depth - 1)
+        with (blueprint / "__init__.py").open("a", encoding="utf-8") as init_py:
+            init_py.write(f'bp.import_nested_blueprint("{nested}")\n')
+
+
+def generate_app(
+    root: Path, name: str, blueprints: int, resources: int, models: int, depth: int
+) -> Path:
+    """
+    Generates an app package in the root folder, returns the app folder.
+    """
+    app_folder = root / name
+
+    for folder in ["extensions", "resources/routes", "blueprints", "models"]:
+        (app_folder / folder).mkdir(parents=True)
+
+    (app_folder / "__init__.py").write_text(
+        init_full_py(app_name=name, secret_key="benchmark"), encoding="utf-8"
+    )
+    (app_folder / "extensions" / "__init__.py").write_text(
+        extensions_init_full_py(), encoding="utf-8"
+    )
+
+    for i in range(resources):
+        (app_folder / "resources" / "routes" / f"routes_{i}.py").write_text(
+            resources_routes_py()
+            .replace("example--resources", f"example--resources-{i}")
+            .replace("example_route", f"example_route_{i}"),
+            encoding="utf-8",
+        )
+
+    with redirect_stdout(io.StringIO()):
+        for i in range(blueprints):
+            generate_blueprint(app_folder, f"bp_{i}", "blueprints", resources, depth)
+
+    for i in range(models):
+        (app_folder / "models" / f"model_{i}.py").write_text(
+            models_example_user_table_py(app_name=name).replace(
+                "ExampleUserTable", f"ExampleUserTable{i}"
+            ),
+            encoding="utf-8",
+        )
+
+    return app_folder
+
+
+def measure(root: Path, name: str) -> t.Dict[str, float]:
+    """
+    Boots the generated app step by step, returns the seconds taken by each step.
+    """
+    sys.path.insert(0, str(root))
+
+    from flask import Flask
+    from flask_imp.config import DatabaseConfig, ImpConfig
+
+    extensions = __import__(f"{name}.extensions", fromlist=["imp", "db"])
+    imp, db = extensions.imp, extensions.db
+
+    app = Flask(
+        name,
+        static_url_path="/",
+        instance_path=str(root / name / "instance"),
+    )
+    app.secret_key = "benchmark"
+
+    timings: t.Dict[str, float] = {}
+
+    start = perf_counter()
+    imp.init_app(app, ImpConfig(database_main=DatabaseConfig(dialect="sqlite")))
+    timings["init_app"] = perf_counter() - start
+
+    start = perf_counter()
+    imp.import_resources()
+    timings["import_resources"] = perf_counter() - start
+
+    start = perf_counter()
+    imp.import_blueprints("blueprints")
+    timings["import_blueprints"] = perf_counter() - start
+
+    start = perf_counter()
+    imp.import_models("models")
+    db.init_app(app)
+    timings["import_models"] = perf_counter() - start
+
+    path = "/bp_0/" if "bp_0" in app.blueprints else "/example--resources-0"
+    start = perf_counter()
+    response = app.test_client().get(path)
+    timings["first_request"] = perf_counter() - start
+
+    if response.status_code != 200:
+        raise RuntimeError(f"First request to {path} returned {response.status_code}")
+
+    timings["total"] = sum(timings.values())
+    return timings
+
+
+def run(root: Path, name: str, repeat: int) -> t.Dict[str, float]:
+    """
+    Measures the generated app in new processes, returns the median of each step.
+    """
+    runs = []
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, __file__, "--measure", str(root), name],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        runs.append(json.loads(result.stdout))
+
+    return {step: statistics.median(r[step] for r in runs) for step in runs[0]}
+
+
+def count_files(folder: Path) -> int:
+    return sum(len(files) for _, _, files in os.walk(folder))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+
+    def int_list(value: str) -> t.List[int]:
+        return [int(v) for v in value.split(",")]
+
+    parser.add_argument("--blueprints", type=int_list, default=[1, 10, 50])
+    parser.add_argument("--resources", type=int_list, default=[1, 10])
+    parser.add_argument("--models", type=int_list, default=[1, 20])
+    parser.add_argument("--depth", type=int_list, default=[0, 2])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path, default=None)
+    parser.add_argument("--measure", nargs=2, metavar=("ROOT", "NAME"))
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(Path(args.measure[0]), args.measure[1])))
+        return
+
+    results = []
+    grid = itertools.product(args.blueprints, args.resources, args.models, args.depth)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for i, (blueprints, resources, models, depth) in enumerate(grid):
+            root = Path(tmp) / f"run_{i}"
+            name = f"bench_app_{i}"
+            app_folder = generate_app(root, name, blueprints, resources, models, depth)
+
+            result = {
+                "blueprints": blueprints,
+                "resources": resources,
+                "models": models,
+                "depth": depth,
+                "files": count_files(app_folder),
+                **run(root, name, args.repeat),
+            }
+            results.append(result)
+
+            print(
+                f"N={blueprints:<4} M={resources:<4} K={models:<4} D={depth:<2} "
+                + " ".join(f"{step}={result[step] * 1000:.1f}ms" for step in STEPS)
+                + f" total={result['total'] * 1000:.1f}ms",
+                file=sys.stderr,
+            )
+
+    report = {
+        "flask_imp": __version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Compares the cost of looking up a blueprint template with Flask's dispatching
+loader and the Imp indexed loader, as the number of blueprints grows.
+
+The template looked up belongs to the last blueprint registered, the worst case
+for the dispatching loader. Lookups bypass the Jinja template cache, this is the
+cost paid on each cache miss, and on each check for changes when auto reload is on.
+
+The uncached column clears the resolved source cache before each lookup,
+showing the cost of the prefix index alone.
+
+Usage: python benchmarks/bench_template_loader.py [--blueprints 10,50,150,300]
+"""
+
+import argparse
+import tempfile
+import typing as t
+from pathlib import Path
+from timeit import repeat
+
+from flask import Blueprint, Flask
+from flask.templating import DispatchingJinjaLoader
+
+from flask_imp._templating import IndexedJinjaLoader
+
+
+def build_app(root: Path, blueprints: int) -> Flask:
+    app = Flask("bench_app", root_path=str(root))
+
+    for i in range(blueprints):
+        name = f"bp_{i}"
+        template_folder = root / name / "templates" / name
+        template_folder.mkdir(parents=True)
+        (template_folder / "index.html").write_text(f"{name}", encoding="utf-8")
+        app.register_blueprint(
+            Blueprint(
+                name, name, root_path=str(root / name), template_folder="templates"
+            )
+        )
+
+    return app
+
+
+def time_lookup(
+    app: Flask,
+    loader: DispatchingJinjaLoader,
+    template: str,
+    number: int,
+    setup: t.Callable[[], t.Any] = lambda: None,
+) -> float:
+    def lookup() -> None:
+        setup()
+        loader.get_source(app.jinja_env, template)
+
+    with app.app_context():
+        lookup()
+        return min(repeat(lookup, number=number, repeat=5)) / number
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--blueprints",
+        type=lambda value: [int(v) for v in value.split(",")],
+        default=[10, 50, 150, 300],
+    )
+    parser.add_argument("--number", type=int, default=200)
+    args = parser.parse_args()
+
+    results: t.List[t.Tuple[int, float, float, float]] = []
+
+    for blueprints in args.blueprints:
+        with tempfile.TemporaryDirectory() as tmp:
+            app = build_app(Path(tmp), blueprints)
+            template = f"bp_{blueprints - 1}/index.html"
+
+            dispatching = time_lookup(
+                app, DispatchingJinjaLoader(app), template, args.number
+            )
+            indexed_loader = IndexedJinjaLoader(app)
+            indexed = time_lookup(app, indexed_loader, template, args.number)
+            uncached = time_lookup(
+                app,
+                indexed_loader,
+                template,
+                args.number,
+                setup=indexed_loader._sources.clear,
+            )
+            results.append((blueprints, dispatching, indexed, uncached))
+
+    print(f"{'blueprints':>10} {'dispatching':>14} {'indexed':>14} {'uncached':>14}")
+    for blueprints, dispatching, indexed, uncached in results:
+        print(
+            f"{blueprints:>10} {dispatching * 1e6:>11.1f} us "
+            f"{indexed * 1e6:>11.1f} us {uncached * 1e6:>11.1f} us"
+        )
+
+
+if __name__ == "__main__":
+    main()
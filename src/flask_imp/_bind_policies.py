@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from time import perf_counter
+
+from flask import Flask, appcontext_pushed
+from sqlalchemy.pool import QueuePool
+
+if t.TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+
+
+class LazyEngines(t.Dict[t.Optional[str], "Engine"]):
+    """
+    !! Private class !!
+
+    Replaces the dict of engines that Flask-SQLAlchemy keeps for an app, and
+    creates the engine of a lazy bind the first time it is looked up.
+
+    Iterating over the dict, and its length, only count the engines that have
+    been created. Functions in `BindPolicies.created` are called with each
+    engine created here, so code that iterates over the engines can pick up
+    the engines created later.
+    """
+
+    def __init__(
+        self,
+        engines: t.Dict[t.Optional[str], Engine],
+        bind_policies: BindPolicies,
+        create_engine: t.Callable[[str, t.Union[str, t.Dict[str, t.Any]]], Engine],
+    ) -> None:
+        super().__init__(engines)
+        self.bind_policies = bind_policies
+        self.create_engine = create_engine
+        self._lock = Lock()
+
+    def __contains__(self, key: object) -> bool:
+        return super().__contains__(key) or key in self.bind_policies.lazy
+
+    def __missing__(self, key: t.Optional[str]) -> Engine:
+        if key is None or key not in self.bind_policies.lazy:
+            raise KeyError(key)
+
+        with self._lock:
+            if not super().__contains__(key):
+                engine = self.create_engine(key, self.bind_policies.lazy[key])
+                self[key] = engine
+                for created in self.bind_policies.created:
+                    created(engine)
+            return super().__getitem__(key)
+
+    def get(self, key: t.Optional[str], default: t.Any = None) -> t.Any:
+        return self[key] if key in self else default
+
+
+class BindPolicies:
+    """
+    !! Private class !!
+
+    Holds the binds that are created on first use, and the binds that open
+    connections when they are warmed up, with the number of connections.
+
+    Lazy binds rely on the private engine methods of Flask-SQLAlchemy 3.1,
+    `_app_engines`, `_make_engine` and `_apply_driver_defaults`, `install`
+    raises a RuntimeError if they are missing.
+    """
+
+    lazy: t.Dict[str, t.Union[str, t.Dict[str, t.Any]]]
+    eager: t.Dict[t.Optional[str], int]
+    created: t.List[t.Callable[[Engine], None]]
+    installed: t.List[t.Callable[[], None]]
+
+    def __init__(self) -> None:
+        self.lazy = {}
+        self.eager = {}
+        self.created = []
+        self.installed = []
+        self._apps: t.Set[Flask] = set()
+
+    def add_lazy(
+        self, app: Flask, bind_key: str, bind: t.Union[str, t.Dict[str, t.Any]]
+    ) -> None:
+        self.lazy[bind_key] = bind
+        self._listen(app)
+
+    def add_eager(
+        self, app: Flask, bind_key: t.Optional[str], connections: int
+    ) -> None:
+        self.eager[bind_key] = connections
+        self._listen(app)
+
+    def install(self, app: Flask, **kwargs: t.Any) -> None:
+        """
+        Once Flask-SQLAlchemy is set up on the app, wraps its engines in LazyEngines
+        if there are lazy binds, then calls the functions in `installed`.
+        Stops listening to app contexts of the app once installed.
+        """
+        db = app.extensions.get("sqlalchemy")
+        if db is None:
+            return
+
+        if self.lazy and not all(
+            hasattr(db, name)
+            for name in ("_app_engines", "_make_engine", "_apply_driver_defaults")
+        ):
+            raise RuntimeError(
+                "Lazy binds are not supported by this version of Flask-SQLAlchemy"
+            )
+
+        appcontext_pushed.disconnect(self.install, app)
+
+        if self.lazy:
+            self._wrap_engines(app, db)
+
+        for installed in self.installed:
+            installed()
+
+    def _listen(self, app: Flask) -> None:
+        if app not in self._apps:
+            appcontext_pushed.connect(self.install, app, weak=False)
+            self._apps.add(app)
+
+    def _wrap_engines(self, app: Flask, db: t.Any) -> None:
+        engines = db._app_engines.get(app)
+        if engines is None or isinstance(engines, LazyEngines):
+            return
+
+        def create_engine(
+            bind_key: str, bind: t.Union[str, t.Dict[str, t.Any]]
+        ) -> Engine:
+            options = dict(bind) if isinstance(bind, dict) else {"url": bind}
+            echo = app.config.get("SQLALCHEMY_ECHO", False)
+            options.setdefault("echo", echo)
+            options.setdefault("echo_pool", echo)
+            db._apply_driver_defaults(options, app)
+            return t.cast("Engine", db._make_engine(bind_key, options, app))
+
+        db._app_engines[app] = LazyEngines(engines, self, create_engine)
+
+
+def warm_engine(engine: Engine, connections: int) -> t.Dict[str, t.Any]:
+    """
+    !! Private function !!
+
+    Opens the connections at the same time, then returns them to the pool.
+    A queue pool keeps no more than its size, so no more are opened.
+    """
+    if isinstance(engine.pool, QueuePool):
+        connections = min(connections, engine.pool.size())
+
+    opened = []
+    start = perf_counter()
+
+    try:
+        for _ in range(connections):
+            opened.append(engine.connect())
+        error = None
+    except Exception as e:
+        error = str(e)
+    finally:
+        for connection in opened:
+            connection.close()
+
+    return {
+        "connections": len(opened),
+        "seconds": perf_counter() - start,
+        "error": error,
+    }
+
+
+def warm_engines(
+    engines: t.Dict[t.Optional[str], t.Tuple[Engine, int]],
+    max_workers: t.Optional[int] = None,
+) -> t.Dict[t.Optional[str], t.Dict[str, t.Any]]:
+    """
+    !! Private function !!
+
+    Warms up the engines in parallel, one thread per engine unless
+    `max_workers` is set, and returns the result of each by bind key.
+    """
+    if not engines:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(engines)) as executor:
+        futures = {
+            bind_key: executor.submit(warm_engine, engine, connections)
+            for bind_key, (engine, connections) in engines.items()
+        }
+
+    return {bind_key: future.result() for bind_key, future in futures.items()}
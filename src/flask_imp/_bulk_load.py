@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+import base64
+import csv
+import json
+import typing as t
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from itertools import islice
+from pathlib import Path
+
+from flask import current_app
+from sqlalchemy import JSON, Column, inspect
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql.expression import Insert
+
+from ._identity_cache import identities_written
+from ._query_cache import table_tag, tables_written
+
+IMPORT_FORMATS = ("jsonl", "csv")
+
+TRUE_STRINGS = {"1", "true", "t", "yes", "y", "on"}
+
+
+def parse_bool(value: str) -> bool:
+    """
+    !! Private function !!
+    """
+    return value.lower() in TRUE_STRINGS
+
+
+def parse_timedelta(value: str) -> timedelta:
+    """
+    !! Private function !!
+    """
+    return timedelta(seconds=float(value))
+
+
+def unchanged(value: t.Any) -> t.Any:
+    """
+    !! Private function !!
+    """
+    return value
+
+
+def empty_to_none(value: t.Any) -> t.Any:
+    """
+    !! Private function !!
+    """
+    return None if value == "" else value
+
+
+def parse_json(value: t.Any) -> t.Any:
+    """
+    !! Private function !!
+    """
+    return json.loads(value) if value != "" else None
+
+
+def import_converter(
+    column: Column[t.Any], from_csv: bool = False
+) -> t.Callable[[t.Any], t.Any]:
+    """
+    !! Private function !!
+
+    Returns a function that converts string values read from JSON lines or CSV
+    to the Python type of the column, the reverse of the conversions made by
+    the exporter. Other values are returned as they are.
+
+    An empty string is None for columns that are not strings, as CSV has no
+    other way to write None. The values of JSON columns are decoded if they
+    were read from CSV.
+    """
+    if from_csv and isinstance(column.type, JSON):
+        return parse_json
+
+    python_type: t.Any
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        python_type = None
+
+    if python_type is str:
+        return unchanged
+
+    parse: t.Callable[[str], t.Any]
+
+    if python_type in (datetime, date, time):
+        parse = python_type.fromisoformat
+    elif python_type is bool:
+        parse = parse_bool
+    elif python_type is bytes:
+        parse = base64.b64decode
+    elif python_type is timedelta:
+        parse = parse_timedelta
+    elif python_type in (int, float, Decimal):
+        parse = python_type
+    elif column.nullable:
+        return empty_to_none
+    else:
+        return unchanged
+
+    def convert(value: t.Any) -> t.Any:
+        if isinstance(value, str):
+            return parse(value) if value != "" else None
+        if python_type is timedelta and isinstance(value, (int, float)):
+            return timedelta(seconds=value)
+        return value
+
+    return convert
+
+
+def read_rows(path: Path, fmt: str) -> t.Iterator[t.Dict[str, t.Any]]:
+    """
+    !! Private function !!
+
+    Yields the rows of a JSON lines or CSV file one at a time.
+    """
+    with path.open(encoding="utf-8", newline="") as f:
+        if fmt == "csv":
+            yield from csv.DictReader(f)
+            return
+
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def insert_statement(
+    connection: Connection,
+    table: t.Any,
+    primary_keys: t.List[str],
+    keys: t.Iterable[str],
+    upsert: bool,
+) -> Insert:
+    """
+    !! Private function !!
+
+    Returns the insert statement for the table, updating the given keys of
+    existing rows with the same primary key if `upsert` is set.
+    """
+    if not upsert:
+        return t.cast(Insert, table.insert())
+
+    update = [key for key in keys if key not in primary_keys]
+    dialect = connection.dialect.name
+
+    if dialect == "sqlite":
+        sqlite_statement = sqlite.insert(table)
+        if not update:
+            return sqlite_statement.on_conflict_do_nothing(index_elements=primary_keys)
+        return sqlite_statement.on_conflict_do_update(
+            index_elements=primary_keys,
+            set_={key: sqlite_statement.excluded[key] for key in update},
+        )
+
+    if dialect == "postgresql":
+        pg_statement = postgresql.insert(table)
+        if not update:
+            return pg_statement.on_conflict_do_nothing(index_elements=primary_keys)
+        return pg_statement.on_conflict_do_update(
+            index_elements=primary_keys,
+            set_={key: pg_statement.excluded[key] for key in update},
+        )
+
+    if dialect in ("mysql", "mariadb"):
+        mysql_statement = mysql.insert(table)
+        return mysql_statement.on_duplicate_key_update(
+            {key: mysql_statement.inserted[key] for key in update or primary_keys}
+        )
+
+    raise ValueError(f"Upsert is not supported for the {dialect} dialect")
+
+
+def bulk_load_rows(
+    model: t.Any,
+    rows: t.Iterable[t.Mapping[str, t.Any]],
+    batch_size: int,
+    upsert: bool = False,
+    from_csv: bool = False,
+) -> int:
+    """
+    !! Private function !!
+
+    Inserts the rows into the model's table `batch_size` rows at a time, with
+    executemany calls on the session's connection for the model's bind.
+
+    Rows are keyed by the attribute names of the model's columns, as exported.
+    Rows may leave out columns, which are then set to their defaults. Each run
+    of rows in a batch with the same keys is inserted with one executemany call.
+    Commits the session once all rows are inserted.
+    """
+    db = current_app.extensions["sqlalchemy"]
+    mapper = inspect(model)
+    table = mapper.local_table
+    columns = {attr.key: attr.columns[0] for attr in mapper.column_attrs}
+    converters = {
+        key: import_converter(column, from_csv) for key, column in columns.items()
+    }
+    primary_keys = [column.key for column in mapper.primary_key]
+
+    connection = db.session.connection(bind_arguments={"mapper": mapper})
+    statements: t.Dict[t.Tuple[str, ...], Insert] = {}
+
+    loaded = 0
+    iterator = iter(rows)
+
+    while batch := list(islice(iterator, batch_size)):
+        runs: t.List[t.Tuple[t.Tuple[str, ...], t.List[t.Mapping[str, t.Any]]]] = []
+
+        for number, row in enumerate(batch, start=loaded + 1):
+            # csv.DictReader puts the cells past the end of the header under None
+            if None in row:
+                raise ValueError(f"Row {number} has more cells than the header")
+
+            unknown = set(row) - columns.keys()
+            if unknown:
+                raise ValueError(
+                    f"Row {number}: {model.__name__} has no columns named: "
+                    f"{', '.join(sorted(unknown))}"
+                )
+
+            keys = tuple(key for key in columns if key in row)
+            if not runs or runs[-1][0] != keys:
+                runs.append((keys, []))
+            runs[-1][1].append(row)
+
+        for keys, run in runs:
+            column_keys = tuple(columns[key].key for key in keys)
+            statement = statements.get(column_keys)
+            if statement is None:
+                statement = insert_statement(
+                    connection, table, primary_keys, column_keys, upsert
+                )
+                statements[column_keys] = statement
+
+            connection.execute(
+                statement,
+                [
+                    {
+                        column_key: converters[key](row[key])
+                        for key, column_key in zip(keys, column_keys)
+                    }
+                    for row in run
+                ],
+            )
+
+        loaded += len(batch)
+
+    tables_written(db.session, [table_tag(table)])
+    if upsert:
+        identities_written(db.session, model)
+    db.session.commit()
+    return loaded
@@ -1,9 +1,16 @@
+import typing as t
+from pathlib import Path
+
 import click
 
 from .blueprint import add_api_blueprint as _add_api_blueprint
 from .blueprint import add_blueprint as _add_blueprint
+from .export import export_model as _export_model
 from .helpers import Sprinkles as Sp
 from .init import init_app as _init_app
+from .profile import profile_startup as _profile_startup
+from .static import fingerprint_static as _fingerprint_static
+from .templates import warm_templates as _warm_templates
 from .. import __version__
 
 
@@ -90,3 +97,136 @@ def init_new_app(name: str, full: bool, slim: bool, minimal: bool) -> None:
         set_name = name
 
     _init_app(set_name, full, slim, minimal)
+
+
+@cli.command("profile", help="Profile the imports of a flask-imp app.")
+@click.option(
+    "-a",
+    "--app",
+    "app_import_path",
+    nargs=1,
+    default=None,
+    help="The Flask app or factory to load, same as flask --app.",
+)
+@click.option(
+    "-j",
+    "--json",
+    "json_file",
+    nargs=1,
+    default=None,
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Write the startup profile to this file as JSON.",
+)
+@click.option(
+    "-m",
+    "--min-ms",
+    nargs=1,
+    default=0.0,
+    type=float,
+    help="Hide steps that took less than this many milliseconds.",
+)
+def profile_startup(
+    app_import_path: t.Optional[str], json_file: t.Optional[Path], min_ms: float
+) -> None:
+    _profile_startup(app_import_path, json_file, min_ms)
+
+
+@cli.command("templates", help="Compile the templates of a flask-imp app.")
+@click.option(
+    "-a",
+    "--app",
+    "app_import_path",
+    nargs=1,
+    default=None,
+    help="The Flask app or factory to load, same as flask --app.",
+)
+@click.option(
+    "-j",
+    "--json",
+    "json_file",
+    nargs=1,
+    default=None,
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Write the report to this file as JSON.",
+)
+def warm_templates(
+    app_import_path: t.Optional[str], json_file: t.Optional[Path]
+) -> None:
+    _warm_templates(app_import_path, json_file)
+
+
+@cli.command("static", help="Fingerprint the static files of a flask-imp app.")
+@click.option(
+    "-a",
+    "--app",
+    "app_import_path",
+    nargs=1,
+    default=None,
+    help="The Flask app or factory to load, same as flask --app.",
+)
+@click.option(
+    "--gzip/--no-gzip",
+    default=True,
+    help="Write gzip compressed copies of compressible files.",
+)
+def fingerprint_static(app_import_path: t.Optional[str], gzip: bool) -> None:
+    _fingerprint_static(app_import_path, gzip)
+
+
+@cli.command("export", help="Export the rows of a model as JSON lines or CSV.")
+@click.option(
+    "-a",
+    "--app",
+    "app_import_path",
+    nargs=1,
+    default=None,
+    help="The Flask app or factory to load, same as flask --app.",
+)
+@click.option(
+    "-m",
+    "--model",
+    nargs=1,
+    required=True,
+    help="The class name of the model to export.",
+)
+@click.option(
+    "-o",
+    "--output",
+    nargs=1,
+    default=None,
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="The file to write to, the rows are written to stdout if not given.",
+)
+@click.option(
+    "-f",
+    "--format",
+    "fmt",
+    nargs=1,
+    default=None,
+    type=click.Choice(["jsonl", "json", "csv"]),
+    help="The export format, defaults to the suffix of the output file, or jsonl.",
+)
+@click.option(
+    "-b",
+    "--batch-size",
+    nargs=1,
+    default=1000,
+    type=int,
+    help="The number of rows to fetch at a time.",
+)
+@click.option(
+    "-c",
+    "--column",
+    "columns",
+    multiple=True,
+    help="A column to export, can be given more than once. Defaults to all columns.",
+)
+def export_model(
+    app_import_path: t.Optional[str],
+    model: str,
+    output: t.Optional[Path],
+    fmt: t.Optional[str],
+    batch_size: int,
+    columns: t.Tuple[str, ...],
+) -> None:
+    _export_model(app_import_path, model, output, fmt, batch_size, columns or None)
@@ -0,0 +1,40 @@
+import sys
+import typing as t
+from pathlib import Path
+from time import perf_counter
+
+import click
+
+from .helpers import Sprinkles as Sp
+from .helpers import load_app
+
+
+def export_model(
+    app_import_path: t.Optional[str],
+    model: str,
+    output: t.Optional[Path],
+    fmt: t.Optional[str],
+    batch_size: int,
+    columns: t.Optional[t.Sequence[str]] = None,
+) -> None:
+    app = load_app(app_import_path)
+    imp = app.extensions.get("imp")
+
+    if imp is None:
+        click.echo(f"{Sp.FAIL}The app was not initialized with flask-imp.{Sp.END}")
+        return
+
+    with app.app_context():
+        if output is None:
+            for chunk in imp.export_model(model, fmt or "jsonl", batch_size, columns):
+                sys.stdout.write(chunk)
+            return
+
+        start = perf_counter()
+        imp.export_model_to_file(model, output, fmt, batch_size, columns)
+
+    click.echo(
+        f"{Sp.OKGREEN}Exported {model} to {output} ({output.stat().st_size} bytes) "
+        f"in {perf_counter() - start:.2f} s{Sp.END}",
+        err=True,
+    )
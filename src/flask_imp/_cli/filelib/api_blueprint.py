@@ -24,4 +24,19 @@ def include(bp: ImpBlueprint):
     @bp.route("/", methods=["GET"])
     def index():
         return {"message": "Hello, World!"}
+
+    # List the rows of a model a page at a time, pass the "next_cursor" of a
+    # page as ?after= to get the next page:
+    #
+    # from flask import current_app, request
+    #
+    # @bp.route("/orders", methods=["GET"])
+    # def orders():
+    #     imp = current_app.extensions["imp"]
+    #     return imp.paginate(
+    #         "Order",
+    #         order_by="-created",
+    #         after=request.args.get("after"),
+    #         limit=min(request.args.get("limit", 50, type=int), 100),
+    #     ).as_dict()
 """
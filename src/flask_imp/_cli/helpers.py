@@ -3,6 +3,9 @@ import typing as t
 
 import click
 
+if t.TYPE_CHECKING:
+    from flask import Flask
+
 
 def strip_leading_slash(url_prefix: str) -> str:
     if url_prefix.startswith("/"):
@@ -67,3 +70,24 @@ def build(
             click.echo(
                 f"{Sprinkles.WARNING}{building} file already exists: {file}, skipping{Sprinkles.END}"
             )
+
+
+def load_app(
+    app_import_path: t.Optional[str], profile_startup: bool = False
+) -> "Flask":
+    """
+    Loads the Flask app in the same way as the Flask CLI --app option,
+    falls back to the FLASK_APP environment variable or app.py / wsgi.py
+
+    profile_startup turns on the startup profile of the Imp instances
+    created while the app is loaded.
+    """
+    from flask.cli import ScriptInfo
+
+    from .._profiler import PROFILE_STARTUP
+
+    token = PROFILE_STARTUP.set(profile_startup)
+    try:
+        return ScriptInfo(app_import_path=app_import_path).load_app()
+    finally:
+        PROFILE_STARTUP.reset(token)
@@ -0,0 +1,29 @@
+import typing as t
+from pathlib import Path
+
+import click
+
+from .helpers import Sprinkles as Sp
+from .helpers import load_app
+
+
+def profile_startup(
+    app_import_path: t.Optional[str],
+    json_file: t.Optional[Path] = None,
+    min_ms: float = 0.0,
+) -> None:
+    app = load_app(app_import_path, profile_startup=True)
+    imp = app.extensions.get("imp")
+
+    if imp is None or imp.startup_profile is None:
+        click.echo(f"{Sp.FAIL}The app was not initialized with flask-imp.{Sp.END}")
+        return
+
+    imp.startup_profile.stop()
+
+    if json_file:
+        json_file.write_text(imp.startup_profile.as_json(), encoding="utf-8")
+        click.echo(f"{Sp.OKGREEN}Startup profile written to {json_file}{Sp.END}")
+        return
+
+    click.echo(imp.startup_profile.render(min_seconds=min_ms / 1000))
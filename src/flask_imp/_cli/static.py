@@ -0,0 +1,25 @@
+import typing as t
+
+import click
+
+from .helpers import Sprinkles as Sp
+from .helpers import load_app
+
+
+def fingerprint_static(app_import_path: t.Optional[str], gzip: bool = True) -> None:
+    app = load_app(app_import_path)
+    imp = app.extensions.get("imp")
+
+    if imp is None:
+        click.echo(f"{Sp.FAIL}The app was not initialized with flask-imp.{Sp.END}")
+        return
+
+    files = imp.fingerprint_static(compress=gzip)
+
+    for endpoint, names in files.items():
+        gzipped = len(imp.static_files.gzipped.get(endpoint, ()))
+        click.echo(f"{len(names):>6} files ({gzipped} gzipped) in {endpoint}")
+
+    click.echo(
+        f"{Sp.OKGREEN}Static manifest written to {imp.static_files.manifest_path}{Sp.END}"
+    )
@@ -0,0 +1,45 @@
+import json
+import typing as t
+from pathlib import Path
+
+import click
+
+from .helpers import Sprinkles as Sp
+from .helpers import load_app
+
+
+def warm_templates(
+    app_import_path: t.Optional[str],
+    json_file: t.Optional[Path] = None,
+) -> None:
+    app = load_app(app_import_path)
+    imp = app.extensions.get("imp")
+
+    if imp is None:
+        click.echo(f"{Sp.FAIL}The app was not initialized with flask-imp.{Sp.END}")
+        return
+
+    if app.jinja_env.bytecode_cache is None:
+        click.echo(
+            f"{Sp.WARNING}The template bytecode cache is not enabled, "
+            f"set ImpConfig(template_bytecode_cache=True) to keep the "
+            f"compiled templates.{Sp.END}"
+        )
+
+    report = imp.warm_templates()
+
+    if json_file:
+        json_file.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        click.echo(f"{Sp.OKGREEN}Template report written to {json_file}{Sp.END}")
+        return
+
+    for name, count in report["folders"].items():
+        click.echo(f"{count:>6} templates in {name}")
+
+    for template in report["errors"]:
+        click.echo(f"{Sp.FAIL}Unable to compile template {template}{Sp.END}")
+
+    click.echo(
+        f"{Sp.OKGREEN}Compiled {report['templates']} templates "
+        f"in {report['seconds'] * 1000:.2f} ms{Sp.END}"
+    )
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import base64
+import csv
+import io
+import json
+import typing as t
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from enum import Enum
+from uuid import UUID
+
+from flask import current_app
+from sqlalchemy import JSON, inspect, select
+
+EXPORT_MIMETYPES = {
+    "jsonl": "application/x-ndjson",
+    "json": "application/json",
+    "csv": "text/csv",
+}
+
+
+def export_value(value: t.Any) -> t.Any:
+    """
+    !! Private function !!
+
+    Converts the values that JSON and CSV can't represent as they are.
+    """
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    if isinstance(value, (Decimal, UUID)):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode("ascii")
+    return value
+
+
+def json_default(value: t.Any) -> t.Any:
+    """
+    !! Private function !!
+
+    Used as the `default` of `json.dumps`, raises TypeError for values that
+    can't be converted, as `json.dumps` does.
+    """
+    converted = export_value(value)
+    if converted is value:
+        raise TypeError(
+            f"Object of type {type(value).__name__} is not JSON serializable"
+        )
+    return converted
+
+
+def csv_value(value: t.Any, json_column: bool = False) -> t.Any:
+    """
+    !! Private function !!
+
+    Converts a value for a CSV cell. Dicts and lists, and every value of a JSON
+    column, are written as JSON so they can be loaded again.
+    """
+    if value is not None and (json_column or isinstance(value, (dict, list))):
+        return json.dumps(value, default=json_default)
+    return export_value(value)
+
+
+def export_chunks(
+    model: t.Any,
+    fmt: str,
+    batch_size: int,
+    columns: t.Optional[t.Sequence[str]] = None,
+) -> t.Iterator[str]:
+    """
+    !! Private function !!
+
+    Selects the columns of the model ordered by primary key, fetching `batch_size`
+    rows at a time, and yields each batch serialized as JSON lines, CSV, or part
+    of a JSON list.
+
+    Rows are fetched as tuples, not model instances, so they are not kept in the
+    session. Uses a server-side cursor if the database driver supports one.
+    """
+    db = current_app.extensions["sqlalchemy"]
+    mapper = inspect(model)
+    keys = list(columns or [attr.key for attr in mapper.column_attrs])
+
+    statement = (
+        select(*(getattr(model, key) for key in keys))
+        .order_by(*mapper.primary_key)
+        .execution_options(yield_per=batch_size)
+    )
+
+    result = db.session.execute(statement)
+
+    try:
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer, lineterminator="\n")
+            writer.writerow(keys)
+            json_columns = [
+                key in mapper.column_attrs
+                and isinstance(mapper.column_attrs[key].columns[0].type, JSON)
+                for key in keys
+            ]
+
+            for partition in result.partitions():
+                writer.writerows(
+                    [
+                        csv_value(value, json_column)
+                        for value, json_column in zip(row, json_columns)
+                    ]
+                    for row in partition
+                )
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+            if buffer.tell():
+                yield buffer.getvalue()
+
+        elif fmt == "json":
+            dumps = json.JSONEncoder(default=json_default).encode
+            separator = "[\n"
+
+            for partition in result.partitions():
+                yield separator + ",\n".join(
+                    dumps(dict(zip(keys, row))) for row in partition
+                )
+                separator = ",\n"
+
+            yield "[]\n" if separator == "[\n" else "\n]\n"
+
+        else:
+            dumps = json.JSONEncoder(default=json_default).encode
+
+            for partition in result.partitions():
+                yield "".join(f"{dumps(dict(zip(keys, row)))}\n" for row in partition)
+
+    finally:
+        result.close()
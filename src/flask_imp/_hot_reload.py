@@ -0,0 +1,361 @@
+from __future__ import annotations
+
+import os
+import typing as t
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from importlib import reload
+from pathlib import Path
+from threading import RLock
+from time import monotonic
+from types import FunctionType, MethodType, ModuleType
+
+from click import Command
+from flask import Blueprint, Flask
+from flask.sansio.blueprints import BlueprintSetupState
+
+from ._utilities import remove_url_rules
+
+if t.TYPE_CHECKING:
+    from ._imp import Imp
+
+HANDLER_DICTS = [
+    "before_request_funcs",
+    "after_request_funcs",
+    "teardown_request_funcs",
+    "url_default_functions",
+    "url_value_preprocessors",
+    "template_context_processors",
+]
+
+HANDLER_LISTS = [
+    "teardown_appcontext_funcs",
+    "shell_context_processors",
+]
+
+
+@dataclass
+class ResourceModule:
+    """
+    !! Private class !!
+
+    A resource module imported by Imp, the factories that were called with it,
+    and the deferred blueprint functions those factories recorded.
+    """
+
+    module: ModuleType
+    path: str
+    mtime: int
+    calls: t.List[t.Tuple[str, t.Union[Flask, Blueprint]]] = field(default_factory=list)
+    deferred: t.List[t.Tuple[Blueprint, t.Callable[..., t.Any]]] = field(
+        default_factory=list
+    )
+
+
+def file_mtime(path: t.Union[str, Path]) -> int:
+    """
+    !! Private function !!
+
+    Returns the modification time of the file, or -1 if it cannot be read.
+    """
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return -1
+
+
+def from_module(func: t.Any, module_name: str) -> bool:
+    """
+    !! Private function !!
+
+    Checks if the function, class or click command was defined in the module.
+
+    The type is checked without isinstance, which would resolve proxies like
+    `request` in the Jinja globals.
+    """
+    if issubclass(type(func), Command):
+        func = func.callback
+
+    if not issubclass(type(func), (FunctionType, MethodType, type)):
+        return False
+
+    return getattr(func, "__module__", None) == module_name
+
+
+def purge_module(app: Flask, module_name: str) -> None:
+    """
+    !! Private function !!
+
+    Removes the url rules, request handlers, error handlers, context processors,
+    template filters, globals and tests that were defined in the module from the app,
+    and from every blueprint registered on the app.
+    """
+    remove_url_rules(
+        app,
+        {
+            endpoint
+            for endpoint, view_func in app.view_functions.items()
+            if from_module(view_func, module_name)
+        },
+    )
+
+    for scaffold in [app, *app.blueprints.values()]:
+        for attr in HANDLER_DICTS:
+            for funcs in getattr(scaffold, attr).values():
+                funcs[:] = [f for f in funcs if not from_module(f, module_name)]
+
+        for codes in scaffold.error_handler_spec.values():
+            for handlers in codes.values():
+                for exc_class, handler in list(handlers.items()):
+                    if from_module(handler, module_name):
+                        del handlers[exc_class]
+
+    for attr in HANDLER_LISTS:
+        funcs = getattr(app, attr)
+        funcs[:] = [f for f in funcs if not from_module(f, module_name)]
+
+    for jinja_dict in (
+        app.jinja_env.filters,
+        app.jinja_env.globals,
+        app.jinja_env.tests,
+    ):
+        for name, value in list(jinja_dict.items()):
+            if from_module(value, module_name):
+                del jinja_dict[name]
+
+    for name, command in list(app.cli.commands.items()):
+        if from_module(command, module_name):
+            del app.cli.commands[name]
+
+
+def merge_blueprint_module(
+    state: BlueprintSetupState, module_name: str, app: Flask
+) -> None:
+    """
+    !! Private function !!
+
+    Copies the handlers the module added to the blueprint onto the app, as
+    Flask does when the blueprint is first registered.
+    """
+    blueprint = state.blueprint
+    name = f"{state.name_prefix}.{state.name}".lstrip(".")
+
+    for attr in HANDLER_DICTS:
+        for key, funcs in getattr(blueprint, attr).items():
+            app_key = name if key is None else f"{name}.{key}"
+            getattr(app, attr)[app_key].extend(
+                f for f in funcs if from_module(f, module_name)
+            )
+
+    for key, codes in blueprint.error_handler_spec.items():
+        app_key = name if key is None else f"{name}.{key}"
+        for code, handlers in codes.items():
+            for exc_class, handler in handlers.items():
+                if from_module(handler, module_name):
+                    app.error_handler_spec[app_key][code][exc_class] = handler
+
+
+class HotReloader:
+    """
+    !! Private class !!
+
+    Watches the modules imported by Imp. When a resource module changes, only that
+    module is reloaded: the url rules and handlers it defined are removed, and
+    its factories are called again.
+
+    Changes to models, blueprint packages, the app package and resource modules
+    without factories, or a resource module that fails to reload, fall back to a
+    full restart.
+    """
+
+    imp: Imp
+    interval: float
+    resources: t.Dict[str, ResourceModule]
+    restart_files: t.Dict[str, int]
+    states: t.Dict[Blueprint, t.List[BlueprintSetupState]]
+
+    def __init__(self, imp: Imp, interval: float = 1.0) -> None:
+        self.imp = imp
+        self.interval = interval
+        self.resources = {}
+        self.restart_files = {}
+        self.states = {}
+        self._last_check = monotonic()
+        self._lock = RLock()
+
+    @contextmanager
+    def track_factory(
+        self,
+        module: ModuleType,
+        factory: str,
+        instance: t.Union[Flask, Blueprint],
+    ) -> t.Iterator[None]:
+        """
+        Records that the factory of the module was called with the instance, and
+        the deferred functions it recorded if the instance is a blueprint.
+        """
+        path = getattr(module, "__file__", None)
+        if path is None:
+            yield
+            return
+
+        resource = self.resources.get(module.__name__)
+        if resource is None:
+            resource = ResourceModule(module, path, file_mtime(path))
+            self.resources[module.__name__] = resource
+
+        resource.calls.append((factory, instance))
+
+        if not isinstance(instance, Blueprint):
+            yield
+            return
+
+        self._capture_states(instance)
+        deferred_before = len(instance.deferred_functions)
+        yield
+        resource.deferred.extend(
+            (instance, func) for func in instance.deferred_functions[deferred_before:]
+        )
+
+    def watch(self, module: t.Optional[ModuleType]) -> None:
+        """
+        Watches the file of the module, a change to it requires a full restart.
+        """
+        path = getattr(module, "__file__", None)
+        if path is not None and path not in self.restart_files:
+            self.restart_files[path] = file_mtime(path)
+
+    def check(self) -> None:
+        """
+        Reloads any resource modules that have changed since the last check,
+        at most once per interval.
+        """
+        if monotonic() - self._last_check < self.interval:
+            return
+
+        with self._lock:
+            if monotonic() - self._last_check < self.interval:
+                return
+
+            for path, mtime in self.restart_files.items():
+                if file_mtime(path) != mtime:
+                    self.restart_files[path] = file_mtime(path)
+                    self.restart(f"{path} changed")
+                    break
+
+            for name, resource in list(self.resources.items()):
+                mtime = file_mtime(resource.path)
+                if mtime == resource.mtime:
+                    continue
+
+                resource.mtime = mtime
+                if not self.reload(name):
+                    self.restart(f"{resource.path} could not be reloaded")
+                    break
+
+            self._last_check = monotonic()
+
+    def reload(self, module_name: str) -> bool:
+        """
+        Reloads the resource module, and calls its factories again.
+
+        :return: False if a full restart is required
+        """
+        app = self.imp.app
+        resource = self.resources[module_name]
+
+        try:
+            compile(Path(resource.path).read_bytes(), resource.path, "exec")
+        except (OSError, SyntaxError) as e:
+            app.logger.error(f" * Not reloading {module_name}: {e}")
+            return True
+
+        calls = resource.calls
+        blueprints = {
+            instance: None for _, instance in calls if isinstance(instance, Blueprint)
+        }
+
+        # The module must have been set up on registered blueprints, otherwise
+        # there is nothing to replay the new deferred functions against.
+        if any(not self.states.get(blueprint) for blueprint in blueprints):
+            return False
+
+        purge_module(app, module_name)
+
+        for blueprint, func in resource.deferred:
+            if func in blueprint.deferred_functions:
+                blueprint.deferred_functions.remove(func)
+
+        resource.calls = []
+        resource.deferred = []
+
+        got_first_request = app._got_first_request
+        got_registered_once = {bp: bp._got_registered_once for bp in blueprints}
+        app._got_first_request = False
+        for blueprint in blueprints:
+            blueprint._got_registered_once = False
+
+        try:
+            with self.imp._import_context():
+                resource.module = reload(resource.module)
+
+                for factory, instance in calls:
+                    with self.track_factory(resource.module, factory, instance):
+                        getattr(resource.module, factory)(instance)
+
+            for blueprint, func in resource.deferred:
+                for state in self.states[blueprint]:
+                    func(state)
+
+            for blueprint in blueprints:
+                for state in self.states[blueprint]:
+                    merge_blueprint_module(state, module_name, app)
+
+        except Exception:
+            app.logger.exception(f" * Error when reloading {module_name}")
+            return False
+
+        finally:
+            app._got_first_request = got_first_request
+            for blueprint, registered in got_registered_once.items():
+                blueprint._got_registered_once = registered
+
+        app.logger.info(f" * Reloaded {module_name}")
+        return True
+
+    def restart(self, reason: str) -> None:
+        """
+        Exits with the restart code of the Werkzeug reloader if it is running,
+        otherwise logs that a restart is required.
+        """
+        if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+            self.imp.app.logger.info(f" * {reason}, restarting")
+            os._exit(3)
+
+        self.imp.app.logger.warning(f" * {reason}, restart the app to apply it")
+
+    def wsgi_app(self, wsgi_app: t.Callable[..., t.Any]) -> t.Callable[..., t.Any]:
+        """
+        Wraps the WSGI app, checking for changes before each request is handled.
+        """
+
+        def _wsgi_app(environ: t.Dict[str, t.Any], start_response: t.Any) -> t.Any:
+            if self.imp.app.debug:
+                self.check()
+            return wsgi_app(environ, start_response)
+
+        return _wsgi_app
+
+    def _capture_states(self, blueprint: Blueprint) -> None:
+        """
+        Records the setup state of each registration of the blueprint, so
+        new deferred functions can be replayed after a reload.
+        """
+        if blueprint in self.states or blueprint._got_registered_once:
+            return
+
+        self.states[blueprint] = []
+        blueprint.record(self.states[blueprint].append)
+
+    def __repr__(self) -> str:
+        return f"HotReloader({len(self.resources)} resource modules)"
@@ -0,0 +1,372 @@
+from __future__ import annotations
+
+import copy
+import typing as t
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+
+from flask import current_app, has_app_context
+from flask_sqlalchemy.session import Session as FlaskSession
+from sqlalchemy import event, inspect
+from sqlalchemy.engine.result import IteratorResult, SimpleResultMetaData
+from sqlalchemy.orm import Mapper, Session, make_transient_to_detached, object_session
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.sql.util import find_tables
+
+if t.TYPE_CHECKING:
+    from sqlalchemy.engine import Result
+    from sqlalchemy.orm import ORMExecuteState
+
+    from ._registries import ModelRegistry
+
+IDENTITY_CACHE_TTL = 300.0
+IDENTITY_CACHE_MAX_ENTRIES = 1000
+
+_WRITTEN = "imp_identity_cache_written"
+
+
+def identity_cache_options(model: t.Any) -> t.Optional[t.Dict[str, t.Any]]:
+    """
+    !! Private function !!
+
+    Returns the TTL and maximum entries the model declares with
+    `__imp_identity_cache__`, or None if it does not opt in.
+    """
+    declared = model.__dict__.get("__imp_identity_cache__")
+    if declared is None or declared is False:
+        return None
+
+    options = {"ttl": IDENTITY_CACHE_TTL, "max_entries": IDENTITY_CACHE_MAX_ENTRIES}
+    if declared is True:
+        return options
+
+    if not isinstance(declared, dict) or set(declared) - options.keys():
+        raise ValueError(
+            f"{model.__name__}.__imp_identity_cache__ must be True, "
+            "or a dict with the keys: ttl, max_entries"
+        )
+
+    options.update(declared)
+    return options
+
+
+def identities_written(
+    session: Session, model: t.Any, identity: t.Optional[t.Tuple[t.Any, ...]] = None
+) -> None:
+    """
+    !! Private function !!
+
+    Records that the session's transaction wrote to a row of the model, or to
+    any row of it if `identity` is None, so the cached rows are invalidated when
+    it commits.
+    """
+    written = session.info.setdefault(_WRITTEN, {})
+    class_ = inspect(model).base_mapper.class_
+
+    if identity is None:
+        written[class_] = None
+    elif class_ not in written or written[class_] is not None:
+        written.setdefault(class_, set()).add(identity)
+
+
+class ModelIdentityCache:
+    """
+    !! Private class !!
+
+    The snapshots of the rows of one model, by primary key, least recently
+    used first.
+    """
+
+    def __init__(self, ttl: float, max_entries: int) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries: t.OrderedDict[
+            t.Tuple[t.Any, ...], t.Tuple[float, t.Any, t.Dict[str, t.Any]]
+        ] = OrderedDict()
+        # Bumped by each invalidation, a row read before one is not stored after it.
+        self.generation = 0
+        self.metrics = dict.fromkeys(
+            ("hits", "misses", "stores", "invalidations", "evictions"), 0
+        )
+        self._lock = Lock()
+
+    def get(
+        self, identity: t.Tuple[t.Any, ...]
+    ) -> t.Optional[t.Tuple[t.Any, t.Dict[str, t.Any]]]:
+        with self._lock:
+            entry = self.entries.get(identity)
+            if entry is None or entry[0] < monotonic():
+                self.entries.pop(identity, None)
+                self.metrics["misses"] += 1
+                return None
+
+            self.entries.move_to_end(identity)
+            self.metrics["hits"] += 1
+            return entry[1], entry[2]
+
+    def set(
+        self,
+        identity: t.Tuple[t.Any, ...],
+        class_: t.Any,
+        values: t.Dict[str, t.Any],
+        generation: int,
+    ) -> None:
+        with self._lock:
+            if generation != self.generation:
+                return
+
+            self.entries[identity] = (monotonic() + self.ttl, class_, values)
+            self.entries.move_to_end(identity)
+            self.metrics["stores"] += 1
+
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.metrics["evictions"] += 1
+
+    def invalidate(self, identities: t.Optional[t.Set[t.Tuple[t.Any, ...]]]) -> None:
+        with self._lock:
+            self.generation += 1
+            if identities is None:
+                self.metrics["invalidations"] += len(self.entries)
+                self.entries.clear()
+                return
+
+            for identity in identities:
+                if self.entries.pop(identity, None) is not None:
+                    self.metrics["invalidations"] += 1
+
+    def stats(self) -> t.Dict[str, int]:
+        with self._lock:
+            return {**self.metrics, "entries": len(self.entries)}
+
+
+class IdentityCache:
+    """
+    Keeps snapshots of the rows loaded by `session.get(Model, pk)`, for the
+    models that set `__imp_identity_cache__`, and adds a new instance built from
+    the snapshot to the session the next time the row is looked up, without a
+    query.
+
+    A row is invalidated when a session commits an update or delete of it, and
+    every row of a model is invalidated when a session commits an UPDATE or
+    DELETE statement on its table. Invalidation only reaches the cache of the
+    process that committed.
+
+    An instance built from a snapshot is not loaded by a query, so it is not
+    routed to a read replica, and no `load` event is sent for it. Rows of
+    models that listen to `load` events are not cached.
+    """
+
+    model_registry: ModelRegistry
+    caches: t.Dict[t.Any, ModelIdentityCache]
+
+    def __init__(self, model_registry: ModelRegistry) -> None:
+        self.model_registry = model_registry
+        self.caches = {}
+        self._lock = Lock()
+
+    def cache_for(self, mapper: Mapper[t.Any]) -> t.Optional[ModelIdentityCache]:
+        """
+        Returns the cache of the model, if it opts in through the model registry.
+        """
+        class_ = mapper.class_
+        options = self.model_registry.identity_cached.get(class_.__name__)
+        if (
+            options is None
+            or self.model_registry.registry.get(class_.__name__) is not class_
+        ):
+            return None
+
+        base_class = mapper.base_mapper.class_
+        cache = self.caches.get(base_class)
+        if cache is None:
+            with self._lock:
+                cache = self.caches.setdefault(
+                    base_class,
+                    ModelIdentityCache(options["ttl"], options["max_entries"]),
+                )
+        return cache
+
+    def stats(self) -> t.Dict[str, t.Dict[str, int]]:
+        """
+        Returns the hits, misses, stores, invalidations, evictions and number of
+        entries of each model.
+        """
+        return {class_.__name__: cache.stats() for class_, cache in self.caches.items()}
+
+    def clear(self) -> None:
+        """
+        Deletes every snapshot.
+        """
+        for cache in self.caches.values():
+            cache.invalidate(None)
+
+    def execute(self, state: ORMExecuteState) -> t.Optional[Result[t.Any]]:
+        if not self.model_registry.identity_cached:
+            return None
+
+        if state.is_update or state.is_delete:
+            self._statement_written(state)
+            return None
+
+        mapper = state.bind_mapper
+        if mapper is None or not state.is_select or state.is_column_load:
+            return None
+
+        cache = self.cache_for(mapper)
+        statement: t.Any = state.statement
+        if (
+            cache is None
+            or state.execution_options.get("imp_cache") is False
+            or state.load_options._populate_existing
+            or statement._with_options
+            or statement._for_update_arg is not None
+            or mapper.class_manager.dispatch.load
+            or not is_get_statement(mapper, statement)
+        ):
+            return None
+
+        get_params = mapper._get_clause[1]
+        parameters: t.Any = state.parameters or {}
+        identity = tuple(
+            parameters.get(get_params[column].key) for column in mapper.primary_key
+        )
+        key = mapper.identity_key_from_primary_key(identity)
+        if key in state.session.identity_map or key[0] in state.session.info.get(
+            _WRITTEN, {}
+        ):
+            return None
+
+        entry = cache.get(identity)
+        if entry is not None:
+            class_, values = entry
+            instance = inspect(class_).class_manager.new_instance()
+            for name, value in copy.deepcopy(values).items():
+                set_committed_value(instance, name, value)
+            make_transient_to_detached(instance)
+            state.session.add(instance)
+            return IteratorResult(
+                SimpleResultMetaData([mapper.class_.__name__]), iter([(instance,)])
+            )
+
+        generation = cache.generation
+        frozen = state.invoke_statement().freeze()
+        instance = frozen().scalars().first()
+
+        if instance is not None:
+            instance_state = inspect(instance)
+            column_keys = [attr.key for attr in instance_state.mapper.column_attrs]
+            if (
+                not instance_state.unloaded.intersection(column_keys)
+                and not instance_state.manager.dispatch.load
+            ):
+                cache.set(
+                    identity,
+                    type(instance),
+                    copy.deepcopy(
+                        {name: instance_state.dict[name] for name in column_keys}
+                    ),
+                    generation,
+                )
+
+        return t.cast("Result[t.Any]", frozen())
+
+    def committed(self, session: Session) -> None:
+        for class_, identities in session.info.pop(_WRITTEN, {}).items():
+            cache = self.caches.get(class_)
+            if cache is not None:
+                cache.invalidate(identities)
+
+    def _statement_written(self, state: ORMExecuteState) -> None:
+        statement: t.Any = state.statement
+        tables = set(find_tables(statement, include_aliases=True, include_crud=True))
+        for ref in self.model_registry.identity_cached:
+            model = self.model_registry.registry.get(ref)
+            if model is not None and tables.intersection(inspect(model).tables):
+                identities_written(state.session, model)
+
+
+def is_get_statement(mapper: Mapper[t.Any], statement: t.Any) -> bool:
+    """
+    !! Private function !!
+
+    Returns whether the statement is the primary key lookup of `session.get`.
+    """
+    where: t.Sequence[t.Any] = getattr(statement, "_where_criteria", ())
+    get_clause: t.Any = mapper._get_clause[0]
+    return (
+        len(where) == 1
+        and not statement._setup_joins
+        and len(statement.column_descriptions) == 1
+        and statement.column_descriptions[0].get("entity") is mapper.class_
+        and where[0].compare(get_clause)
+    )
+
+
+def app_identity_cache() -> t.Optional[IdentityCache]:
+    """
+    !! Private function !!
+    """
+    if not has_app_context():
+        return None
+
+    imp = current_app.extensions.get("imp")
+    return getattr(imp, "identity_cache", None)
+
+
+def cache_identities(state: ORMExecuteState) -> t.Optional[Result[t.Any]]:
+    """
+    !! Private function !!
+    """
+    identity_cache = app_identity_cache()
+    if identity_cache is None:
+        return None
+    return identity_cache.execute(state)
+
+
+def record_row_write(mapper: Mapper[t.Any], connection: t.Any, target: t.Any) -> None:
+    """
+    !! Private function !!
+    """
+    identity_cache = app_identity_cache()
+    session = object_session(target)
+    if identity_cache is None or session is None:
+        return
+
+    if identity_cache.cache_for(mapper) is not None:
+        identities_written(
+            session, mapper.class_, tuple(mapper.primary_key_from_instance(target))
+        )
+
+
+def invalidate_on_commit(session: Session) -> None:
+    """
+    !! Private function !!
+    """
+    identity_cache = app_identity_cache()
+    if identity_cache is not None:
+        identity_cache.committed(session)
+
+
+def forget_writes(session: Session, previous_transaction: t.Any) -> None:
+    """
+    !! Private function !!
+    """
+    if previous_transaction.parent is None:
+        session.info.pop(_WRITTEN, None)
+
+
+def listen_for_gets() -> None:
+    """
+    !! Private function !!
+
+    Listens to every Flask-SQLAlchemy session and mapper, once per process,
+    when the model registry first indexes a model that opts in.
+    """
+    if not event.contains(FlaskSession, "do_orm_execute", cache_identities):
+        event.listen(FlaskSession, "do_orm_execute", cache_identities)
+        event.listen(FlaskSession, "after_commit", invalidate_on_commit)
+        event.listen(FlaskSession, "after_soft_rollback", forget_writes)
+        event.listen(Mapper, "after_update", record_row_write)
+        event.listen(Mapper, "after_delete", record_row_write)
@@ -1,22 +1,64 @@
+import gc
+import os
+import sys
 import typing as t
+from contextlib import contextmanager
 from importlib import import_module
 from inspect import getmembers
 from inspect import isclass
 from pathlib import Path
-
-from flask import Flask, Blueprint, session
+from time import perf_counter
+from types import ModuleType
+from urllib.parse import quote
+
+from flask import (
+    Flask,
+    Blueprint,
+    Response,
+    session,
+    request,
+    has_request_context,
+    stream_with_context,
+)
 from flask_sqlalchemy.model import DefaultMeta
-
+from jinja2 import FileSystemBytecodeCache, TemplateError
+from sqlalchemy import event
+from sqlalchemy.orm import Mapper, configure_mappers
+
+from ._bind_policies import BindPolicies, warm_engines
+from ._bulk_load import IMPORT_FORMATS, bulk_load_rows, read_rows
+from ._export import EXPORT_MIMETYPES, export_chunks
+from ._hot_reload import HotReloader
+from ._identity_cache import IdentityCache
 from ._imp_blueprint import ImpBlueprint
-from ._registries import ModelRegistry
+from ._lazy_blueprint import LazyBlueprint, LazyLoading
+from ._manifest import ImportManifest
+from ._pagination import Page, paginate
+from ._profiler import PROFILE_STARTUP, StartupProfiler
+from ._query_cache import MemoryQueryCache, QueryCache, SQLiteQueryCache
+from ._query_stats import QueryStats
+from ._read_replicas import ReadReplicas
+from ._registries import ModelRegistry, model_meta, scan_model_classes
+from ._static import StaticFiles
+from ._templating import IndexedJinjaLoader
 from ._utilities import (
     cast_to_import_str,
+    current_imp,
     build_database_main,
     build_database_binds,
-    process_folder_file_scope,
+    import_resource_modules,
+    memory_usage,
+    preload_modules,
+    raise_preload_failure,
+    register_fork_hooks,
+    load_models_on_configure,
+    profile,
+    run_resource_factories,
 )
 from .config import ImpConfig
 
+URL_ANCHOR_SAFE = "%!#$&'()*+,/:;=?@"
+
 
 class Imp:
     app: Flask
@@ -27,9 +69,26 @@ class Imp:
     app_resources_imported: bool = False
 
     model_registry: ModelRegistry
+    read_replicas: ReadReplicas
+    bind_policies: BindPolicies
+    identity_cache: IdentityCache
 
     config: ImpConfig
 
+    startup_profile: t.Optional[StartupProfiler] = None
+    preload_report: t.Optional[t.Dict[str, t.Any]] = None
+    warmup_report: t.Optional[t.Dict[t.Optional[str], t.Dict[str, t.Any]]] = None
+    hot_reloader: t.Optional[HotReloader] = None
+    static_files: t.Optional[StaticFiles] = None
+    query_stats: t.Optional[QueryStats] = None
+    query_cache: t.Optional[QueryCache] = None
+
+    _manifest: t.Optional[ImportManifest] = None
+    _post_fork_pid: t.Optional[int] = None
+    _configure_listener: t.Optional[t.Callable[[], None]] = None
+    _lazy_blueprints: t.Dict[str, LazyBlueprint]
+    _lazy_loading: LazyLoading
+
     def __init__(
         self,
         app: t.Optional[Flask] = None,
@@ -68,6 +127,12 @@ class Imp:
         self.app.extensions["imp"] = self
 
         self.model_registry = ModelRegistry()
+        self.read_replicas = ReadReplicas()
+        self.bind_policies = BindPolicies()
+        self.bind_policies.installed.append(self._warm_eager_binds)
+        self.identity_cache = IdentityCache(self.model_registry)
+        self._lazy_blueprints = {}
+        self._lazy_loading = LazyLoading()
 
         if config:
             self.config = config
@@ -79,11 +144,68 @@ class Imp:
 
         self.app_instance_path.mkdir(exist_ok=True)
 
+        if (
+            self.config.IMP_PROFILE_STARTUP
+            or PROFILE_STARTUP.get()
+            or os.environ.get("FLASK_IMP_PROFILE_STARTUP")
+        ):
+            self.startup_profile = StartupProfiler(self.app_name)
+            # Startup is over once requests are served, stop measuring memory.
+            self.app.before_request(self.startup_profile.stop)
+
+        if self.config.IMP_IMPORT_MANIFEST:
+            self._manifest = ImportManifest(
+                self.app_instance_path / "imp_import_manifest.json", self.app.logger
+            )
+
+        if self.config.IMP_TEMPLATE_BYTECODE_CACHE:
+            self._init_template_bytecode_cache()
+
+        if self.config.IMP_INDEXED_TEMPLATE_LOADER:
+            self._set_jinja_option("loader", IndexedJinjaLoader(self.app))
+
+        if self.config.IMP_STATIC_FINGERPRINTS or self.config.IMP_STATIC_CACHE:
+            self._init_static_files()
+
+        if self.config.IMP_HOT_RELOAD:
+            self.hot_reloader = HotReloader(self)
+            self.hot_reloader.watch(sys.modules.get(self.app.import_name))
+            self.app.wsgi_app = self.hot_reloader.wsgi_app(self.app.wsgi_app)  # type: ignore[method-assign]
+
+        if self.config.IMP_QUERY_STATS:
+            self.query_stats = QueryStats(
+                self, self.config.IMP_QUERY_STATS_REPEAT_THRESHOLD
+            )
+            self.app.before_request(self.query_stats.before_request)
+            self.app.after_request(self.query_stats.after_request)
+            self.bind_policies.created.append(self.query_stats.instrument_engine)
+
+        if self.config.IMP_QUERY_CACHE == "sqlite":
+            self.query_cache = QueryCache(
+                SQLiteQueryCache(
+                    self.app_instance_path / "imp_query_cache.sqlite",
+                    self.config.IMP_QUERY_CACHE_MAX_ENTRIES,
+                ),
+                self.config.IMP_QUERY_CACHE_TTL,
+            )
+        elif self.config.IMP_QUERY_CACHE == "memory":
+            self.query_cache = QueryCache(
+                MemoryQueryCache(self.config.IMP_QUERY_CACHE_MAX_ENTRIES),
+                self.config.IMP_QUERY_CACHE_TTL,
+            )
+
+        if self.config.IMP_LAZY_MODELS:
+            self.model_registry.module_loaded = self._watch_for_restart
+
+        if self.config.IMP_PRELOAD and hasattr(os, "register_at_fork"):
+            register_fork_hooks(self)
+
     def import_resources(
         self,
         folder: str = "resources",
         factories: t.Optional[t.Union[t.List[str], str]] = "include",
         scope_import: t.Optional[t.Dict[str, t.Union[t.List[str], str]]] = None,
+        max_workers: t.Optional[int] = None,
     ) -> None:
         """
         Will import resources (cli, routes, filters, context_processors...)
@@ -134,6 +256,8 @@ class Imp:
         :param folder: the folder to import from, must be relative
         :param factories: a list of function names to call with the app instance, defaults to ["include"]
         :param scope_import: a dict of files to import e.g. {"folder_name": "*"}
+        :param max_workers: import the modules on a thread pool of this size first,
+                            factories are still called in order on the calling thread.
         :return: None
         """
 
@@ -157,37 +281,22 @@ class Imp:
                 f"Resources location must be a folder, value given: {resource_folder}"
             )
 
-        module_paths_to_import: t.List[Path] = process_folder_file_scope(
-            resource_folder, scope_import
-        )
-
-        imported_modules: set[t.Any] = set()
-
-        for module_path in module_paths_to_import:
-            if module_path.name.startswith(".") or module_path.name.startswith(
-                "__"
-            ):  # skip hidden files / folders
-                continue
-
-            cast_import = cast_to_import_str(self.app.import_name, module_path)
-
-            try:
-                # attempt to import the module
-                module = import_module(cast_import)
-
-                # add the module to the set of imported modules
-                imported_modules.add(module)
-            except ImportError as e:
-                raise ImportError(f"Error when importing {cast_import}: {e}")
+        with self._import_context(), profile("resources", f"{resource_folder}"):
+            imported_modules = import_resource_modules(
+                resource_folder,
+                scope_import,
+                factories,
+                lambda module_path: cast_to_import_str(
+                    self.app.import_name, module_path
+                ),
+                self._manifest,
+                max_workers,
+            )
 
-        # check if each module has any valid factories, if so, pass the blueprint
-        for instance_factory in factories:
-            for stored_module in imported_modules:
-                if hasattr(stored_module, instance_factory):
-                    getattr(stored_module, instance_factory)(self.app)
+            # check if each module has any valid factories, if so, pass the app
+            run_resource_factories(imported_modules, factories, self.app)
 
-        # clear the set of imported modules
-        imported_modules.clear()
+        self._save_manifest()
 
     def register_imp_blueprint(self, imp_blueprint: ImpBlueprint) -> None:
         """
@@ -195,7 +304,8 @@ class Imp:
 
         :param imp_blueprint: the manually imported ImpBlueprint
         """
-        self._imp_blueprint_registration(imp_blueprint)
+        with self._import_context(), profile("blueprint", imp_blueprint.package):
+            self._imp_blueprint_registration(imp_blueprint)
 
     def import_blueprint(self, blueprint: str, package: t.Optional[str] = None) -> None:
         """
@@ -210,26 +320,75 @@ class Imp:
         else:
             blueprint_path = Path(self.app_path / blueprint)
 
-        if blueprint_path.exists() and blueprint_path.is_dir():
-            module = import_module(
-                cast_to_import_str(
-                    package if package else self.app_name, blueprint_path
-                )
-            )
-            for name, potential_blueprint in getmembers(module):
-                if isinstance(potential_blueprint, ImpBlueprint):
-                    self._imp_blueprint_registration(potential_blueprint)
-                    continue
+        self._import_blueprint_package(blueprint_path, package)
+        self._save_manifest()
 
-                if isinstance(potential_blueprint, Blueprint):
-                    self._flask_blueprint_registration(potential_blueprint)
+    def lazy_import_blueprint(
+        self,
+        blueprint: str,
+        url_prefix: t.Optional[str] = None,
+        subdomain: t.Optional[str] = None,
+        package: t.Optional[str] = None,
+    ) -> None:
+        """
+        Reserve the URL prefix of a blueprint, and import the blueprint on
+        the first request that matches the prefix.
+
+        The blueprint's resources, models and nested blueprints are all imported
+        when the blueprint is loaded.
+
+        `url_prefix` must match the url_prefix set in the blueprint's config,
+        it defaults to the same value as ImpBlueprint: the blueprint folder name
+        in slug-case.
+
+        Building a URL to an endpoint of a blueprint that has not been loaded
+        yet will load it.
+
+        :param blueprint: the blueprint (folder name) to import.
+        :param url_prefix: the URL prefix to reserve for the blueprint.
+        :param subdomain: the subdomain to reserve for the blueprint.
+        :param package: the relative package to import from.
+        """
+
+        if Path(blueprint).is_absolute():
+            blueprint_path = Path(blueprint)
+        else:
+            blueprint_path = Path(self.app_path / blueprint)
+
+        if not blueprint_path.exists() or not blueprint_path.is_dir():
+            raise ImportError(f"Cannot find blueprint folder at {blueprint_path}")
+
+        if not self._lazy_blueprints:
+            self.app.url_build_error_handlers.append(self._lazy_url_build_error)
+
+        lazy_blueprint = LazyBlueprint(
+            self, blueprint_path, package, url_prefix, subdomain, self._lazy_loading
+        )
+        lazy_blueprint.reserve()
+        self._lazy_blueprints[lazy_blueprint.name] = lazy_blueprint
 
-    def import_blueprints(self, folder: str, package: t.Optional[str] = None) -> None:
+    def load_lazy_blueprints(self) -> None:
+        """
+        Import and register all blueprints that were set to be lazily imported,
+        and have not been loaded yet.
+        """
+        for lazy_blueprint in self._lazy_blueprints.values():
+            lazy_blueprint.load()
+
+    def import_blueprints(
+        self,
+        folder: str,
+        package: t.Optional[str] = None,
+        max_workers: t.Optional[int] = None,
+    ) -> None:
         """
         Import all blueprints from the given folder.
 
         :param folder: The folder to import from. Must be relative
         :param package: the relative package to import from.
+        :param max_workers: import the blueprint packages on a thread pool of this
+                            size first, blueprints are still registered in order on
+                            the calling thread.
         """
 
         folder_path = Path(self.app_path / folder)
@@ -240,8 +399,67 @@ class Imp:
         if not folder_path.is_dir():
             raise ImportError(f"Blueprints must be a folder {folder_path}")
 
-        for potential_bp in folder_path.iterdir():
-            self.import_blueprint(f"{potential_bp}", package)
+        key = f"blueprints:{folder_path}:{package}"
+
+        plan: t.Optional[t.List[t.List[t.Any]]] = None
+        if self._manifest is not None:
+            plan = self._manifest.plan(key)
+
+        failures: t.Dict[str, Exception] = {}
+
+        if plan is not None:
+            if max_workers:
+                with self._import_context():
+                    failures = preload_modules(
+                        [import_str for import_str, _ in plan], max_workers
+                    )
+
+            for import_str, names in plan:
+                raise_preload_failure(failures, import_str)
+                self._register_blueprint_members(import_str, names)
+
+        else:
+            potential_bps = list(folder_path.iterdir())
+
+            if max_workers:
+                with self._import_context():
+                    failures = preload_modules(
+                        [
+                            cast_to_import_str(
+                                package if package else self.app_name, potential_bp
+                            )
+                            for potential_bp in potential_bps
+                            if potential_bp.is_dir()
+                        ],
+                        max_workers,
+                    )
+
+            plan = []
+            for potential_bp in potential_bps:
+                if potential_bp.is_dir():
+                    raise_preload_failure(
+                        failures,
+                        cast_to_import_str(
+                            package if package else self.app_name, potential_bp
+                        ),
+                    )
+                if imported := self._import_blueprint_package(potential_bp, package):
+                    plan.append(list(imported))
+
+            if self._manifest is not None:
+                self._manifest.record(
+                    key,
+                    [
+                        folder_path,
+                        *(
+                            folder_path / import_str.split(".")[-1] / "__init__.py"
+                            for import_str, _ in plan
+                        ),
+                    ],
+                    plan,
+                )
+
+        self._save_manifest()
 
     def import_models(self, file_or_folder: str) -> None:
         """
@@ -255,14 +473,235 @@ class Imp:
         else:
             file_or_folder_path = Path(self.app_path / file_or_folder)
 
-        if file_or_folder_path.is_file() and file_or_folder_path.suffix == ".py":
-            self._process_model(file_or_folder_path)
+        with self._import_context(), profile("models", f"{file_or_folder_path}"):
+            self._import_models(file_or_folder_path)
 
-        elif file_or_folder_path.is_dir():
-            for model_file in [
-                _ for _ in file_or_folder_path.iterdir() if "__" not in _.name
-            ]:
-                self._process_model(model_file)
+        if self.config.IMP_LAZY_MODELS_LOAD_ON_CONFIGURE and self.model_registry.lazy:
+            self._load_models_on_configure()
+
+    def load_models(self) -> None:
+        """
+        Imports every model file that has not been imported yet, when
+        `ImpConfig(lazy_models=True)` is set.
+
+        Call it before `db.create_all()`, so the tables of every model are created,
+        and before the first query if models have relationships to models in files
+        that may not have been imported. `ImpConfig(lazy_models_load_on_configure=True)`
+        calls it before the SQLAlchemy mappers are configured.
+        """
+        self.model_registry.load_all()
+
+    def preload(self) -> t.Dict[str, t.Any]:
+        """
+        Finishes the work that would otherwise be done by each worker after a fork,
+        then freezes the garbage collector, so the memory used by the app stays
+        shared between workers.
+
+        Loads any lazy blueprints and models, configures the SQLAlchemy mappers, compiles the
+        URL map and compiles the Jinja templates, then calls `gc.freeze()`.
+
+        Only runs once, later calls return the report of the first call.
+
+        :return: a report of the time taken, templates compiled and memory usage
+        """
+        if self.preload_report is not None:
+            return self.preload_report
+
+        memory_before = memory_usage()
+        start = perf_counter()
+
+        self.load_lazy_blueprints()
+        self.load_models()
+        configure_mappers()
+        self.app.url_map.update()
+        templates = self.warm_templates()["templates"]
+
+        gc.collect()
+        gc.freeze()
+
+        self.preload_report = {
+            "seconds": perf_counter() - start,
+            "templates": templates,
+            "frozen_objects": gc.get_freeze_count(),
+            "memory_before": memory_before,
+            "memory_after": memory_usage(),
+        }
+        return self.preload_report
+
+    def post_fork(self) -> None:
+        """
+        Resets the state that must not be shared between forked workers,
+        call this in each worker after the fork.
+
+        Replaces the connection pools of all Flask-SQLAlchemy engines, without
+        closing the connections that belong to the parent process, then warms
+        up the engines of eager binds with new connections.
+
+        Only runs once per process, later calls in the same process do nothing.
+        """
+        if self._post_fork_pid == os.getpid():
+            return
+        self._post_fork_pid = os.getpid()
+
+        db = self.app.extensions.get("sqlalchemy")
+        if db is None:
+            return
+
+        with self.app.app_context():
+            for engine in db.engines.values():
+                engine.dispose(close=False)
+
+        if self.bind_policies.eager:
+            self.warm_binds()
+
+    def warm_binds(
+        self, max_workers: t.Optional[int] = None
+    ) -> t.Dict[t.Optional[str], t.Dict[str, t.Any]]:
+        """
+        Opens the connections of each bind with an eager engine policy, in parallel
+        across binds, and returns them to the pool, so the first requests don't
+        wait for them.
+
+        It is called for you in the first app context after `db.init_app(app)`,
+        and by `Imp.post_fork()`.
+
+        The report is also stored as `Imp.warmup_report`.
+
+        :param max_workers: the number of binds to warm up at the same time,
+                            defaults to all of them
+        :return: dict of the connections opened, seconds taken and any error, by bind key
+        """
+        db = self.app.extensions.get("sqlalchemy")
+        if db is None:
+            raise RuntimeError("Flask-SQLAlchemy is not initialized on the app")
+
+        with self.app.app_context():
+            engines = {
+                bind_key: (db.engines[bind_key], connections)
+                for bind_key, connections in self.bind_policies.eager.items()
+            }
+
+        self.warmup_report = warm_engines(engines, max_workers)
+
+        for bind_key, result in self.warmup_report.items():
+            if result["error"]:
+                self.app.logger.warning(
+                    f"Warming up bind [{bind_key}] failed: {result['error']}"
+                )
+
+        return self.warmup_report
+
+    def warm_templates(self) -> t.Dict[str, t.Any]:
+        """
+        Compiles every template in the app template folder, and in the template
+        folder of every registered blueprint.
+
+        If the template bytecode cache is enabled, the compiled templates are also
+        written to the cache, and are loaded from it by later processes.
+
+        :return: a report of the templates compiled, errors, and the time taken
+        """
+        jinja_env = self.app.jinja_env
+        start = perf_counter()
+
+        loaders = [
+            (self.app.name, self.app.jinja_loader),
+            *((name, bp.jinja_loader) for name, bp in self.app.blueprints.items()),
+        ]
+
+        folders: t.Dict[str, int] = {}
+        seen: t.Set[str] = set()
+        errors: t.List[str] = []
+
+        for name, loader in loaders:
+            if loader is None:
+                continue
+
+            templates = loader.list_templates()
+            folders[name] = len(templates)
+
+            for template in templates:
+                if template in seen:
+                    continue
+
+                seen.add(template)
+                try:
+                    jinja_env.get_template(template)
+                except (TemplateError, UnicodeDecodeError) as e:
+                    errors.append(template)
+                    self.app.logger.warning(
+                        f"Unable to compile template {template}: {e}"
+                    )
+
+        return {
+            "templates": len(seen) - len(errors),
+            "errors": errors,
+            "folders": folders,
+            "seconds": perf_counter() - start,
+        }
+
+    def fingerprint_static(
+        self, compress: bool = True
+    ) -> t.Dict[str, t.Dict[str, str]]:
+        """
+        Writes a copy of each file in the app static folder, and in the static
+        folder of every registered blueprint, with the hash of its content in the
+        file name. Compressible files also get a gzip compressed copy.
+
+        The manifest of the files is written to the app instance folder, and is used by
+        `flask_imp.utilities.static_url_for` when `ImpConfig(static_fingerprints=True)` is set.
+
+        :param compress: write gzip compressed copies of compressible files
+        :return: the fingerprinted file names, by static endpoint and file name
+        """
+        if self.static_files is None:
+            self.static_files = StaticFiles(self)
+
+        return self.static_files.build(compress)
+
+    @staticmethod
+    def memory_usage() -> t.Dict[str, int]:
+        """
+        Returns the resident memory of the current process in bytes, split into
+        shared and private pages.
+
+        Returns an empty dict on platforms without /proc/self/smaps_rollup.
+        """
+        return memory_usage()
+
+    def primary(self) -> t.ContextManager[None]:
+        """
+        Sends the queries made inside the block to the primary database,
+        instead of a read replica. Can also be used as a decorator.
+
+        with imp.primary():
+            balance = db.session.execute(select(Account.balance)).scalar()
+        """
+        return self.read_replicas.primary()
+
+    def cache_queries(self, *classes: t.Union[str, DefaultMeta]) -> None:
+        """
+        Caches the results of queries that only read from the tables of these
+        models, see `ImpConfig(query_cache=...)`.
+
+        A cached result is removed when a session commits a write to one of
+        its tables. Writes that do not go through a Flask-SQLAlchemy session
+        of this app are not seen, so use this for models that change through
+        the app, or set `query_cache_ttl`.
+
+        imp.cache_queries("Country", "Currency")
+
+        :param classes: the class names of the models, or the model classes
+        """
+        if self.query_cache is None:
+            raise RuntimeError(
+                "The query cache is not enabled, set ImpConfig(query_cache=...)"
+            )
+
+        for class_ in classes:
+            self.query_cache.add_model(
+                self.model(class_) if isinstance(class_, str) else class_
+            )
 
     def model(self, class_: str) -> t.Union[DefaultMeta, t.Any]:
         """
@@ -277,6 +716,8 @@ class Imp:
         """
         Returns meta information for the given ORM class name.
 
+        The meta information of registered models is cached by the model registry.
+
         :param class_: the class name of the model to return [Class Instance | Name of class as String]
         :return: dict of meta-information
         """
@@ -286,31 +727,203 @@ class Imp:
                 raise AttributeError(f"{model_} is not a valid model")
 
         if isinstance(class_, str):
-            model = self.model_registry.class_(class_)
-            check_for_table_name(model)
-            return {
-                "location": model.__module__,
-                "table_name": model.__tablename__,
-            }
+            check_for_table_name(self.model_registry.class_(class_))
+            return self.model_registry.meta(class_)
 
-        return {
-            "location": class_.__module__,
-            "table_name": class_.__tablename__,
-        }
+        check_for_table_name(class_)
+
+        if self.model_registry.registry.get(class_.__name__) is class_:
+            return self.model_registry.meta(class_.__name__)
+
+        return model_meta(class_)
+
+    def export_model(
+        self,
+        class_: t.Union[str, DefaultMeta],
+        fmt: str = "jsonl",
+        batch_size: int = 1000,
+        columns: t.Optional[t.Sequence[str]] = None,
+    ) -> t.Iterator[str]:
+        """
+        Streams the rows of the model's table as JSON lines, a JSON list or CSV,
+        ordered by primary key. Rows are fetched and serialized `batch_size` at a
+        time, so memory use does not grow with the size of the table.
+
+        Must be used within an app context.
+
+        :param class_: the class name of the model, or the model class
+        :param fmt: "jsonl", "json" or "csv"
+        :param batch_size: the number of rows to fetch at a time
+        :param columns: the attribute names of the columns to export - defaults to all columns
+        :return: an iterator of serialized chunks, one per batch
+        """
+        if fmt not in EXPORT_MIMETYPES:
+            raise ValueError(
+                f"Export format must be one of: {', '.join(EXPORT_MIMETYPES)}"
+            )
+
+        model = self.model(class_) if isinstance(class_, str) else class_
+        return export_chunks(model, fmt, batch_size, columns)
+
+    def export_model_to_file(
+        self,
+        class_: t.Union[str, DefaultMeta],
+        file: t.Union[str, Path],
+        fmt: t.Optional[str] = None,
+        batch_size: int = 1000,
+        columns: t.Optional[t.Sequence[str]] = None,
+    ) -> int:
+        """
+        Writes the rows of the model's table to the file, see `Imp.export_model`.
+
+        :param class_: the class name of the model, or the model class
+        :param file: the file to write to
+        :param fmt: "jsonl", "json" or "csv" - defaults to the suffix of the file
+        :param batch_size: the number of rows to fetch at a time
+        :param columns: the attribute names of the columns to export - defaults to all columns
+        :return: the number of characters written
+        """
+        file = Path(file)
+        if fmt is None:
+            fmt = file.suffix.lstrip(".").lower()
+
+        chunks = self.export_model(class_, fmt, batch_size, columns)
+
+        written = 0
+        with file.open("w", encoding="utf-8", newline="") as f:
+            for chunk in chunks:
+                written += f.write(chunk)
+
+        return written
+
+    def export_model_response(
+        self,
+        class_: t.Union[str, DefaultMeta],
+        fmt: str = "jsonl",
+        batch_size: int = 1000,
+        columns: t.Optional[t.Sequence[str]] = None,
+        download_name: t.Optional[str] = None,
+    ) -> Response:
+        """
+        Returns a streaming response of the rows of the model's table,
+        see `Imp.export_model`.
+
+        :param class_: the class name of the model, or the model class
+        :param fmt: "jsonl", "json" or "csv"
+        :param batch_size: the number of rows to fetch at a time
+        :param columns: the attribute names of the columns to export - defaults to all columns
+        :param download_name: send the response as an attachment with this file name
+        :return: the streaming response
+        """
+        chunks = self.export_model(class_, fmt, batch_size, columns)
+        response = self.app.response_class(
+            stream_with_context(chunks), mimetype=EXPORT_MIMETYPES[fmt]
+        )
+
+        if download_name is not None:
+            response.headers.set(
+                "Content-Disposition", "attachment", filename=download_name
+            )
+
+        return response
+
+    def bulk_load(
+        self,
+        class_: t.Union[str, DefaultMeta],
+        rows: t.Union[t.Iterable[t.Mapping[str, t.Any]], str, Path],
+        batch_size: int = 1000,
+        upsert: bool = False,
+        fmt: t.Optional[str] = None,
+    ) -> int:
+        """
+        Inserts rows into the model's table, `batch_size` rows at a time, as one
+        Core executemany call per batch on the connection for the model's bind.
+
+        Rows are dicts keyed by the attribute names of the model's columns. A path to
+        a JSON lines or CSV file, like those written by `Imp.export_model`, is read
+        one batch at a time.
+
+        Must be used within an app context. The session is committed once all rows
+        are inserted.
+
+        :param class_: the class name of the model, or the model class
+        :param rows: an iterable of dicts, or the path of a JSON lines or CSV file
+        :param batch_size: the number of rows to insert at a time
+        :param upsert: update the rows that already exist, matched on the primary key.
+                       Supported on SQLite, PostgreSQL, MySQL and MariaDB.
+        :param fmt: "jsonl" or "csv" - defaults to the suffix of the file
+        :return: the number of rows loaded
+        """
+        model = self.model(class_) if isinstance(class_, str) else class_
+
+        if isinstance(rows, (str, Path)):
+            path = Path(rows)
+            if fmt is None:
+                fmt = path.suffix.lstrip(".").lower()
+
+            if fmt not in IMPORT_FORMATS:
+                raise ValueError(
+                    f"Import format must be one of: {', '.join(IMPORT_FORMATS)}"
+                )
+
+            rows = read_rows(path, fmt)
+
+        return bulk_load_rows(model, rows, batch_size, upsert, fmt == "csv")
+
+    def paginate(
+        self,
+        class_: t.Union[str, DefaultMeta],
+        order_by: t.Union[str, t.Sequence[str], None] = None,
+        after: t.Optional[str] = None,
+        limit: int = 50,
+        where: t.Sequence[t.Any] = (),
+    ) -> Page:
+        """
+        Returns a page of the rows of the model, with the cursor of the next page.
+
+        Pages are read by keyset: the next page starts after the values of the
+        last row of this page, instead of skipping rows with OFFSET, so a deep page
+        costs the same as the first. The primary keys are added to `order_by` to
+        make the order unique. Columns in `order_by` should not contain NULL.
+
+        Must be used within an app context.
+
+        page = imp.paginate("Order", order_by="-created", after=request.args.get("after"))
+        return page.as_dict()
+
+        :param class_: the class name of the model, or the model class
+        :param order_by: the attribute names of the columns to order by, "-name" for
+                         descending - defaults to the primary keys
+        :param after: the `next_cursor` of the previous page, None for the first page
+        :param limit: the number of rows in a page
+        :param where: criteria to filter the rows by, the same for every page
+        :return: the Page
+        """
+        model = self.model(class_) if isinstance(class_, str) else class_
+        return paginate(model, self.model_meta(model), order_by, after, limit, where)
 
     def _apply_sqlalchemy_config(self) -> None:
+        # The replicas of the main database are added to SQLALCHEMY_BINDS.
+        build_binds = "SQLALCHEMY_BINDS" not in self.app.config
+
         if "SQLALCHEMY_DATABASE_URI" not in self.app.config:
             build_database_main(
-                self.app, self.app_instance_path, self.config.IMP_DATABASE_MAIN
+                self.app,
+                self.app_instance_path,
+                self.config.IMP_DATABASE_MAIN,
+                read_replicas=self.read_replicas,
+                bind_policies=self.bind_policies,
             )
 
-        if "SQLALCHEMY_BINDS" not in self.app.config:
+        if build_binds:
             build_database_binds(
                 flask_app=self.app,
                 app_instance_path=self.app_instance_path,
                 database_binds=self.config.IMP_DATABASE_BINDS
                 if self.config.IMP_DATABASE_BINDS
                 else None,
+                read_replicas=self.read_replicas,
+                bind_policies=self.bind_policies,
             )
 
     def _imp_blueprint_registration(self, imp_blueprint: ImpBlueprint) -> None:
@@ -356,7 +969,8 @@ class Imp:
             )
             return
 
-        parent.register_blueprint(child)
+        with profile("register", child.name):
+            parent.register_blueprint(child)
 
         for partial_model in child.models:
             partial_model(imp_instance=self)
@@ -371,29 +985,272 @@ class Imp:
             self.config.IMP_INIT_SESSION.update(child.config.init_session)
 
     def _flask_blueprint_registration(self, blueprint: Blueprint) -> None:
-        self.app.register_blueprint(blueprint)
+        with profile("register", blueprint.name):
+            self.app.register_blueprint(blueprint)
 
     @staticmethod
     def _nested_flask_blueprint_registration(
         parent: Blueprint,
         child: Blueprint,
     ) -> None:
-        parent.register_blueprint(blueprint=child)
+        with profile("register", child.name):
+            parent.register_blueprint(blueprint=child)
+
+    def _import_models(self, file_or_folder_path: Path) -> None:
+        """
+        Imports the models from the given file or folder, replaying the
+        import manifest if possible.
+        """
+        key = f"models:{file_or_folder_path}"
+        if self.config.IMP_LAZY_MODELS:
+            key = f"lazy-{key}"
+
+        plan: t.Optional[t.List[t.List[t.Any]]] = None
+        if self._manifest is not None:
+            plan = self._manifest.plan(key)
+
+        if plan is not None:
+            for import_string, names in plan:
+                self._register_models(import_string, names)
+            return
+
+        model_files: t.List[Path] = []
+
+        if file_or_folder_path.is_file() and file_or_folder_path.suffix == ".py":
+            model_files = [file_or_folder_path]
+
+        elif file_or_folder_path.is_dir():
+            model_files = [
+                _ for _ in file_or_folder_path.iterdir() if "__" not in _.name
+            ]
+
+        if self.config.IMP_LAZY_MODELS:
+            plan = [
+                [cast_to_import_str(self.app_name, model_file), names]
+                for model_file in model_files
+                if model_file.suffix == ".py"
+                and (names := scan_model_classes(model_file))
+            ]
+            for import_string, names in plan:
+                self._register_models(import_string, names)
+        else:
+            plan = [list(self._process_model(model_file)) for model_file in model_files]
 
-    def _process_model(self, path: Path) -> None:
+        if self._manifest is not None:
+            self._manifest.record(key, [file_or_folder_path, *model_files], plan)
+            self._save_manifest()
+
+    def _process_model(self, path: Path) -> t.Tuple[str, t.List[str]]:
         """
         Picks apart the model from_file and builds a registry of the models found.
+
+        Returns the import string and the names of the models found.
         """
         import_string = cast_to_import_str(self.app_name, path)
+        names: t.List[str] = []
         try:
-            model_module = import_module(import_string)
+            with profile("import", import_string):
+                model_module = import_module(import_string)
+
+            self._watch_for_restart(model_module)
+
             for name, value in getmembers(model_module, isclass):
                 if hasattr(value, "__tablename__"):
                     self.model_registry.add(name, value)
+                    names.append(name)
 
         except ImportError as e:
             raise ImportError(f"Error when importing {import_string}: {e}")
 
+        return import_string, names
+
+    def _register_models(self, import_string: str, names: t.List[str]) -> None:
+        """
+        Registers the named models from the given module, used when replaying
+        the import manifest. The module is not imported if lazy models are enabled.
+        """
+        if self.config.IMP_LAZY_MODELS:
+            for name in names:
+                self.model_registry.add_lazy(name, import_string)
+            return
+
+        try:
+            with profile("import", import_string):
+                model_module = import_module(import_string)
+        except ImportError as e:
+            raise ImportError(f"Error when importing {import_string}: {e}")
+
+        self._watch_for_restart(model_module)
+
+        for name in names:
+            self.model_registry.add(name, getattr(model_module, name))
+
+    def _import_blueprint_package(
+        self, blueprint_path: Path, package: t.Optional[str] = None
+    ) -> t.Optional[t.Tuple[str, t.List[str]]]:
+        """
+        Imports the blueprint package at the given path and registers any
+        blueprints found.
+
+        Returns the import string and the names of the blueprints found.
+        """
+        if not blueprint_path.exists() or not blueprint_path.is_dir():
+            return None
+
+        import_str = cast_to_import_str(
+            package if package else self.app_name, blueprint_path
+        )
+
+        with self._import_context(), profile("blueprint", import_str):
+            with profile("import", import_str):
+                module = import_module(import_str)
+
+            names: t.List[str] = []
+            for name, potential_blueprint in getmembers(module):
+                if isinstance(potential_blueprint, Blueprint):
+                    names.append(name)
+
+            self._register_blueprint_members(import_str, names, module)
+
+        return import_str, names
+
+    def _register_blueprint_members(
+        self,
+        import_str: str,
+        names: t.List[str],
+        module: t.Optional[ModuleType] = None,
+    ) -> None:
+        """
+        Registers the named blueprints from the given module.
+        """
+        if module is None:
+            with self._import_context(), profile("blueprint", import_str):
+                with profile("import", import_str):
+                    module = import_module(import_str)
+
+                self._register_blueprint_members(import_str, names, module)
+                return
+
+        self._watch_for_restart(module)
+
+        for name in names:
+            potential_blueprint = getattr(module, name, None)
+
+            if isinstance(potential_blueprint, ImpBlueprint):
+                self._imp_blueprint_registration(potential_blueprint)
+                continue
+
+            if isinstance(potential_blueprint, Blueprint):
+                self._flask_blueprint_registration(potential_blueprint)
+
+    def _lazy_url_build_error(
+        self, error: Exception, endpoint: str, values: t.Dict[str, t.Any]
+    ) -> str:
+        """
+        Loads the lazy blueprint whose name prefixes the endpoint, then tries to
+        build the URL again.
+        """
+        lazy_blueprint = self._lazy_blueprints.get(endpoint.split(".")[0])
+
+        if lazy_blueprint is None:
+            raise error
+
+        lazy_blueprint.load()
+
+        values = dict(values)
+        anchor = values.pop("_anchor", None)
+        method = values.pop("_method", None)
+        scheme = values.pop("_scheme", None)
+        external = values.pop("_external", None)
+
+        url_adapter = self.app.create_url_adapter(
+            request if has_request_context() else None
+        )
+        if url_adapter is None:
+            raise error
+
+        rv = url_adapter.build(
+            endpoint,
+            values,
+            method=method,
+            url_scheme=scheme,
+            force_external=bool(external),
+        )
+
+        if anchor is not None:
+            rv = f"{rv}#{quote(anchor, safe=URL_ANCHOR_SAFE)}"
+
+        return rv
+
+    def _init_template_bytecode_cache(self) -> None:
+        """
+        Stores the compiled Jinja templates in the app instance folder, so
+        they are not compiled again by each process.
+        """
+        cache_folder = self.app_instance_path / "jinja_bytecode_cache"
+        cache_folder.mkdir(exist_ok=True)
+        self._set_jinja_option(
+            "bytecode_cache", FileSystemBytecodeCache(str(cache_folder))
+        )
+
+    def _init_static_files(self) -> None:
+        from .utilities import static_url_for
+
+        static_files = self.static_files = StaticFiles(self)
+        static_files.load()
+
+        # Serves in place of the view, so the before request handlers of the
+        # app, like auth guards, still run for static requests.
+        dispatch_request = self.app.dispatch_request
+
+        def static_dispatch_request() -> t.Any:
+            response = static_files.serve()
+            return dispatch_request() if response is None else response
+
+        self.app.dispatch_request = static_dispatch_request  # type: ignore[method-assign]
+        if self.config.IMP_STATIC_FINGERPRINTS:
+            self.app.add_template_global(static_url_for)
+
+    def _set_jinja_option(self, name: str, value: t.Any) -> None:
+        """
+        Sets the option on the Jinja environment, or in the app jinja_options
+        if the environment has not been created yet.
+        """
+        if "jinja_env" in self.app.__dict__:
+            setattr(self.app.jinja_env, name, value)
+        else:
+            self.app.jinja_options = {**self.app.jinja_options, name: value}
+
+    @contextmanager
+    def _import_context(self) -> t.Iterator[None]:
+        """
+        Makes this Imp instance available to any ImpBlueprint
+        that is created during the import.
+        """
+        token = current_imp.set(self)
+        try:
+            yield
+        finally:
+            current_imp.reset(token)
+
+    def _watch_for_restart(self, module: ModuleType) -> None:
+        if self.hot_reloader is not None:
+            self.hot_reloader.watch(module)
+
+    def _load_models_on_configure(self) -> None:
+        if self._configure_listener is None or not event.contains(
+            Mapper, "before_configured", self._configure_listener
+        ):
+            self._configure_listener = load_models_on_configure(self)
+
+    def _warm_eager_binds(self) -> None:
+        if self.bind_policies.eager:
+            self.warm_binds()
+
+    def _save_manifest(self) -> None:
+        if self._manifest is not None:
+            self._manifest.save()
+
     def _init_session(self) -> None:
         if isinstance(self.config.IMP_INIT_SESSION, dict):
             _: t.Dict[str, t.Any] = self.config.IMP_INIT_SESSION
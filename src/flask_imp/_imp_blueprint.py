@@ -5,17 +5,22 @@ from functools import partial
 from importlib import import_module
 from importlib.util import find_spec
 from inspect import getmembers
+from mimetypes import guess_type
 from pathlib import Path
 
-from flask import Blueprint
+from flask import Blueprint, Response, current_app, request
 
 from ._exceptions import NoConfigProvided
+from ._static import StaticOffload
 from ._utilities import (
     cast_to_import_str,
+    current_imp,
     slug,
+    import_resource_modules,
     partial_models_import,
     partial_database_binds,
-    process_folder_file_scope,
+    profile,
+    run_resource_factories,
 )
 
 if t.TYPE_CHECKING:
@@ -40,6 +45,8 @@ class ImpBlueprint(Blueprint):
     nested_blueprints: t.Set[t.Union["ImpBlueprint", Blueprint]]
     database_binds: t.Set[t.Any]
 
+    static_offload: t.Optional[StaticOffload] = None
+
     def __init__(self, dunder_name: str, config: ImpBlueprintConfig) -> None:
         """
         Initializes the ImpBlueprint.
@@ -76,6 +83,14 @@ class ImpBlueprint(Blueprint):
             self.bp_name, self.package, **self.config.flask_blueprint_args()
         )
 
+        if config.static_offload and config.static_folder:
+            self.static_offload = StaticOffload(
+                config.static_offload,
+                config.static_offload_location,
+                config.static_offload_min_size,
+            )
+            self.before_request(self._offload_static)
+
     def _prevent_if_disabled(self: "ImpBlueprint") -> bool:
         """
         A helper function that will prevent the blueprint from
@@ -85,6 +100,28 @@ class ImpBlueprint(Blueprint):
             return True
         return False
 
+    def _offload_static(self) -> t.Optional[Response]:
+        """
+        Hands requests for the blueprint's static files to the proxy, if the
+        file is large enough to be offloaded.
+        """
+        if (
+            self.static_offload is None
+            or self.static_folder is None
+            or request.endpoint is None
+            or not request.endpoint.endswith(".static")
+            or current_app.blueprints.get(request.blueprint or "") is not self
+        ):
+            return None
+
+        filename = (request.view_args or {}).get("filename", "")
+        return self.static_offload.response(
+            Path(self.static_folder),
+            filename,
+            guess_type(filename)[0] or "application/octet-stream",
+            self.get_send_file_max_age(filename),
+        )
+
     def _process_database_binds(
         self,
         database_binds: t.Optional[
@@ -130,6 +167,7 @@ class ImpBlueprint(Blueprint):
         folder: str = "resources",
         factories: t.Optional[t.Union[t.List[str], str]] = "include",
         scope_import: t.Optional[t.Dict[str, t.Union[t.List[str], str]]] = None,
+        max_workers: t.Optional[int] = None,
     ) -> None:
         """
         Will import resources (cli, routes, filters, context_processors...)
@@ -182,6 +220,8 @@ class ImpBlueprint(Blueprint):
         :param factories: a list of or single function name(s) to pass the
                           blueprint instance to and call. Defaults to "include"
         :param scope_import: a dict of files to import e.g. {"folder_name": "*"}
+        :param max_workers: import the modules on a thread pool of this size first,
+                            factories are still called in order on the calling thread.
         :return: None
         """
 
@@ -208,38 +248,21 @@ class ImpBlueprint(Blueprint):
                 f"Resources location must be a folder, value given: {resource_folder}"
             )
 
-        module_paths_to_import: t.List[Path] = process_folder_file_scope(
-            resource_folder, scope_import
+        imp_instance = current_imp.get()
+
+        imported_modules = import_resource_modules(
+            resource_folder,
+            scope_import,
+            factories,
+            lambda module_path: (
+                f"{self.package}.{module_path.parent.name}.{module_path.stem}"
+            ),
+            imp_instance._manifest if imp_instance is not None else None,
+            max_workers,
         )
 
-        imported_modules: set[t.Any] = set()
-
-        for module_path in module_paths_to_import:
-            if module_path.name.startswith(".") or module_path.name.startswith(
-                "__"
-            ):  # skip hidden files / folders
-                continue
-
-            try:
-                # attempt to import the module
-                module = import_module(
-                    f"{self.package}.{module_path.parent.name}.{module_path.stem}"
-                )
-                # add the module to the set of imported modules
-                imported_modules.add(module)
-            except ImportError as e:
-                raise ImportError(
-                    f"Error when importing {self.package}.{module_path.parent.name}.{module_path.stem}: {e}"
-                )
-
         # check if each module has any valid factories, if so, pass the blueprint
-        for instance_factory in factories:
-            for stored_module in imported_modules:
-                if hasattr(stored_module, instance_factory):
-                    getattr(stored_module, instance_factory)(self)
-
-        # clear the set of imported modules
-        imported_modules.clear()
+        run_resource_factories(imported_modules, factories, self)
 
     def import_nested_blueprint(self, blueprint: t.Union[str, Path]) -> None:
         """
@@ -264,9 +287,9 @@ class ImpBlueprint(Blueprint):
                 raise ValueError("Blueprint must be a string or a Path object")
 
         if potential_bp.exists() and potential_bp.is_dir():
-            module = import_module(
-                cast_to_import_str(self.package.split(".")[0], potential_bp)
-            )
+            import_str = cast_to_import_str(self.package.split(".")[0], potential_bp)
+            with profile("import", import_str):
+                module = import_module(import_str)
             for name, potential in getmembers(module):
                 if isinstance(potential, ImpBlueprint):
                     self.nested_blueprints.add(potential)
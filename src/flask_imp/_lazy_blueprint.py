@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import typing as t
+from pathlib import Path
+from threading import RLock
+
+from flask import Flask, abort, request
+from flask.globals import request_ctx
+
+from ._utilities import remove_url_rules, slug
+
+if t.TYPE_CHECKING:
+    from werkzeug.routing import Rule
+
+    from ._imp import Imp
+
+LAZY_METHODS = ["GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"]
+
+
+class LazyLoading:
+    """
+    !! Private class !!
+
+    Collects the URL rules added while lazy blueprints are registered, so the
+    URL map of the app can be replaced by a complete one in a single step,
+    instead of being changed while requests on other threads are matched
+    against it. Lazy blueprints loaded while another is loading share it.
+    """
+
+    def __init__(self) -> None:
+        self.lock = RLock()
+        self.rules: t.List[Rule] = []
+        self.endpoints: t.Set[str] = set()
+        self.depth = 0
+
+    def start(self, app: Flask) -> None:
+        self.depth += 1
+        if self.depth > 1:
+            return
+
+        app.url_map.add = self.rules.append  # type: ignore[assignment]
+        # The app may have already handled its first request, registration is
+        # allowed here as the placeholder rules have held the URL prefix.
+        app._check_setup_finished = lambda f_name: None  # type: ignore[method-assign]
+
+    def finish(self, app: Flask) -> None:
+        self.depth -= 1
+        if self.depth > 0:
+            return
+
+        del app.url_map.add
+        del app._check_setup_finished
+
+        # The placeholder views stay, requests matched against the old map
+        # still call them, and are dispatched again against the new map.
+        remove_url_rules(app, self.endpoints, self.rules, remove_views=False)
+        self.rules = []
+        self.endpoints = set()
+
+
+class LazyBlueprint:
+    """
+    !! Private class !!
+
+    Reserves the URL prefix (and subdomain) of a blueprint package, and imports and
+    registers the package on the first request that matches the prefix.
+    """
+
+    imp: Imp
+    blueprint_path: Path
+    package: t.Optional[str]
+    url_prefix: str
+    subdomain: t.Optional[str]
+    endpoint: str
+    loaded: bool
+    loading: LazyLoading
+
+    def __init__(
+        self,
+        imp: Imp,
+        blueprint_path: Path,
+        package: t.Optional[str],
+        url_prefix: t.Optional[str],
+        subdomain: t.Optional[str],
+        loading: LazyLoading,
+    ) -> None:
+        self.imp = imp
+        self.blueprint_path = blueprint_path
+        self.package = package
+        self.url_prefix = (url_prefix or f"/{slug(blueprint_path.name)}").rstrip("/")
+        self.subdomain = subdomain
+        self.endpoint = f"imp_lazy_blueprint_{blueprint_path.name}"
+        self.loaded = False
+        self.loading = loading
+
+    @property
+    def name(self) -> str:
+        return self.blueprint_path.name
+
+    def reserve(self) -> None:
+        """
+        Adds the placeholder rules that match the URL prefix.
+        """
+        for rule in dict.fromkeys(
+            (
+                self.url_prefix or "/",
+                f"{self.url_prefix}/",
+                f"{self.url_prefix}/<path:imp_lazy_path>",
+            )
+        ):
+            self.imp.app.add_url_rule(
+                rule,
+                endpoint=self.endpoint,
+                view_func=self.dispatch,
+                subdomain=self.subdomain,
+                methods=LAZY_METHODS,
+                provide_automatic_options=False,
+            )
+
+    def load(self) -> bool:
+        """
+        Imports and registers the blueprint package, and removes the placeholder rules.
+
+        :return: True if the package was loaded by this call
+        """
+        with self.loading.lock:
+            if self.loaded:
+                return False
+
+            app = self.imp.app
+            binds = set(app.config.get("SQLALCHEMY_BINDS") or ())
+
+            self.loading.start(app)
+            try:
+                self.imp._import_blueprint_package(self.blueprint_path, self.package)
+                self.loading.endpoints.add(self.endpoint)
+                self.loaded = True
+            finally:
+                self.loading.finish(app)
+
+            declared = (
+                set(app.config.get("SQLALCHEMY_BINDS") or ())
+                - binds
+                - set(self.imp.bind_policies.lazy)
+            )
+            if declared and "sqlalchemy" in app.extensions:
+                app.logger.warning(
+                    f"Lazy blueprint [{self.name}] declares the database binds "
+                    f"{sorted(declared)} after Flask-SQLAlchemy was set up, they have "
+                    "no engine. Set them in ImpConfig(database_binds=...) instead."
+                )
+
+            return True
+
+    def dispatch(self, **_: t.Any) -> t.Any:
+        """
+        The view of the placeholder rules. Loads the blueprint, then matches
+        and dispatches the request again against the updated URL map.
+        """
+        self.load()
+
+        app = self.imp.app
+        ctx = request_ctx._get_current_object()  # type: ignore[attr-defined]
+        ctx.url_adapter = app.create_url_adapter(ctx.request)
+        ctx.match_request()
+
+        if request.routing_exception is not None:
+            raise request.routing_exception
+
+        if request.url_rule is None or request.url_rule.endpoint == self.endpoint:
+            abort(404)
+
+        # The app level preprocessors have already run, run the blueprint ones.
+        names = tuple(reversed(request.blueprints))
+
+        for name in names:
+            for url_func in app.url_value_preprocessors.get(name, ()):
+                url_func(request.endpoint, request.view_args)
+
+        for name in names:
+            for before_func in app.before_request_funcs.get(name, ()):
+                rv = app.ensure_sync(before_func)()
+                if rv is not None:
+                    return rv
+
+        return app.ensure_sync(app.view_functions[request.url_rule.endpoint])(
+            **(request.view_args or {})
+        )
+
+    def __repr__(self) -> str:
+        return f"LazyBlueprint({self.name}, url_prefix={self.url_prefix})"
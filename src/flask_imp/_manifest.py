@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import json
+import os
+import typing as t
+from pathlib import Path
+
+from ._utilities import write_text_atomic
+
+if t.TYPE_CHECKING:
+    from logging import Logger
+
+
+class ImportManifest:
+    """
+    !! Private class !!
+
+    Stores the resolved import plan of an Imp instance in a JSON file.
+
+    Each entry is stored under a key that describes the import operation
+    (for example: the resources folder and its scope), along with a
+    fingerprint of the folders and files that were scanned to build it.
+    The fingerprint is made from the modification time of each path,
+    adding, removing or renaming a file changes the modification time
+    of its folder, which causes the entry to be rebuilt.
+    """
+
+    version: int = 1
+
+    file_path: Path
+    logger: Logger
+    entries: t.Dict[str, t.Dict[str, t.Any]]
+    changed: bool
+
+    def __init__(self, file_path: Path, logger: Logger) -> None:
+        self.file_path = file_path
+        self.logger = logger
+        self.entries = {}
+        self.changed = False
+        self.load()
+
+    @staticmethod
+    def fingerprint(paths: t.Iterable[t.Union[Path, str]]) -> t.Dict[str, int]:
+        """
+        Returns the modification time of each path, -1 if the path is missing.
+
+        :param paths: the folders and files to fingerprint
+        :return: dict of path -> modification time in nanoseconds
+        """
+        result: t.Dict[str, int] = {}
+        for path in paths:
+            try:
+                result[str(path)] = os.stat(path).st_mtime_ns
+            except OSError:
+                result[str(path)] = -1
+        return result
+
+    def load(self) -> None:
+        """
+        Loads the manifest file, an unreadable or outdated file is ignored.
+        """
+        try:
+            data = json.loads(self.file_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+
+        if not isinstance(data, dict) or data.get("version") != self.version:
+            return
+
+        entries = data.get("entries")
+        if isinstance(entries, dict):
+            self.entries = entries
+
+    def save(self) -> None:
+        """
+        Writes the manifest file if any entries have changed since the last save.
+
+        The manifest is only a cache, a failed write is logged and the app
+        carries on starting.
+        """
+        if not self.changed:
+            return
+
+        try:
+            write_text_atomic(
+                self.file_path,
+                json.dumps(
+                    {"version": self.version, "entries": self.entries}, indent=1
+                ),
+            )
+        except OSError as e:
+            self.logger.warning(f"Could not write the import manifest: {e}")
+            return
+
+        self.changed = False
+
+    def plan(self, key: str) -> t.Optional[t.Any]:
+        """
+        Returns the recorded plan for the given key, if the fingerprint still matches.
+
+        :param key: the key of the import operation
+        :return: the recorded plan or None
+        """
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+
+        fingerprint = entry.get("fingerprint", {})
+        if self.fingerprint(fingerprint.keys()) != fingerprint:
+            return None
+
+        return entry.get("plan")
+
+    def record(
+        self, key: str, paths: t.Iterable[t.Union[Path, str]], plan: t.Any
+    ) -> None:
+        """
+        Records the plan for the given key, along with the fingerprint of the paths
+        that were scanned to build it.
+
+        :param key: the key of the import operation
+        :param paths: the folders and files that were scanned
+        :param plan: the JSON serializable plan
+        """
+        entry = {"fingerprint": self.fingerprint(paths), "plan": plan}
+        if self.entries.get(key) != entry:
+            self.entries[key] = entry
+            self.changed = True
+
+    def __repr__(self) -> str:
+        return f"ImportManifest({self.file_path})"
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import base64
+import json
+import typing as t
+from dataclasses import dataclass, field
+
+from flask import current_app
+from sqlalchemy import and_, inspect, or_, select
+
+from ._bulk_load import import_converter
+from ._export import export_value
+
+if t.TYPE_CHECKING:
+    from sqlalchemy.sql.elements import ColumnElement
+
+
+@dataclass
+class Page:
+    """
+    A page of rows of a model, returned by `Imp.paginate`.
+
+    Pass `next_cursor` as `after` to get the next page, it is None on the last page.
+    """
+
+    items: t.List[t.Any]
+    next_cursor: t.Optional[str]
+    columns: t.List[str] = field(default_factory=list)
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def as_dict(
+        self, columns: t.Optional[t.Sequence[str]] = None
+    ) -> t.Dict[str, t.Any]:
+        """
+        Returns the page as a dict that can be returned from a view as JSON,
+        with the values converted as `Imp.export_model` does.
+
+        :param columns: the attribute names of the columns of each item - defaults to all columns
+        """
+        keys = list(columns or self.columns)
+        return {
+            "items": [
+                {key: export_value(getattr(item, key)) for key in keys}
+                for item in self.items
+            ],
+            "next_cursor": self.next_cursor,
+        }
+
+
+def parse_order_by(
+    meta: t.Dict[str, t.Any], order_by: t.Union[str, t.Sequence[str], None]
+) -> t.List[t.Tuple[str, bool]]:
+    """
+    !! Private function !!
+
+    Returns the attribute names of the columns to order by, and whether each is
+    descending ("-name"). The primary keys are added to make the order unique,
+    in the direction of the last column.
+    """
+    names = [order_by] if isinstance(order_by, str) else list(order_by or ())
+    order: t.List[t.Tuple[str, bool]] = []
+
+    for name in names:
+        key = name.lstrip("-")
+        if key not in meta["columns"]:
+            raise ValueError(f"Model has no column named: {key}")
+        order.append((key, name.startswith("-")))
+
+    descending = order[-1][1] if order else False
+    ordered = {key for key, _ in order}
+    order.extend(
+        (key, descending) for key in meta["primary_keys"] if key not in ordered
+    )
+    return order
+
+
+def order_signature(order: t.List[t.Tuple[str, bool]]) -> t.List[str]:
+    """
+    !! Private function !!
+    """
+    return [f"-{key}" if descending else key for key, descending in order]
+
+
+def encode_cursor(order: t.List[t.Tuple[str, bool]], values: t.Sequence[t.Any]) -> str:
+    """
+    !! Private function !!
+
+    Returns the values of the last row of a page, and the order they were read
+    in, as URL safe base64 JSON.
+    """
+    data = json.dumps(
+        {"o": order_signature(order), "v": [export_value(v) for v in values]},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(data.encode()).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(
+    model: t.Any, order: t.List[t.Tuple[str, bool]], cursor: str
+) -> t.List[t.Any]:
+    """
+    !! Private function !!
+
+    Returns the values in the cursor, converted back to the types of the columns.
+    Raises ValueError if the cursor is not valid, or was made for another order.
+    """
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        signature, values = data["o"], data["v"]
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError("Invalid cursor") from e
+
+    if not isinstance(signature, list) or not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+
+    if signature != order_signature(order) or len(values) != len(order):
+        raise ValueError("The cursor was made for a different order_by")
+
+    mapper = inspect(model)
+    try:
+        return [
+            import_converter(mapper.get_property(key).columns[0])(value)
+            for (key, _), value in zip(order, values)
+        ]
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def seek_criteria(
+    model: t.Any, order: t.List[t.Tuple[str, bool]], values: t.List[t.Any]
+) -> ColumnElement[bool]:
+    """
+    !! Private function !!
+
+    Returns the criteria of the rows after the values in the order:
+    a > x OR (a = x AND b > y) OR ..., with < for descending columns.
+
+    The first column is also bound on its own, so an index on it can be used.
+    """
+    columns = [getattr(model, key) for key, _ in order]
+    clauses = []
+
+    for i, ((_, descending), column, value) in enumerate(zip(order, columns, values)):
+        equal = [columns[j] == values[j] for j in range(i)]
+        clauses.append(and_(*equal, column < value if descending else column > value))
+
+    first = columns[0] <= values[0] if order[0][1] else columns[0] >= values[0]
+    return and_(first, or_(*clauses))
+
+
+def paginate(
+    model: t.Any,
+    meta: t.Dict[str, t.Any],
+    order_by: t.Union[str, t.Sequence[str], None],
+    after: t.Optional[str],
+    limit: int,
+    where: t.Sequence[ColumnElement[bool]],
+) -> Page:
+    """
+    !! Private function !!
+
+    Selects the `limit` rows that come after the cursor in the order, by seeking
+    past the values of the last row of the previous page instead of counting
+    rows with OFFSET, so each page costs the same however deep it is.
+    """
+    if limit < 1:
+        raise ValueError("limit must be 1 or more")
+
+    db = current_app.extensions["sqlalchemy"]
+    order = parse_order_by(meta, order_by)
+
+    statement = select(model).where(*where)
+    if after:
+        statement = statement.where(
+            seek_criteria(model, order, decode_cursor(model, order, after))
+        )
+
+    statement = statement.order_by(
+        *(
+            getattr(model, key).desc() if descending else getattr(model, key)
+            for key, descending in order
+        )
+    ).limit(limit + 1)
+
+    items = list(db.session.scalars(statement))
+    next_cursor = None
+
+    if len(items) > limit:
+        items = items[:limit]
+        next_cursor = encode_cursor(
+            order, [getattr(items[-1], key) for key, _ in order]
+        )
+
+    return Page(items, next_cursor, list(meta["columns"]))
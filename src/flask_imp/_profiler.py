@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import json
+import tracemalloc
+import typing as t
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from time import perf_counter
+
+# Set by `flask-imp profile` while it loads the app.
+PROFILE_STARTUP: ContextVar[bool] = ContextVar("imp_profile_startup", default=False)
+
+
+@dataclass
+class ProfileEntry:
+    """
+    A timed step of the app startup, and the steps that happened within it.
+    """
+
+    kind: str
+    name: str
+    seconds: float = 0.0
+    memory: int = 0
+    children: t.List["ProfileEntry"] = field(default_factory=list)
+
+    def as_dict(self) -> t.Dict[str, t.Any]:
+        return {
+            "kind": self.kind,
+            "name": self.name,
+            "seconds": self.seconds,
+            "memory": self.memory,
+            "children": [child.as_dict() for child in self.children],
+        }
+
+
+class StartupProfiler:
+    """
+    Records the wall time and memory allocated by each module import,
+    factory call and blueprint registration done by Imp.
+
+    The memory is measured using tracemalloc, which is started by the
+    profiler if it is not already tracing, and stopped by `stop`. Imp calls
+    `stop` when the first request starts.
+    """
+
+    root: ProfileEntry
+
+    def __init__(self, name: str) -> None:
+        self.root = ProfileEntry("app", name)
+        self._current: ContextVar[ProfileEntry] = ContextVar(
+            "current_profile_entry", default=self.root
+        )
+
+        self._started_tracing = not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+
+    @contextmanager
+    def record(self, kind: str, name: str) -> t.Iterator[ProfileEntry]:
+        """
+        Records the time and memory taken by the body of the with block.
+
+        :param kind: the kind of step, for example: import, factory, register
+        :param name: the name of the module, factory or blueprint
+        """
+        entry = ProfileEntry(kind, name)
+        self._current.get().children.append(entry)
+        token = self._current.set(entry)
+
+        memory_start = tracemalloc.get_traced_memory()[0]
+        start = perf_counter()
+        try:
+            yield entry
+        finally:
+            entry.seconds = perf_counter() - start
+            entry.memory = tracemalloc.get_traced_memory()[0] - memory_start
+            self._current.reset(token)
+            self.root.seconds = sum(child.seconds for child in self.root.children)
+            self.root.memory = sum(child.memory for child in self.root.children)
+
+    def stop(self) -> None:
+        """
+        Stops tracemalloc, if it was started by the profiler.
+        """
+        if self._started_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def as_dict(self) -> t.Dict[str, t.Any]:
+        """
+        Returns the report as a dict.
+        """
+        return self.root.as_dict()
+
+    def as_json(self, indent: t.Optional[int] = 2) -> str:
+        """
+        Returns the report as a JSON string.
+        """
+        return json.dumps(self.as_dict(), indent=indent)
+
+    def render(self, min_seconds: float = 0.0) -> str:
+        """
+        Returns the report as a text tree.
+
+        :param min_seconds: hide steps that took less time than this
+        """
+        lines: t.List[str] = []
+
+        def _render(entry: ProfileEntry, depth: int) -> None:
+            lines.append(
+                f"{entry.seconds * 1000:>10.2f} ms "
+                f"{entry.memory / 1024:>10.1f} KiB  "
+                f"{'  ' * depth}{entry.kind}: {entry.name}"
+            )
+            for child in entry.children:
+                if child.seconds >= min_seconds:
+                    _render(child, depth + 1)
+
+        _render(self.root, 0)
+        return "\n".join(lines)
+
+    def __repr__(self) -> str:
+        return f"StartupProfiler({self.root.name}, {self.root.seconds:.3f}s)"
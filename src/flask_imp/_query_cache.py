@@ -0,0 +1,492 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import typing as t
+from collections import OrderedDict
+from pathlib import Path
+from time import time
+
+from flask import current_app, has_app_context
+from flask_sqlalchemy.session import Session as FlaskSession
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, loading
+from sqlalchemy.sql.util import find_tables
+
+if t.TYPE_CHECKING:
+    from sqlalchemy import TableClause
+    from sqlalchemy.engine import Result
+    from sqlalchemy.orm import ORMExecuteState
+
+_WRITTEN = "imp_query_cache_written"
+
+
+def table_tag(table: TableClause) -> str:
+    """
+    !! Private function !!
+
+    Returns the name that cache entries of the table are tagged with,
+    prefixed by its bind key, as binds can have tables of the same name.
+    """
+    metadata = getattr(table, "metadata", None)
+    bind_key = metadata.info.get("bind_key") if metadata is not None else None
+    return f"{bind_key or ''}:{table.fullname}"
+
+
+def statement_tags(statement: t.Any) -> t.Set[str]:
+    """
+    !! Private function !!
+    """
+    return {
+        table_tag(table)
+        for table in find_tables(
+            statement, include_joins=True, include_aliases=True, include_crud=True
+        )
+    }
+
+
+def tables_written(session: Session, tags: t.Iterable[str]) -> None:
+    """
+    !! Private function !!
+
+    Records that the session's transaction wrote to the tables, so their
+    cache entries are invalidated when it commits.
+    """
+    session.info.setdefault(_WRITTEN, set()).update(tags)
+
+
+def pending_tags(session: Session) -> t.Set[str]:
+    """
+    !! Private function !!
+
+    Returns the tags of the tables the session has changes to that are not
+    flushed yet. The cache is checked before autoflush runs.
+    """
+    return {
+        table_tag(table)
+        for instance in (*session.new, *session.dirty, *session.deleted)
+        for table in inspect(instance).mapper.tables
+    }
+
+
+class MemoryQueryCache:
+    """
+    !! Private class !!
+
+    A least recently used cache of query results, in the memory of the process.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: t.OrderedDict[str, t.Tuple[bytes, t.Optional[float]]] = (
+            OrderedDict()
+        )
+        self._tags: t.Dict[str, t.Set[str]] = {}
+        self._versions: t.Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> t.Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            value, expires = entry
+            if expires is not None and expires < time():
+                self._delete(key)
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def versions(self, tags: t.Iterable[str]) -> t.Dict[str, int]:
+        with self._lock:
+            return {tag: self._versions.get(tag, 0) for tag in tags}
+
+    def set(
+        self,
+        key: str,
+        value: bytes,
+        versions: t.Dict[str, int],
+        expires: t.Optional[float],
+    ) -> t.Tuple[bool, int]:
+        """
+        Stores the value if none of its tables were written to since `versions`
+        were read, returns whether it was stored and the number of entries evicted.
+        """
+        with self._lock:
+            if any(self._versions.get(tag, 0) != v for tag, v in versions.items()):
+                return False, 0
+
+            self._delete(key)
+            self._entries[key] = (value, expires)
+            for tag in versions:
+                self._tags.setdefault(tag, set()).add(key)
+
+            evicted = 0
+            while len(self._entries) > self.max_entries:
+                self._delete(next(iter(self._entries)))
+                evicted += 1
+
+            return True, evicted
+
+    def invalidate(self, tags: t.Iterable[str]) -> int:
+        with self._lock:
+            deleted = 0
+            for tag in tags:
+                self._versions[tag] = self._versions.get(tag, 0) + 1
+                for key in list(self._tags.pop(tag, ())):
+                    deleted += self._delete(key)
+            return deleted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _delete(self, key: str) -> int:
+        if self._entries.pop(key, None) is None:
+            return 0
+
+        for keys in self._tags.values():
+            keys.discard(key)
+        return 1
+
+
+class SQLiteQueryCache:
+    """
+    !! Private class !!
+
+    A cache of query results in an SQLite file, shared by the worker processes
+    of the app. When full, the entries stored first are evicted first.
+    """
+
+    def __init__(self, path: Path, max_entries: int) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+
+        with self._connect() as connection:
+            connection.executescript(
+                """
+                create table if not exists entries (
+                    id integer primary key autoincrement,
+                    key text unique not null,
+                    value blob not null,
+                    expires real
+                );
+                create table if not exists tags (
+                    tag text not null,
+                    entry_id integer not null references entries (id) on delete cascade
+                );
+                create index if not exists tags_tag on tags (tag);
+                create index if not exists tags_entry_id on tags (entry_id);
+                create table if not exists versions (
+                    tag text primary key,
+                    version integer not null
+                );
+                """
+            )
+
+    def get(self, key: str) -> t.Optional[bytes]:
+        row = (
+            self._connect()
+            .execute("select value, expires from entries where key = ?", (key,))
+            .fetchone()
+        )
+        if row is None or (row[1] is not None and row[1] < time()):
+            return None
+        return t.cast(bytes, row[0])
+
+    def versions(self, tags: t.Iterable[str]) -> t.Dict[str, int]:
+        tags = list(tags)
+        rows = (
+            self._connect()
+            .execute(
+                f"select tag, version from versions where tag in ({', '.join('?' * len(tags))})",
+                tags,
+            )
+            .fetchall()
+        )
+        return {**dict.fromkeys(tags, 0), **dict(rows)}
+
+    def set(
+        self,
+        key: str,
+        value: bytes,
+        versions: t.Dict[str, int],
+        expires: t.Optional[float],
+    ) -> t.Tuple[bool, int]:
+        connection = self._connect()
+        with connection:
+            connection.execute("begin immediate")
+
+            if self.versions(versions) != versions:
+                return False, 0
+
+            connection.execute("delete from entries where key = ?", (key,))
+            entry_id = connection.execute(
+                "insert into entries (key, value, expires) values (?, ?, ?)",
+                (key, value, expires),
+            ).lastrowid
+            connection.executemany(
+                "insert into tags (tag, entry_id) values (?, ?)",
+                [(tag, entry_id) for tag in versions],
+            )
+            evicted = connection.execute(
+                "delete from entries where id <= ?",
+                (t.cast(int, entry_id) - self.max_entries,),
+            ).rowcount
+
+        return True, evicted
+
+    def invalidate(self, tags: t.Iterable[str]) -> int:
+        tags = list(tags)
+        connection = self._connect()
+        with connection:
+            connection.execute("begin immediate")
+            connection.executemany(
+                "insert into versions (tag, version) values (?, 1) "
+                "on conflict (tag) do update set version = version + 1",
+                [(tag,) for tag in tags],
+            )
+            return connection.execute(
+                "delete from entries where id in "
+                f"(select entry_id from tags where tag in ({', '.join('?' * len(tags))}))",
+                tags,
+            ).rowcount
+
+    def clear(self) -> None:
+        connection = self._connect()
+        with connection:
+            connection.execute("delete from entries")
+
+    def __len__(self) -> int:
+        return t.cast(
+            int, self._connect().execute("select count(*) from entries").fetchone()[0]
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        # A connection per thread, and a new one in a forked process.
+        connection: t.Optional[sqlite3.Connection] = getattr(
+            self._local, "connection", None
+        )
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(
+                self.path, timeout=5, isolation_level=None, check_same_thread=False
+            )
+            connection.execute("pragma journal_mode = wal")
+            connection.execute("pragma synchronous = normal")
+            connection.execute("pragma foreign_keys = on")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+
+class QueryCache:
+    """
+    Caches the results of SELECT statements that only read from the tables of
+    the models passed to `Imp.cache_queries`.
+
+    Results are stored under a hash of the SQL and parameters, tagged with the
+    tables they read. When a session commits a transaction that wrote to a
+    table, the entries tagged with it are deleted. Each table also has a
+    version, so a result read before the commit is not stored after it.
+
+    Reads of a table that the session's open transaction has written to, or
+    has pending changes to that autoflush would write, go to the database, as
+    other sessions must not see uncommitted rows.
+
+    Statements that are not SELECT, INSERT, UPDATE or DELETE, like `text()`,
+    are treated as writing to every cached table. Writes that do not go through
+    a session, like Core statements on `db.engine`, are not seen.
+    """
+
+    backend: t.Union[MemoryQueryCache, SQLiteQueryCache]
+    ttl: t.Optional[float]
+    tags: t.Set[str]
+    metrics: t.Dict[str, int]
+
+    def __init__(
+        self,
+        backend: t.Union[MemoryQueryCache, SQLiteQueryCache],
+        ttl: t.Optional[float] = None,
+    ) -> None:
+        self.backend = backend
+        self.ttl = ttl
+        self.tags = set()
+        self.metrics = dict.fromkeys(
+            ("hits", "misses", "stores", "races", "invalidations", "evictions"), 0
+        )
+        self._lock = threading.Lock()
+        listen_for_queries()
+
+    def add_model(self, model: t.Any) -> None:
+        self.tags.update(table_tag(table) for table in inspect(model).tables)
+
+    def stats(self) -> t.Dict[str, t.Any]:
+        """
+        Returns the hits, misses, stores, invalidations and evictions counted by
+        this process, the hit ratio, and the number of entries in the cache.
+        """
+        with self._lock:
+            metrics: t.Dict[str, t.Any] = dict(self.metrics)
+
+        lookups = metrics["hits"] + metrics["misses"]
+        metrics["hit_ratio"] = metrics["hits"] / lookups if lookups else 0.0
+        metrics["entries"] = len(self.backend)
+        return metrics
+
+    def clear(self) -> None:
+        """
+        Deletes every entry.
+        """
+        self.backend.clear()
+
+    def execute(self, state: ORMExecuteState) -> t.Optional[Result[t.Any]]:
+        if state.is_insert or state.is_update or state.is_delete:
+            tables_written(state.session, statement_tags(state.statement))
+            return None
+
+        if not state.is_select:
+            # The tables of text() and other statements are not known.
+            tables_written(state.session, self.tags)
+            return None
+
+        if (
+            state.is_column_load
+            or state.execution_options.get("imp_cache") is False
+            or state.execution_options.get("yield_per")
+            or state.execution_options.get("stream_results")
+            or getattr(state.statement, "_for_update_arg", None) is not None
+        ):
+            return None
+
+        tags = statement_tags(state.statement)
+        if (
+            not tags
+            or not tags <= self.tags
+            or tags & state.session.info.get(_WRITTEN, set())
+            or tags & pending_tags(state.session)
+        ):
+            return None
+
+        statement: t.Any = state.statement
+        cache_key = statement._generate_cache_key()
+        if cache_key is None:
+            return None
+
+        key = hashlib.sha256(
+            json.dumps(
+                [
+                    sorted(tags),
+                    cache_key.to_offline_string({}, statement, state.parameters or {}),
+                ]
+            ).encode()
+        ).hexdigest()
+
+        value = self.backend.get(key)
+        if value is not None:
+            self._count("hits")
+            frozen = pickle.loads(value)
+        else:
+            self._count("misses")
+            versions = self.backend.versions(tags)
+            frozen = state.invoke_statement().freeze()
+            stored, evicted = self.backend.set(
+                key,
+                pickle.dumps(frozen),
+                versions,
+                time() + self.ttl if self.ttl is not None else None,
+            )
+            self._count("stores" if stored else "races")
+            self._count("evictions", evicted)
+
+        return t.cast(
+            "Result[t.Any]",
+            loading.merge_frozen_result(  # type: ignore[no-untyped-call]
+                state.session, statement, frozen, load=False
+            )(),
+        )
+
+    def flushed(self, session: Session) -> None:
+        tables_written(session, pending_tags(session))
+
+    def committed(self, session: Session) -> None:
+        tags = session.info.pop(_WRITTEN, None)
+        if tags:
+            self._count("invalidations", self.backend.invalidate(tags))
+
+    def _count(self, metric: str, amount: int = 1) -> None:
+        with self._lock:
+            self.metrics[metric] += amount
+
+
+def app_query_cache() -> t.Optional[QueryCache]:
+    """
+    !! Private function !!
+    """
+    if not has_app_context():
+        return None
+
+    imp = current_app.extensions.get("imp")
+    return getattr(imp, "query_cache", None)
+
+
+def cache_queries(state: ORMExecuteState) -> t.Optional[Result[t.Any]]:
+    """
+    !! Private function !!
+    """
+    query_cache = app_query_cache()
+    if query_cache is None:
+        return None
+    return query_cache.execute(state)
+
+
+def record_flush(session: Session, flush_context: t.Any) -> None:
+    """
+    !! Private function !!
+    """
+    query_cache = app_query_cache()
+    if query_cache is not None:
+        query_cache.flushed(session)
+
+
+def invalidate_on_commit(session: Session) -> None:
+    """
+    !! Private function !!
+    """
+    query_cache = app_query_cache()
+    if query_cache is not None:
+        query_cache.committed(session)
+
+
+def forget_writes(session: Session, previous_transaction: t.Any) -> None:
+    """
+    !! Private function !!
+
+    The writes of a rolled back transaction never reached other sessions.
+    The rollback of a savepoint keeps them, the writes before it may commit.
+    """
+    if previous_transaction.parent is None:
+        session.info.pop(_WRITTEN, None)
+
+
+def listen_for_queries() -> None:
+    """
+    !! Private function !!
+
+    Listens to every Flask-SQLAlchemy session, once per process.
+    """
+    if not event.contains(FlaskSession, "do_orm_execute", cache_queries):
+        event.listen(FlaskSession, "do_orm_execute", cache_queries)
+        event.listen(FlaskSession, "after_flush", record_flush)
+        event.listen(FlaskSession, "after_commit", invalidate_on_commit)
+        event.listen(FlaskSession, "after_soft_rollback", forget_writes)
@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import re
+import typing as t
+from collections import Counter
+from dataclasses import dataclass, field
+from threading import Lock
+from time import perf_counter
+
+from flask import Response, current_app, g, has_request_context, request
+from sqlalchemy import event
+
+from ._imp_blueprint import ImpBlueprint
+
+if t.TYPE_CHECKING:
+    from sqlalchemy.engine import Engine
+
+    from ._imp import Imp
+
+PARAMETER = re.compile(r"\?|%s|%\(\w+\)s|\$\d+|(?<!:):\w+")
+STRING = re.compile(r"'(?:[^']|'')*'")
+NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+PARAMETER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """
+    !! Private function !!
+
+    Returns the statement with its parameters and literals replaced by "?",
+    so statements that differ only by their values are counted together.
+    """
+    statement = STRING.sub("?", statement)
+    statement = PARAMETER.sub("?", statement)
+    statement = NUMBER.sub("?", statement)
+    statement = PARAMETER_LIST.sub("(?)", statement)
+    return WHITESPACE.sub(" ", statement).strip()
+
+
+def owning_blueprint() -> t.Optional[str]:
+    """
+    !! Private function !!
+
+    Returns the name of the innermost ImpBlueprint that the request's endpoint
+    belongs to, or the name of its blueprint if it is not in an ImpBlueprint.
+    """
+    for name in request.blueprints:
+        if isinstance(current_app.blueprints.get(name), ImpBlueprint):
+            return name
+    return request.blueprint
+
+
+@dataclass
+class RequestQueries:
+    """
+    The queries made during one request.
+    """
+
+    count: int = 0
+    seconds: float = 0.0
+    statements: t.Counter[str] = field(default_factory=Counter)
+
+    def repeated(self, threshold: int) -> t.Dict[str, int]:
+        return {
+            statement: count
+            for statement, count in self.statements.items()
+            if count >= threshold
+        }
+
+
+@dataclass
+class EndpointQueryStats:
+    """
+    The queries made by the requests to one endpoint, or one blueprint.
+    """
+
+    name: str
+    blueprint: t.Optional[str] = None
+    requests: int = 0
+    queries: int = 0
+    seconds: float = 0.0
+    max_queries: int = 0
+    n_plus_one_requests: int = 0
+    repeated: t.Dict[str, int] = field(default_factory=dict)
+
+    def add(self, queries: RequestQueries, repeated: t.Dict[str, int]) -> None:
+        self.requests += 1
+        self.queries += queries.count
+        self.seconds += queries.seconds
+        self.max_queries = max(self.max_queries, queries.count)
+
+        if repeated:
+            self.n_plus_one_requests += 1
+            for statement, count in repeated.items():
+                self.repeated[statement] = max(self.repeated.get(statement, 0), count)
+
+    def merge(self, other: EndpointQueryStats) -> None:
+        self.requests += other.requests
+        self.queries += other.queries
+        self.seconds += other.seconds
+        self.max_queries = max(self.max_queries, other.max_queries)
+        self.n_plus_one_requests += other.n_plus_one_requests
+        for statement, count in other.repeated.items():
+            self.repeated[statement] = max(self.repeated.get(statement, 0), count)
+
+    def as_dict(self) -> t.Dict[str, t.Any]:
+        return {
+            "blueprint": self.blueprint,
+            "requests": self.requests,
+            "queries": self.queries,
+            "seconds": self.seconds,
+            "mean_queries": self.queries / self.requests if self.requests else 0.0,
+            "mean_seconds": self.seconds / self.requests if self.requests else 0.0,
+            "max_queries": self.max_queries,
+            "n_plus_one_requests": self.n_plus_one_requests,
+            "repeated": dict(
+                sorted(self.repeated.items(), key=lambda item: item[1], reverse=True)
+            ),
+        }
+
+
+class QueryStats:
+    """
+    Counts the queries and database time of each request, on every engine of
+    Flask-SQLAlchemy, and flags statements run at least `repeat_threshold`
+    times in one request, the usual sign of an N+1 query.
+
+    The stats are added up per endpoint, available from `report()`. In debug
+    mode, they are also sent as response headers, and repeated statements are
+    logged as warnings.
+
+    Queries run after the response is returned, by a streamed response, are
+    not counted.
+    """
+
+    imp: Imp
+    repeat_threshold: int
+    endpoints: t.Dict[str, EndpointQueryStats]
+
+    def __init__(self, imp: Imp, repeat_threshold: int) -> None:
+        self.imp = imp
+        self.repeat_threshold = repeat_threshold
+        self.endpoints = {}
+        self._engines: t.Set[Engine] = set()
+        self._lock = Lock()
+
+    def instrument(self) -> None:
+        """
+        Listens to the cursor events of the engines that are not instrumented yet.
+        """
+        db = self.imp.app.extensions.get("sqlalchemy")
+        if db is None or len(self._engines) == len(db.engines):
+            return
+
+        for engine in db.engines.values():
+            self.instrument_engine(engine)
+
+    def instrument_engine(self, engine: Engine) -> None:
+        """
+        Listens to the cursor events of the engine, if it's not instrumented yet.
+        Also called with each lazy bind engine when it's created.
+        """
+        if engine not in self._engines:
+            event.listen(engine, "before_cursor_execute", self._before_execute)
+            event.listen(engine, "after_cursor_execute", self._after_execute)
+            self._engines.add(engine)
+
+    def before_request(self) -> None:
+        self.instrument()
+        g._imp_queries = RequestQueries()
+
+    def after_request(self, response: Response) -> Response:
+        queries: t.Optional[RequestQueries] = g.pop("_imp_queries", None)
+        if queries is None:
+            return response
+
+        endpoint = request.endpoint or "<unmatched>"
+        repeated = queries.repeated(self.repeat_threshold)
+
+        with self._lock:
+            stats = self.endpoints.get(endpoint)
+            if stats is None:
+                stats = self.endpoints[endpoint] = EndpointQueryStats(
+                    endpoint, owning_blueprint()
+                )
+            stats.add(queries, repeated)
+
+        if self.imp.app.debug:
+            milliseconds = queries.seconds * 1000
+            response.headers["X-Imp-Query-Count"] = str(queries.count)
+            response.headers["X-Imp-Query-Time"] = f"{milliseconds:.2f}"
+            response.headers.add(
+                "Server-Timing",
+                f'db;dur={milliseconds:.2f};desc="{queries.count} queries"',
+            )
+
+            if repeated:
+                response.headers["X-Imp-N-Plus-One"] = str(len(repeated))
+                for statement, count in repeated.items():
+                    self.imp.app.logger.warning(
+                        f"Possible N+1 query in {endpoint}, run {count} times: {statement}"
+                    )
+
+        return response
+
+    def report(self, group_by: str = "endpoint") -> t.Dict[str, t.Dict[str, t.Any]]:
+        """
+        Returns the stats of each endpoint, or each blueprint, with the most
+        total database time first.
+
+        :param group_by: endpoint or blueprint
+        """
+        if group_by not in ("endpoint", "blueprint"):
+            raise ValueError("group_by must be one of: endpoint, blueprint")
+
+        with self._lock:
+            if group_by == "endpoint":
+                groups = list(self.endpoints.values())
+            else:
+                blueprints: t.Dict[str, EndpointQueryStats] = {}
+                for stats in self.endpoints.values():
+                    name = stats.blueprint or "<app>"
+                    if name not in blueprints:
+                        blueprints[name] = EndpointQueryStats(name, stats.blueprint)
+                    blueprints[name].merge(stats)
+                groups = list(blueprints.values())
+
+            return {
+                stats.name: stats.as_dict()
+                for stats in sorted(groups, key=lambda s: s.seconds, reverse=True)
+            }
+
+    def reset(self) -> None:
+        """
+        Clears the stats of every endpoint.
+        """
+        with self._lock:
+            self.endpoints.clear()
+
+    @staticmethod
+    def _before_execute(
+        conn: t.Any,
+        cursor: t.Any,
+        statement: str,
+        parameters: t.Any,
+        context: t.Any,
+        executemany: bool,
+    ) -> None:
+        if context is not None:
+            context._imp_query_start = perf_counter()
+
+    @staticmethod
+    def _after_execute(
+        conn: t.Any,
+        cursor: t.Any,
+        statement: str,
+        parameters: t.Any,
+        context: t.Any,
+        executemany: bool,
+    ) -> None:
+        if not has_request_context():
+            return
+
+        queries: t.Optional[RequestQueries] = g.get("_imp_queries")
+        start = getattr(context, "_imp_query_start", None)
+        if queries is None or start is None:
+            return
+
+        queries.count += 1
+        queries.seconds += perf_counter() - start
+        queries.statements[fingerprint(statement)] += 1
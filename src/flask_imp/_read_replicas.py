@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import typing as t
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from itertools import cycle
+from threading import Lock
+
+from flask import current_app, g, has_app_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+
+if t.TYPE_CHECKING:
+    from sqlalchemy.engine import Connection
+    from sqlalchemy.orm import ORMExecuteState, SessionTransaction
+
+_primary_depth: ContextVar[int] = ContextVar("imp_primary_depth", default=0)
+
+
+def replica_bind_key(bind_key: t.Optional[str], index: int) -> str:
+    """
+    !! Private function !!
+
+    Returns the key of a replica in SQLALCHEMY_BINDS, the main database
+    has no bind key, so its replicas are named after "__main__".
+    """
+    return f"{bind_key or '__main__'}.replica{index}"
+
+
+class ReplicaSet:
+    """
+    !! Private class !!
+
+    Picks a replica of one bind for each request.
+
+    round-robin cycles through the replicas. least-recently-used picks the
+    replica that has gone the longest without a query routed to it.
+    """
+
+    keys: t.List[str]
+    strategy: str
+
+    def __init__(self, keys: t.List[str], strategy: str) -> None:
+        self.keys = keys
+        self.strategy = strategy
+        self._cycle = cycle(keys)
+        self._last_used: t.OrderedDict[str, None] = OrderedDict.fromkeys(keys)
+        self._lock = Lock()
+
+    def choose(self) -> str:
+        with self._lock:
+            if self.strategy == "least-recently-used":
+                return next(iter(self._last_used))
+            return next(self._cycle)
+
+    def used(self, key: str) -> None:
+        if self.strategy == "least-recently-used":
+            with self._lock:
+                self._last_used.move_to_end(key)
+
+
+class ReadReplicas:
+    """
+    !! Private class !!
+
+    Routes the SELECT statements of Flask-SQLAlchemy sessions to the read
+    replicas of the bind they would run on.
+
+    A request keeps to one replica per bind. Statements go to the primary
+    inside `primary()`, for SELECT ... FOR UPDATE, and for the rest of the
+    request once the session has written to the primary, or is about to
+    autoflush changes to it.
+    """
+
+    replica_sets: t.Dict[t.Optional[str], ReplicaSet]
+
+    def __init__(self) -> None:
+        self.replica_sets = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.replica_sets)
+
+    def add(self, bind_key: t.Optional[str], keys: t.List[str], strategy: str) -> None:
+        self.replica_sets[bind_key] = ReplicaSet(keys, strategy)
+        listen_for_reads()
+
+    @staticmethod
+    @contextmanager
+    def primary() -> t.Iterator[None]:
+        token = _primary_depth.set(_primary_depth.get() + 1)
+        try:
+            yield
+        finally:
+            _primary_depth.reset(token)
+
+    @staticmethod
+    def in_primary(bind_key: t.Optional[str]) -> bool:
+        return _primary_depth.get() > 0 or bind_key in g.get("_imp_written", ())
+
+    def mark_write(self, engine: t.Any) -> None:
+        has_replicas, bind_key = self.primary_bind_key(engine)
+        if has_replicas:
+            g.setdefault("_imp_written", set()).add(bind_key)
+
+    def primary_bind_key(self, engine: t.Any) -> t.Tuple[bool, t.Optional[str]]:
+        """
+        Returns whether the engine is a primary with replicas, and its bind key.
+        """
+        db = current_app.extensions["sqlalchemy"]
+        for bind_key, bind_engine in db.engines.items():
+            if bind_engine is engine:
+                return bind_key in self.replica_sets, bind_key
+        return False, None
+
+    def route(self, state: ORMExecuteState) -> None:
+        if not state.is_select:
+            if state.is_insert or state.is_update or state.is_delete:
+                self.mark_write(state.session.get_bind(**state.bind_arguments))
+            return
+
+        if (
+            "bind" in state.bind_arguments
+            or getattr(state.statement, "_for_update_arg", None) is not None
+        ):
+            return
+
+        has_replicas, bind_key = self.primary_bind_key(
+            state.session.get_bind(**state.bind_arguments)
+        )
+        if not has_replicas or self.in_primary(bind_key):
+            return
+
+        # do_orm_execute runs before autoflush, changes that are about to be
+        # flushed to the primary must be read back from it.
+        if self.autoflushes(state, bind_key):
+            g.setdefault("_imp_written", set()).add(bind_key)
+            return
+
+        replica_set = self.replica_sets[bind_key]
+        chosen: t.Dict[t.Optional[str], str] = g.setdefault("_imp_replicas", {})
+        if bind_key not in chosen:
+            chosen[bind_key] = replica_set.choose()
+
+        replica_set.used(chosen[bind_key])
+        state.bind_arguments["bind"] = current_app.extensions["sqlalchemy"].engines[
+            chosen[bind_key]
+        ]
+
+    def autoflushes(self, state: ORMExecuteState, bind_key: t.Optional[str]) -> bool:
+        """
+        Returns whether the statement will autoflush changes to the bind.
+        """
+        session = state.session
+        if not session.autoflush or not state.execution_options.get("autoflush", True):
+            return False
+
+        return any(
+            self.primary_bind_key(session.get_bind(mapper=type(instance)))
+            == (True, bind_key)
+            for instance in (*session.new, *session.dirty, *session.deleted)
+        )
+
+    def began(self, connection: Connection) -> None:
+        if _primary_depth.get() == 0:
+            self.mark_write(connection.engine)
+
+    def flushed(self, session: Session) -> None:
+        for instance in (*session.new, *session.dirty, *session.deleted):
+            self.mark_write(session.get_bind(mapper=type(instance)))
+
+
+def app_read_replicas() -> t.Optional[ReadReplicas]:
+    """
+    !! Private function !!
+
+    Returns the read replicas of the current app, if it has any.
+    """
+    if not has_app_context():
+        return None
+
+    imp = current_app.extensions.get("imp")
+    read_replicas = getattr(imp, "read_replicas", None)
+    return read_replicas or None
+
+
+def route_reads(state: ORMExecuteState) -> None:
+    """
+    !! Private function !!
+    """
+    read_replicas = app_read_replicas()
+    if read_replicas is not None:
+        read_replicas.route(state)
+
+
+def stick_to_primary(
+    session: Session, transaction: SessionTransaction, connection: Connection
+) -> None:
+    """
+    !! Private function !!
+
+    Reads are routed to the replicas, so a transaction that begins on a primary
+    outside of `primary()` is for a write, and the rest of the request reads
+    from the primary.
+    """
+    read_replicas = app_read_replicas()
+    if read_replicas is not None:
+        read_replicas.began(connection)
+
+
+def stick_after_flush(session: Session, flush_context: t.Any) -> None:
+    """
+    !! Private function !!
+    """
+    read_replicas = app_read_replicas()
+    if read_replicas is not None:
+        read_replicas.flushed(session)
+
+
+def listen_for_reads() -> None:
+    """
+    !! Private function !!
+
+    Listens to every Flask-SQLAlchemy session, once per process.
+    """
+    if not event.contains(Session, "do_orm_execute", route_reads):
+        event.listen(Session, "do_orm_execute", route_reads)
+        event.listen(Session, "after_begin", stick_to_primary)
+        event.listen(Session, "after_flush", stick_after_flush)
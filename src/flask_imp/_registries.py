@@ -1,22 +1,60 @@
 from __future__ import annotations
 
+import ast
 import typing as t
+from importlib import import_module
+from inspect import getmembers, isclass
+from pathlib import Path
+from threading import RLock
+from types import ModuleType
+
+from sqlalchemy import inspect
+
+from ._identity_cache import identity_cache_options, listen_for_gets
+from ._utilities import profile
 
 if t.TYPE_CHECKING:
     from flask_sqlalchemy.model import DefaultMeta
 
+MODEL_BASE_NAMES = {"Model", "Base"}
+DECLARATIVE_BASE_NAMES = {
+    "DeclarativeBase",
+    "DeclarativeBaseNoMeta",
+    "declarative_base",
+}
+
 
 class ModelRegistry:
     """
     A registry for SQLAlchemy models.
     This is used to store all imported SQLAlchemy models in a central location.
     Accessible via Imp.__model_registry__
+
+    Models are also indexed by table name, bind key and module as they are added.
+    The metadata of each model is worked out on first use, and cleared when the
+    registry changes.
+
+    Models can also be added lazily, by the name of the module that defines them,
+    the module is imported the first time one of its models is looked up.
+
+    Models that set `__imp_identity_cache__` are recorded in `identity_cached`,
+    with the options of their identity cache.
     """
 
     registry: t.Dict[str, t.Any]
+    lazy: t.Dict[str, str]
+    identity_cached: t.Dict[str, t.Dict[str, t.Any]]
+    module_loaded: t.Optional[t.Callable[[ModuleType], None]] = None
 
     def __init__(self) -> None:
         self.registry = {}
+        self.lazy = {}
+        self.identity_cached = {}
+        self._lock = RLock()
+        self._by_table: t.Dict[str, str] = {}
+        self._by_bind: t.Dict[t.Optional[str], t.List[str]] = {}
+        self._by_module: t.Dict[str, t.List[str]] = {}
+        self._meta: t.Dict[str, t.Dict[str, t.Any]] = {}
 
     def assert_exists(self, class_name: str) -> None:
         """
@@ -27,7 +65,7 @@ class ModelRegistry:
         if class_name not in self.registry:
             raise KeyError(
                 f"Model {class_name} not found in model registry \n"
-                f"Available models: {', '.join(self.registry.keys())}"
+                f"Available models: {', '.join([*self.registry, *self.lazy])}"
             )
 
     def add(self, ref: str, model: t.Any) -> None:
@@ -37,7 +75,69 @@ class ModelRegistry:
         :param ref: the name of the model
         :param model: the model to add
         """
+        if self.registry.get(ref) is model:
+            return
+
+        if ref in self.registry:
+            self._unindex(ref)
+
         self.registry[ref] = model
+        self._index(ref, model)
+        self._meta.clear()
+
+    def add_lazy(self, ref: str, import_string: str) -> None:
+        """
+        Add a model to the registry by the module that defines it, without
+        importing the module.
+
+        :param ref: the name of the model
+        :param import_string: the import name of the module
+        """
+        if ref not in self.registry:
+            self.lazy[ref] = import_string
+
+    def load(self, import_string: str) -> None:
+        """
+        Import the module, and add the models it defines to the registry.
+
+        :param import_string: the import name of the module
+        """
+        with self._lock:
+            refs = [ref for ref, module in self.lazy.items() if module == import_string]
+            if not refs:
+                return
+
+            with profile("import", import_string):
+                model_module = import_module(import_string)
+
+            for ref in refs:
+                del self.lazy[ref]
+
+            for name, value in getmembers(model_module, isclass):
+                if hasattr(value, "__tablename__"):
+                    self.add(name, value)
+
+            if self.module_loaded is not None:
+                self.module_loaded(model_module)
+
+    def load_all(self) -> None:
+        """
+        Import every module of the models that were added lazily.
+        """
+        with self._lock:
+            for import_string in set(self.lazy.values()):
+                self.load(import_string)
+
+    def remove(self, ref: str) -> None:
+        """
+        Remove a model from the registry.
+
+        :param ref: the name of the model to remove
+        """
+        self.assert_exists(ref)
+        self._unindex(ref)
+        del self.registry[ref]
+        self._meta.clear()
 
     def class_(self, class_name: str) -> t.Union[DefaultMeta, t.Any]:
         """
@@ -46,9 +146,83 @@ class ModelRegistry:
         :param class_name: the name of the model to get
         :return: the model
         """
+        if class_name not in self.registry and class_name in self.lazy:
+            self.load(self.lazy[class_name])
+
         self.assert_exists(class_name)
         return self.registry[class_name]
 
+    def by_table(self, table_name: str) -> t.Union[DefaultMeta, t.Any]:
+        """
+        Get a model from the registry by its table name.
+
+        The table name of a lazy model is only known once its module is
+        imported, so every lazy model is loaded if the table is not found.
+
+        :param table_name: the __tablename__ of the model to get
+        :return: the model
+        """
+        if table_name not in self._by_table and self.lazy:
+            self.load_all()
+
+        if table_name not in self._by_table:
+            raise KeyError(
+                f"Table {table_name} not found in model registry \n"
+                f"Available tables: {', '.join(self._by_table.keys())}"
+            )
+        return self.registry[self._by_table[table_name]]
+
+    def by_bind(self, bind_key: t.Optional[str] = None) -> t.List[t.Any]:
+        """
+        Get the models that use the given bind key, None for the main database.
+
+        Every lazy model is loaded first, as its bind key is only known once its
+        module is imported.
+
+        :param bind_key: the bind key of the models to get
+        :return: list of models
+        """
+        if self.lazy:
+            self.load_all()
+
+        return [self.registry[ref] for ref in self._by_bind.get(bind_key, [])]
+
+    def by_module(self, module: str) -> t.List[t.Any]:
+        """
+        Get the models defined in the given module, or in any module of the
+        given package, for example a blueprint's package.
+
+        Lazy models defined in those modules are loaded first.
+
+        :param module: the import name of the module or package
+        :return: list of models
+        """
+        with self._lock:
+            for import_string in set(self.lazy.values()):
+                if import_string == module or import_string.startswith(f"{module}."):
+                    self.load(import_string)
+
+        return [
+            self.registry[ref]
+            for module_name, refs in self._by_module.items()
+            if module_name == module or module_name.startswith(f"{module}.")
+            for ref in refs
+        ]
+
+    def meta(self, class_name: str) -> t.Dict[str, t.Any]:
+        """
+        Get the metadata of a model: its location, table name, bind key,
+        primary keys, columns and relationships.
+
+        :param class_name: the name of the model
+        :return: dict of metadata
+        """
+        meta = self._meta.get(class_name)
+        if meta is None:
+            meta = model_meta(self.class_(class_name))
+            self._meta[class_name] = meta
+        return meta
+
     @property
     def instance(self) -> "ModelRegistry":
         """
@@ -58,5 +232,144 @@ class ModelRegistry:
         """
         return self
 
+    def _index(self, ref: str, model: t.Any) -> None:
+        table_name = getattr(model, "__tablename__", None)
+        if isinstance(table_name, str):
+            self._by_table[table_name] = ref
+
+        self._by_bind.setdefault(model_bind_key(model), []).append(ref)
+        self._by_module.setdefault(model.__module__, []).append(ref)
+
+        options = identity_cache_options(model)
+        if options is not None:
+            self.identity_cached[ref] = options
+            listen_for_gets()
+
+    def _unindex(self, ref: str) -> None:
+        self.identity_cached.pop(ref, None)
+
+        self._by_table = {
+            table_name: ref_
+            for table_name, ref_ in self._by_table.items()
+            if ref_ != ref
+        }
+
+        for bind_key, refs in list(self._by_bind.items()):
+            if ref in refs:
+                refs.remove(ref)
+            if not refs:
+                del self._by_bind[bind_key]
+
+        for module, refs in list(self._by_module.items()):
+            if ref in refs:
+                refs.remove(ref)
+            if not refs:
+                del self._by_module[module]
+
     def __repr__(self) -> str:
         return f"ModelRegistry({self.registry})"
+
+
+def model_bind_key(model: t.Any) -> t.Optional[str]:
+    """
+    !! Private function !!
+
+    Returns the bind key of the model, None for the main database.
+    """
+    table = getattr(model, "__table__", None)
+    if table is not None and "bind_key" in table.metadata.info:
+        return t.cast(t.Optional[str], table.metadata.info["bind_key"])
+
+    return getattr(model, "__bind_key__", None)
+
+
+def model_meta(model: t.Any) -> t.Dict[str, t.Any]:
+    """
+    !! Private function !!
+
+    Works out the metadata of the model from its mapper. A class that is not
+    mapped only has its location and table name.
+    """
+    mapper = inspect(model, raiseerr=False)
+    if mapper is None:
+        return {"location": model.__module__, "table_name": model.__tablename__}
+
+    return {
+        "location": model.__module__,
+        "table_name": model.__tablename__,
+        "bind_key": model_bind_key(model),
+        "primary_keys": [
+            mapper.get_property_by_column(column).key for column in mapper.primary_key
+        ],
+        "columns": [attr.key for attr in mapper.column_attrs],
+        "relationships": {
+            rel.key: rel.mapper.class_.__name__ for rel in mapper.relationships
+        },
+    }
+
+
+def scan_model_classes(path: Path) -> t.List[str]:
+    """
+    !! Private function !!
+
+    Returns the names of the classes in the model file that look like models,
+    without importing it.
+
+    A class looks like a model if it sets `__tablename__` or `__table__`, or one
+    of its bases is named "Model" or "Base" (`db.Model`), or is a model or a
+    declarative base found earlier in the file. Classes that set `__abstract__`
+    are skipped, but their subclasses are models.
+    """
+    tree = ast.parse(path.read_bytes(), str(path))
+    names: t.List[str] = []
+    model_bases = set(MODEL_BASE_NAMES)
+
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and isinstance(node.value, ast.Call):
+            # Base = declarative_base()
+            if base_name(node.value.func) in DECLARATIVE_BASE_NAMES:
+                model_bases.update(
+                    target.id for target in node.targets if isinstance(target, ast.Name)
+                )
+            continue
+
+        if not isinstance(node, ast.ClassDef):
+            continue
+
+        assigned: t.Set[str] = set()
+        for statement in node.body:
+            targets: t.List[ast.expr] = []
+            if isinstance(statement, ast.Assign):
+                targets = statement.targets
+            elif isinstance(statement, ast.AnnAssign):
+                targets = [statement.target]
+            assigned.update(
+                target.id for target in targets if isinstance(target, ast.Name)
+            )
+
+        bases = {base_name(base) for base in node.bases}
+        is_model = bool(assigned & {"__tablename__", "__table__"}) or bool(
+            bases & model_bases
+        )
+
+        if "__abstract__" in assigned or bases & DECLARATIVE_BASE_NAMES:
+            if is_model or bases & DECLARATIVE_BASE_NAMES:
+                model_bases.add(node.name)
+            continue
+
+        if is_model:
+            names.append(node.name)
+            model_bases.add(node.name)
+
+    return names
+
+
+def base_name(node: ast.expr) -> str:
+    """
+    !! Private function !!
+    """
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return ""
@@ -0,0 +1,514 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import shutil
+import stat
+import typing as t
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from threading import Lock
+from urllib.parse import quote
+
+from flask import Response, current_app, request, send_from_directory
+from werkzeug.security import safe_join
+
+from ._utilities import write_text_atomic
+
+if t.TYPE_CHECKING:
+    from flask import Flask
+
+    from ._imp import Imp
+
+FINGERPRINT = re.compile(r"\.[0-9a-f]{12}(\.[^.]+)?$")
+
+COMPRESSIBLE_SUFFIXES = {
+    ".css",
+    ".csv",
+    ".html",
+    ".ico",
+    ".js",
+    ".json",
+    ".map",
+    ".mjs",
+    ".svg",
+    ".txt",
+    ".wasm",
+    ".xml",
+}
+
+ONE_YEAR = 60 * 60 * 24 * 365
+
+OFFLOAD_HEADERS = {
+    "x-sendfile": "X-Sendfile",
+    "x-accel-redirect": "X-Accel-Redirect",
+}
+
+
+def static_folders(app: Flask) -> t.Dict[str, Path]:
+    """
+    !! Private function !!
+
+    Returns the static folder of the app and of each registered blueprint,
+    by the endpoint that serves it.
+    """
+    folders: t.Dict[str, Path] = {}
+
+    if app.has_static_folder and app.static_folder:
+        folders["static"] = Path(app.static_folder)
+
+    for name, blueprint in app.blueprints.items():
+        if blueprint.has_static_folder and blueprint.static_folder:
+            folders[f"{name}.static"] = Path(blueprint.static_folder)
+
+    return folders
+
+
+def fingerprint_file(path: Path, compress: bool) -> t.Tuple[Path, bool]:
+    """
+    !! Private function !!
+
+    Writes a copy of the file with the hash of its content in the name, and
+    a gzip compressed copy of that if it's a compressible type and is smaller.
+
+    Returns the path of the copy, and if a gzip copy exists.
+    """
+    content = path.read_bytes()
+    digest = hashlib.sha256(content).hexdigest()[:12]
+    fingerprinted = path.with_name(f"{path.stem}.{digest}{path.suffix}")
+
+    if not fingerprinted.exists():
+        shutil.copy2(path, fingerprinted)
+
+    gzipped = fingerprinted.with_name(f"{fingerprinted.name}.gz")
+
+    if compress and path.suffix.lower() in COMPRESSIBLE_SUFFIXES:
+        if not gzipped.exists():
+            compressed = gzip.compress(content, compresslevel=9, mtime=0)
+            if len(compressed) < len(content):
+                gzipped.write_bytes(compressed)
+
+    return fingerprinted, gzipped.exists()
+
+
+def fingerprint_source(path: Path) -> t.Optional[Path]:
+    """
+    !! Private function !!
+
+    Returns the path of the file a fingerprinted or gzip copy was made from,
+    or None if the file is not a fingerprinted copy.
+    """
+    name = path.name[:-3] if path.name.endswith(".gz") else path.name
+    match = FINGERPRINT.search(name)
+    if match is None:
+        return None
+
+    return path.with_name(f"{name[: match.start()]}{match.group(1) or ''}")
+
+
+@dataclass
+class CachedFile:
+    """
+    !! Private class !!
+
+    A static file held in memory, with its precomputed validators.
+    """
+
+    path: str
+    data: bytes
+    mtime: int
+    etag: str
+    last_modified: datetime
+
+
+class StaticCache:
+    """
+    !! Private class !!
+
+    A bounded LRU cache of small static files. Cached files are served without
+    touching the disk, unless `check_mtime` returns True (debug mode), then the
+    file is stat'ed and the entry is replaced if the file has changed.
+    """
+
+    max_entries: int
+    max_file_size: int
+    hits: int
+    misses: int
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_file_size: int,
+        check_mtime: t.Callable[[], bool],
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_file_size = max_file_size
+        self.check_mtime = check_mtime
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[t.Tuple[str, str], CachedFile] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, folder: Path, filename: str) -> t.Optional[CachedFile]:
+        """
+        Returns the cached file, reading it into the cache if it's a regular file
+        under the size limit. Returns None if the file can't be cached.
+        """
+        key = (str(folder), filename)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if not self.check_mtime() or self._mtime(entry.path) == entry.mtime:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry
+
+                del self._entries[key]
+
+        self.misses += 1
+
+        path = safe_join(str(folder), filename)
+        if path is None:
+            return None
+
+        try:
+            file_stat = os.stat(path)
+            if (
+                not stat.S_ISREG(file_stat.st_mode)
+                or file_stat.st_size > self.max_file_size
+            ):
+                return None
+
+            with open(path, "rb") as file:
+                data = file.read()
+        except OSError:
+            return None
+
+        entry = CachedFile(
+            path=path,
+            data=data,
+            mtime=file_stat.st_mtime_ns,
+            etag=hashlib.sha256(data).hexdigest()[:32],
+            last_modified=datetime.fromtimestamp(
+                int(file_stat.st_mtime), tz=timezone.utc
+            ),
+        )
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _mtime(path: str) -> int:
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return -1
+
+
+def set_max_age(response: Response, max_age: t.Optional[int]) -> None:
+    """
+    !! Private function !!
+
+    Sets the cache control of a static file response, as `send_file` does.
+    """
+    response.cache_control.no_cache = True
+
+    if max_age is not None:
+        if max_age > 0:
+            response.cache_control.no_cache = None
+            response.cache_control.public = True
+        response.cache_control.max_age = max_age
+
+
+class StaticOffload:
+    """
+    !! Private class !!
+
+    Hands the transfer of static files to the proxy in front of the app. The response
+    has no body, only the header that tells the proxy which file to send.
+
+    X-Sendfile is given the absolute path of the file, X-Accel-Redirect is given
+    the file name under the internal location the proxy serves the folder from.
+    """
+
+    header: str
+    location: t.Optional[str]
+    min_size: int
+
+    def __init__(
+        self, header: str, location: t.Optional[str] = None, min_size: int = 0
+    ) -> None:
+        self.header = OFFLOAD_HEADERS[header]
+        self.location = location
+        self.min_size = min_size
+
+    def response(
+        self,
+        folder: Path,
+        filename: str,
+        mimetype: str,
+        max_age: t.Optional[int],
+    ) -> t.Optional[Response]:
+        """
+        Returns the offload response for the file, or None if the file does not
+        exist or is smaller than the minimum size.
+        """
+        path = safe_join(str(folder), filename)
+        if path is None:
+            return None
+
+        try:
+            file_stat = os.stat(path)
+        except OSError:
+            return None
+
+        if not stat.S_ISREG(file_stat.st_mode) or file_stat.st_size < self.min_size:
+            return None
+
+        if self.location is None:
+            target = os.path.abspath(path)
+        else:
+            target = f"{self.location.rstrip('/')}/{quote(filename)}"
+
+        response: Response = current_app.response_class(mimetype=mimetype)
+        response.headers[self.header] = target
+        response.content_length = file_stat.st_size
+        response.last_modified = datetime.fromtimestamp(
+            int(file_stat.st_mtime), tz=timezone.utc
+        )
+        set_max_age(response, max_age)
+        return response
+
+    def __repr__(self) -> str:
+        return f"StaticOffload({self.header}, min_size={self.min_size})"
+
+
+class StaticFiles:
+    """
+    !! Private class !!
+
+    Serves the static files of the app and its blueprints in place of the Flask
+    static view, after the before request handlers have run.
+
+    Files listed in the static manifest are served with far-future cache headers,
+    and from their gzip compressed copy when the client accepts it.
+
+    If the static cache is enabled, small files are served from memory.
+    """
+
+    imp: Imp
+    manifest_path: Path
+    files: t.Dict[str, t.Dict[str, str]]
+    gzipped: t.Dict[str, t.Set[str]]
+    cache: t.Optional[StaticCache] = None
+
+    def __init__(self, imp: Imp) -> None:
+        self.imp = imp
+        self.manifest_path = imp.app_instance_path / "imp_static_manifest.json"
+        self.files = {}
+        self.gzipped = {}
+
+        if imp.config.IMP_STATIC_CACHE:
+            self.cache = StaticCache(
+                imp.config.IMP_STATIC_CACHE_MAX_ENTRIES,
+                imp.config.IMP_STATIC_CACHE_MAX_FILE_SIZE,
+                lambda: imp.app.debug,
+            )
+        self._fingerprinted: t.Dict[str, t.Set[str]] = {}
+        self._folders: t.Dict[str, Path] = {}
+        self._indexed_blueprints = -1
+
+    def build(self, compress: bool = True) -> t.Dict[str, t.Dict[str, str]]:
+        """
+        Fingerprints the files in every static folder, and writes the manifest.
+
+        Copies made by builds before the previous one are removed, the copies of
+        the previous build are kept for clients that have an older page.
+        """
+        self.load()
+        previous = self._fingerprinted
+        files: t.Dict[str, t.Dict[str, str]] = {}
+        gzipped: t.Dict[str, t.List[str]] = {}
+
+        for endpoint, folder in static_folders(self.imp.app).items():
+            files[endpoint] = {}
+            gzipped[endpoint] = []
+            keep = {folder / name for name in previous.get(endpoint, ())}
+            sources: t.Set[Path] = set()
+            copies: t.List[Path] = []
+
+            for path in sorted(folder.rglob("*")):
+                if not path.is_file():
+                    continue
+
+                if path.suffix == ".gz" or FINGERPRINT.search(path.name):
+                    copies.append(path)
+                    continue
+
+                sources.add(path)
+                fingerprinted, has_gzip = fingerprint_file(path, compress)
+                keep.add(fingerprinted)
+                name = fingerprinted.relative_to(folder).as_posix()
+                files[endpoint][path.relative_to(folder).as_posix()] = name
+
+                if has_gzip:
+                    gzipped[endpoint].append(name)
+
+            for path in copies:
+                kept = path.with_name(path.name[:-3]) if path.suffix == ".gz" else path
+                if kept not in keep and fingerprint_source(path) in sources:
+                    path.unlink(missing_ok=True)
+
+        write_text_atomic(
+            self.manifest_path,
+            json.dumps({"files": files, "gzip": gzipped}, indent=2),
+        )
+
+        self.load()
+        return files
+
+    def load(self) -> None:
+        """
+        Loads the manifest, if it exists.
+        """
+        try:
+            data = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+
+        self.files = data.get("files", {})
+        self.gzipped = {
+            endpoint: set(names) for endpoint, names in data.get("gzip", {}).items()
+        }
+        self._fingerprinted = {
+            endpoint: set(names.values()) for endpoint, names in self.files.items()
+        }
+
+    def resolve(self, endpoint: str, filename: str) -> str:
+        """
+        Returns the fingerprinted name of the file, or the name given if the
+        file is not in the manifest.
+        """
+        return self.files.get(endpoint, {}).get(filename, filename)
+
+    def folder(self, endpoint: t.Optional[str]) -> t.Optional[Path]:
+        """
+        Returns the static folder served by the endpoint, or None if the endpoint
+        is not a static endpoint.
+        """
+        if endpoint is None or not (
+            endpoint == "static" or endpoint.endswith(".static")
+        ):
+            return None
+
+        if self._indexed_blueprints != len(self.imp.app.blueprints):
+            self._folders = static_folders(self.imp.app)
+            self._indexed_blueprints = len(self.imp.app.blueprints)
+
+        return self._folders.get(endpoint)
+
+    def serve(self) -> t.Optional[Response]:
+        """
+        Serves static files that are in the manifest, or in the static cache,
+        returns None for any other request, so it is handled as normal.
+        """
+        folder = self.folder(request.endpoint)
+        if folder is None or request.endpoint is None:
+            return None
+
+        filename = (request.view_args or {}).get("filename", "")
+        fingerprinted = filename in self._fingerprinted.get(request.endpoint, ())
+
+        if not fingerprinted and self.cache is None:
+            return None
+
+        mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        has_gzip = filename in self.gzipped.get(request.endpoint, ())
+        use_gzip = has_gzip and bool(request.accept_encodings.quality("gzip"))
+
+        response = self._send(
+            folder,
+            f"{filename}.gz" if use_gzip else filename,
+            mimetype,
+            ONE_YEAR if fingerprinted else self.imp.app.get_send_file_max_age(filename),
+            fallback=fingerprinted,
+            offload=getattr(
+                self.imp.app.blueprints.get(request.blueprint or ""),
+                "static_offload",
+                None,
+            ),
+        )
+        if response is None:
+            return None
+
+        if use_gzip:
+            response.headers["Content-Encoding"] = "gzip"
+
+        if has_gzip:
+            response.vary.add("Accept-Encoding")
+
+        if fingerprinted:
+            response.cache_control.public = True
+            response.cache_control.immutable = True
+
+        return response
+
+    def _send(
+        self,
+        folder: Path,
+        filename: str,
+        mimetype: str,
+        max_age: t.Optional[int],
+        fallback: bool,
+        offload: t.Optional[StaticOffload] = None,
+    ) -> t.Optional[Response]:
+        """
+        Hands the file to the proxy if the blueprint offloads it, otherwise sends
+        the file from the static cache, or from disk if `fallback` is set.
+        Returns None if the file can't be sent from the cache and `fallback` is not set.
+        """
+        if offload is not None:
+            offloaded = offload.response(folder, filename, mimetype, max_age)
+            if offloaded is not None:
+                return offloaded
+
+        entry = self.cache.get(folder, filename) if self.cache is not None else None
+
+        if entry is None:
+            if not fallback:
+                return None
+            return send_from_directory(
+                folder, filename, mimetype=mimetype, max_age=max_age
+            )
+
+        response: Response = current_app.response_class(entry.data, mimetype=mimetype)
+        response.last_modified = entry.last_modified
+        response.set_etag(entry.etag)
+        set_max_age(response, max_age)
+
+        response.make_conditional(
+            request.environ, accept_ranges=True, complete_length=len(entry.data)
+        )
+        return response
+
+    def __repr__(self) -> str:
+        return f"StaticFiles({self.manifest_path})"
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import os
+import typing as t
+from threading import Lock
+
+from flask.templating import DispatchingJinjaLoader
+from jinja2 import BaseLoader, FileSystemLoader, TemplateNotFound
+from jinja2 import Environment as BaseEnvironment
+
+if t.TYPE_CHECKING:
+    from flask import Flask
+
+TemplateSource = t.Tuple[str, t.Optional[str], t.Optional[t.Callable[[], bool]]]
+
+
+class IndexedJinjaLoader(DispatchingJinjaLoader):
+    """
+    !! Private class !!
+
+    A Flask dispatching loader that looks up templates named "<prefix>/..." in the
+    loaders of the blueprints that own the prefix, instead of trying every
+    blueprint loader in turn.
+
+    A blueprint owns its name (the prefix used by `ImpBlueprint.tmpl()`), and
+    the names of the folders at the root of its template folder.
+
+    The app loader is still tried first, and templates that are not found in
+    the indexed loaders fall back to trying every blueprint loader. The loader
+    and source of each template found are cached until the source is out of date.
+    """
+
+    app: Flask
+
+    def __init__(self, app: Flask) -> None:
+        super().__init__(app)
+        self._index: t.Dict[str, t.List[BaseLoader]] = {}
+        self._indexed_blueprints = -1
+        self._sources: t.Dict[str, t.Tuple[BaseLoader, TemplateSource]] = {}
+        self._lock = Lock()
+
+    def get_source(self, environment: BaseEnvironment, template: str) -> TemplateSource:
+        if self.app.config["EXPLAIN_TEMPLATE_LOADING"]:
+            return self._get_source_explained(environment, template)
+
+        cached = self._sources.get(template)
+        if cached is not None:
+            loader, rv = cached
+            uptodate = rv[2]
+            if uptodate is None or uptodate():
+                return rv
+
+            try:
+                rv = loader.get_source(environment, template)
+                self._sources[template] = (loader, rv)
+                return rv
+            except TemplateNotFound:
+                del self._sources[template]
+
+        for loader in self._iter_indexed_loaders(template):
+            try:
+                rv = loader.get_source(environment, template)
+            except TemplateNotFound:
+                continue
+
+            self._sources[template] = (loader, rv)
+            return rv
+
+        raise TemplateNotFound(template)
+
+    def _iter_indexed_loaders(self, template: str) -> t.Iterator[BaseLoader]:
+        """
+        Yields the app loader, the loaders of the blueprints that own the
+        prefix of the template, then every other blueprint loader.
+        """
+        app_loader = self.app.jinja_loader
+        if app_loader is not None:
+            yield app_loader
+
+        indexed = self._prefix_index().get(template.split("/", 1)[0], [])
+        yield from indexed
+
+        for _, loader in self._iter_loaders(template):
+            if loader is not app_loader and loader not in indexed:
+                yield loader
+
+    def _prefix_index(self) -> t.Dict[str, t.List[BaseLoader]]:
+        """
+        Returns the blueprint loaders by prefix, the index is built again
+        when a blueprint is registered.
+        """
+        if self._indexed_blueprints == len(self.app.blueprints):
+            return self._index
+
+        with self._lock:
+            index: t.Dict[str, t.List[BaseLoader]] = {}
+
+            for blueprint in self.app.iter_blueprints():
+                loader = blueprint.jinja_loader
+                if loader is None:
+                    continue
+
+                prefixes = {blueprint.name}
+                if isinstance(loader, FileSystemLoader):
+                    for search_path in loader.searchpath:
+                        if os.path.isdir(search_path):
+                            with os.scandir(search_path) as entries:
+                                prefixes.update(
+                                    entry.name for entry in entries if entry.is_dir()
+                                )
+
+                for prefix in prefixes:
+                    index.setdefault(prefix, []).append(loader)
+
+            self._index = index
+            self._sources.clear()
+            self._indexed_blueprints = len(self.app.blueprints)
+
+        return self._index
@@ -1,18 +1,43 @@
 from __future__ import annotations
 
+import json
+import os
 import re
 import sys
+import tempfile
 import typing as t
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from contextvars import ContextVar, copy_context
 from dataclasses import dataclass
 from functools import partial
+from importlib import import_module
+from importlib.util import find_spec
 from pathlib import Path
+from types import ModuleType
 
 from flask import Flask, flash
+from sqlalchemy import event
+from sqlalchemy.orm import Mapper
 
 from flask_imp.config import DatabaseConfig, SQLDatabaseConfig, SQLiteDatabaseConfig
 
+from ._bind_policies import BindPolicies
+from ._read_replicas import ReadReplicas, replica_bind_key
+
 if t.TYPE_CHECKING:
+    from werkzeug.routing import Rule
+
     from ._imp import Imp
+    from ._manifest import ImportManifest
+
+current_imp: ContextVar[t.Optional[Imp]] = ContextVar("current_imp", default=None)
+
+# Calls that import resources, blueprints or models of an Imp or ImpBlueprint.
+IMP_IMPORT_CALL = re.compile(
+    r"\.(?:lazy_)?import_(?:app_resources|resources|blueprints?|nested_blueprints?|models)\s*\("
+)
 
 
 class Sprinkles:
@@ -97,6 +122,21 @@ def database_instance_uri(
     )
 
 
+def bind_config(
+    uri: str,
+    database: t.Union[DatabaseConfig, SQLDatabaseConfig, SQLiteDatabaseConfig],
+) -> t.Union[str, t.Dict[str, t.Any]]:
+    """
+    !! Private function !!
+
+    Returns the value of the bind in SQLALCHEMY_BINDS, the URI on its own,
+    or a dict of the URI and the engine options of the database.
+    """
+    if not database.engine_options:
+        return uri
+    return {"url": uri, **database.engine_options}
+
+
 def partial_models_import(
     location: Path,
     file_or_folder: str,
@@ -122,10 +162,76 @@ def partial_database_binds(
     enabled, uri, bind_key = database_instance_uri(imp_instance.app_path, database_bind)
 
     if enabled:
-        if "SQLALCHEMY_BINDS" in imp_instance.app.config:
-            imp_instance.app.config["SQLALCHEMY_BINDS"][bind_key] = uri
-        else:
-            imp_instance.app.config["SQLALCHEMY_BINDS"] = {bind_key: uri}
+        register_bind(
+            imp_instance.app, bind_key, uri, database_bind, imp_instance.bind_policies
+        )
+        build_database_replicas(
+            imp_instance.app,
+            imp_instance.app_path,
+            database_bind,
+            bind_key,
+            imp_instance.read_replicas,
+            imp_instance.bind_policies,
+        )
+
+
+def register_bind(
+    flask_app: Flask,
+    bind_key: t.Optional[str],
+    uri: str,
+    database: t.Union[DatabaseConfig, SQLDatabaseConfig, SQLiteDatabaseConfig],
+    bind_policies: t.Optional[BindPolicies],
+) -> None:
+    """
+    !! Private function !!
+
+    Adds the bind to SQLALCHEMY_BINDS, or holds it back to be created on
+    first use if its engine policy is lazy.
+    """
+    if bind_policies is not None and bind_key is not None:
+        if database.engine_policy == "lazy":
+            bind_policies.add_lazy(flask_app, bind_key, bind_config(uri, database))
+            return
+
+        if database.engine_policy == "eager":
+            bind_policies.add_eager(flask_app, bind_key, database.warmup_connections)
+
+    flask_app.config.setdefault("SQLALCHEMY_BINDS", {})[bind_key] = bind_config(
+        uri, database
+    )
+
+
+def build_database_replicas(
+    flask_app: Flask,
+    app_instance_path: Path,
+    database: t.Union[DatabaseConfig, SQLDatabaseConfig, SQLiteDatabaseConfig],
+    bind_key: t.Optional[str],
+    read_replicas: t.Optional[ReadReplicas],
+    bind_policies: t.Optional[BindPolicies] = None,
+) -> None:
+    """
+    !! Private function !!
+
+    Adds a bind for each replica of the database, with the same engine
+    options and policy, and registers them as the replicas of the database's bind.
+    """
+    if read_replicas is None or not database.replicas:
+        return
+
+    if isinstance(database, SQLDatabaseConfig):
+        uris = database.replica_uris()
+    elif isinstance(database, SQLiteDatabaseConfig):
+        uris = database.replica_uris(app_instance_path)
+    else:
+        return
+
+    keys = []
+    for index, uri in enumerate(uris):
+        key = replica_bind_key(bind_key, index)
+        register_bind(flask_app, key, uri, database, bind_policies)
+        keys.append(key)
+
+    read_replicas.add(bind_key, keys, database.replica_strategy)
 
 
 def build_database_main(
@@ -134,6 +240,8 @@ def build_database_main(
     database_main: t.Optional[
         t.Union[DatabaseConfig, SQLDatabaseConfig, SQLiteDatabaseConfig]
     ] = None,
+    read_replicas: t.Optional[ReadReplicas] = None,
+    bind_policies: t.Optional[BindPolicies] = None,
 ) -> None:
     """
     !! Private function !!
@@ -142,8 +250,34 @@ def build_database_main(
         enabled, uri, _ = database_instance_uri(app_instance_path, database_main)
 
         if enabled:
+            if database_main.engine_policy == "lazy":
+                raise ValueError(
+                    "The main database is used by Flask-SQLAlchemy, it can't be lazy"
+                )
+
             flask_app.config["SQLALCHEMY_DATABASE_URI"] = uri
 
+            # Options already in the app config take precedence, as the URI does.
+            if database_main.engine_options:
+                flask_app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+                    **database_main.engine_options,
+                    **flask_app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {}),
+                }
+
+            if bind_policies is not None and database_main.engine_policy == "eager":
+                bind_policies.add_eager(
+                    flask_app, None, database_main.warmup_connections
+                )
+
+            build_database_replicas(
+                flask_app,
+                app_instance_path,
+                database_main,
+                None,
+                read_replicas,
+                bind_policies,
+            )
+
 
 def build_database_binds(
     flask_app: Flask,
@@ -151,6 +285,8 @@ def build_database_binds(
     database_binds: t.Optional[
         t.Iterable[t.Union[DatabaseConfig, SQLDatabaseConfig, SQLiteDatabaseConfig]]
     ] = None,
+    read_replicas: t.Optional[ReadReplicas] = None,
+    bind_policies: t.Optional[BindPolicies] = None,
 ) -> None:
     """
     !! Private function !!
@@ -160,10 +296,141 @@ def build_database_binds(
             enabled, uri, bind_key = database_instance_uri(app_instance_path, database)
 
             if enabled:
-                if "SQLALCHEMY_BINDS" in flask_app.config:
-                    flask_app.config["SQLALCHEMY_BINDS"][bind_key] = uri
-                else:
-                    flask_app.config["SQLALCHEMY_BINDS"] = {bind_key: uri}
+                register_bind(flask_app, bind_key, uri, database, bind_policies)
+                build_database_replicas(
+                    flask_app,
+                    app_instance_path,
+                    database,
+                    bind_key,
+                    read_replicas,
+                    bind_policies,
+                )
+
+
+def remove_url_rules(
+    flask_app: Flask,
+    endpoints: t.Set[str],
+    add_rules: t.Iterable[Rule] = (),
+    remove_views: bool = True,
+) -> None:
+    """
+    !! Private function !!
+
+    Removes the url rules and view functions of the given endpoints from the app,
+    and adds `add_rules`.
+
+    Werkzeug has no way of removing a rule from a map, so the map is rebuilt
+    without them. The new map is complete before it replaces the old one, so
+    requests being matched on other threads see one or the other.
+    """
+    url_map = flask_app.url_map
+    new_url_map = flask_app.url_map_class(
+        default_subdomain=url_map.default_subdomain,
+        strict_slashes=url_map.strict_slashes,
+        merge_slashes=url_map.merge_slashes,
+        redirect_defaults=url_map.redirect_defaults,
+        converters=url_map.converters,
+        sort_parameters=url_map.sort_parameters,
+        sort_key=url_map.sort_key,
+        host_matching=url_map.host_matching,
+    )
+
+    for rule in url_map.iter_rules():
+        if rule.endpoint not in endpoints:
+            new_url_map.add(rule.empty())
+
+    for rule in add_rules:
+        new_url_map.add(rule)
+
+    new_url_map.update()
+    flask_app.url_map = new_url_map
+
+    if remove_views:
+        for endpoint in endpoints:
+            flask_app.view_functions.pop(endpoint, None)
+
+
+def register_fork_hooks(imp_instance: Imp) -> None:
+    """
+    !! Private function !!
+
+    Runs `Imp.preload` before the process forks, and `Imp.post_fork` in the child.
+
+    The hooks can't be removed, so they only hold a weak reference to the Imp
+    instance. Python prints and ignores the errors of fork hooks, they are
+    logged to the app logger instead.
+    """
+    ref = weakref.ref(imp_instance)
+
+    def _run(method_name: str) -> None:
+        imp = ref()
+        if imp is None:
+            return
+
+        try:
+            getattr(imp, method_name)()
+        except Exception:
+            imp.app.logger.exception(f"Imp.{method_name}() failed in a fork hook")
+
+    os.register_at_fork(
+        before=partial(_run, "preload"), after_in_child=partial(_run, "post_fork")
+    )
+
+
+def load_models_on_configure(
+    imp_instance: Imp,
+) -> t.Callable[[], None]:
+    """
+    !! Private function !!
+
+    Loads the lazy models of the Imp instance before the SQLAlchemy mappers
+    are configured, and returns the before_configured listener.
+
+    The mapper events are global, so the listeners only hold a weak reference
+    to the Imp instance. SQLAlchemy can't remove a listener while calling it,
+    so the before_configured listener is removed by an after_configured
+    listener once there are no lazy models left to load.
+    """
+    ref = weakref.ref(imp_instance)
+
+    def _before_configured() -> None:
+        imp = ref()
+        if imp is not None:
+            imp.load_models()
+
+    def _after_configured() -> None:
+        imp = ref()
+        if (imp is None or not imp.model_registry.lazy) and event.contains(
+            Mapper, "before_configured", _before_configured
+        ):
+            event.remove(Mapper, "before_configured", _before_configured)
+
+    event.listen(Mapper, "before_configured", _before_configured)
+    event.listen(Mapper, "after_configured", _after_configured)
+    return _before_configured
+
+
+def write_text_atomic(file_path: Path, text: str) -> None:
+    """
+    !! Private function !!
+
+    Writes the text to a temporary file next to the file, then replaces the
+    file with it. Each call uses its own temporary file, so processes writing
+    the same file at the same time don't remove each other's temporary file.
+    """
+    fd, temp_name = tempfile.mkstemp(
+        dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as temp_file:
+            temp_file.write(text)
+        os.replace(temp_name, file_path)
+    except BaseException:
+        try:
+            os.unlink(temp_name)
+        except OSError:
+            pass
+        raise
 
 
 def cast_to_import_str(app_name: str, folder_path: Path) -> str:
@@ -311,84 +578,356 @@ def cast_to_float(value: t.Union[str, int, float, bool, None]) -> float:
     raise TypeError(f"Cannot cast {value} to float")
 
 
-def process_scope(path: Path, scope: t.Union[t.List[str], str]) -> t.List[Path]:
-    if path.is_dir():
-        if path.name.startswith(
-            "."
-        ):  # if path is dir, don't process if it's a hidden folder
-            return []
+def scan_folder(folder: t.Union[Path, str]) -> t.List[os.DirEntry[str]]:
+    """
+    !! Private function !!
+
+    Returns the entries of the folder sorted by name, skipping hidden and dunder
+    files and folders.
+    """
+    with os.scandir(folder) as entries:
+        return sorted(
+            (entry for entry in entries if not entry.name.startswith((".", "__"))),
+            key=lambda entry: entry.name,
+        )
+
+
+def entry_in_scope(entry: os.DirEntry[str], scope: t.List[str]) -> bool:
+    """
+    !! Private function !!
+
+    Checks if the entry is in scope, folders must be named in the scope,
+    files must end in .py and be named in the scope, or the scope must contain "*".
+    """
+    if entry.is_dir():
+        return entry.name in scope
+
+    return entry.name.endswith(".py") and (entry.name in scope or "*" in scope)
+
 
-    if isinstance(scope, str):
-        if path.is_file():
-            if path.name == scope and path.suffix == ".py" or scope == "*":
-                return [path]
+def discover_resources(
+    resources_fof: Path, scope_import: t.Dict[str, t.Union[t.List[str], str]]
+) -> t.Tuple[t.List[Path], t.List[Path]]:
+    """
+    !! Private function !!
 
-        if path.is_dir():
-            return [
-                resource
-                for resource in path.iterdir()
-                if resource.name == scope
-                or scope == "*"
-                and resource.is_file()
-                and resource.suffix == ".py"
-            ]
+    Finds the files (and packages) in scope for import operations, visiting each
+    folder once.
 
-    result: list[Path] = []
+    "*" : All folders / All Files
+    "." : Root of the Resources Folder
 
-    if path.is_file():
-        if path.name in scope and path.suffix == ".py" or "*" in scope:
-            return [path]
+    Returns the paths found in sorted order, and the folders that were scanned.
+    """
 
-        return []
+    scopes: t.Dict[str, t.List[str]] = {
+        key: [value] if isinstance(value, str) else list(value)
+        for key, value in scope_import.items()
+    }
 
-    if path.is_dir():
-        for resource in path.iterdir():
-            # don't process hidden files
-            if resource.name.startswith("."):
-                continue
+    result: t.Set[str] = set()
+    scanned: t.List[Path] = [resources_fof]
 
-            # don't process dunder files
-            if resource.name.startswith("__"):
-                continue
+    root_entries = scan_folder(resources_fof)
 
-            # only store files that end in .py
-            if (
-                resource.name in scope
-                or "*" in scope
-                and resource.is_file()
-                and resource.suffix == ".py"
-            ):
-                result.append(resource)
+    if "." in scopes:  # root folder
+        result.update(
+            entry.path for entry in root_entries if entry_in_scope(entry, scopes["."])
+        )
 
-    return result
+    for entry in root_entries:
+        if "*" in scopes:  # all folders
+            scope = scopes["*"]
+        elif entry.name in scopes:
+            scope = scopes[entry.name]
+        else:
+            continue
+
+        if not entry.is_dir():
+            if entry_in_scope(entry, scope):
+                result.add(entry.path)
+            continue
+
+        scanned.append(Path(entry.path))
+        result.update(
+            sub_entry.path
+            for sub_entry in scan_folder(entry.path)
+            if entry_in_scope(sub_entry, scope)
+        )
+
+    return [Path(path) for path in sorted(result)], scanned
+
+
+def import_resource_modules(
+    resource_folder: Path,
+    scope_import: t.Dict[str, t.Union[t.List[str], str]],
+    factories: t.List[str],
+    cast_import: t.Callable[[Path], str],
+    manifest: t.Optional[ImportManifest] = None,
+    max_workers: t.Optional[int] = None,
+) -> t.List[t.Tuple[ModuleType, t.List[str]]]:
+    """
+    !! Private function !!
 
+    Imports the modules found in the resources folder, and returns each module
+    along with the factories it contains.
 
-def process_folder_file_scope(
-    resources_fof: Path, scope_import: t.Dict[str, t.Union[t.List[str], str]]
-) -> t.List[Path]:
+    If a manifest is given, the recorded import plan is replayed when the
+    scanned folders and files have not changed.
+
+    If max_workers is given, the modules are imported on a thread pool first.
+    """
+    key = (
+        f"resources:{resource_folder}:"
+        f"{json.dumps(scope_import, sort_keys=True)}:{json.dumps(factories)}"
+    )
+
+    plan: t.Optional[t.List[t.List[t.Any]]] = None
+    if manifest is not None:
+        plan = manifest.plan(key)
+
+    failures: t.Dict[str, Exception] = {}
+
+    if plan is not None:
+        if max_workers:
+            failures = preload_modules(
+                [import_str for import_str, _ in plan], max_workers
+            )
+
+        return [
+            (import_resource_module(import_str, failures), found_factories)
+            for import_str, found_factories in plan
+        ]
+
+    module_paths_to_import, scanned_folders = discover_resources(
+        resource_folder, scope_import
+    )
+
+    import_strs: t.Dict[str, Path] = {
+        cast_import(module_path): module_path
+        for module_path in module_paths_to_import
+        if not module_path.name.startswith(".")
+        and not module_path.name.startswith("__")  # skip hidden files / folders
+    }
+
+    if max_workers:
+        failures = preload_modules(list(import_strs), max_workers)
+
+    imported_modules: t.Dict[str, t.Tuple[ModuleType, t.List[str]]] = {}
+
+    for import_str in import_strs:
+        module = import_resource_module(import_str, failures)
+        imported_modules[import_str] = (
+            module,
+            [factory for factory in factories if hasattr(module, factory)],
+        )
+
+    if manifest is not None:
+        manifest.record(
+            key,
+            [*scanned_folders, *module_paths_to_import],
+            [
+                [import_str, found_factories]
+                for import_str, (_, found_factories) in imported_modules.items()
+            ],
+        )
+
+    return list(imported_modules.values())
+
+
+def can_preload(import_str: str) -> bool:
     """
-    Processes folder and file scope for import operations.
+    !! Private function !!
+
+    Returns whether the module can be imported on a thread pool: it does not
+    call `import_resources`, `import_blueprint` or the like when imported.
+    The source is read, not imported. Its parent packages are imported first,
+    on the calling thread, as the module's own import would do.
     """
+    parent = import_str.rpartition(".")[0]
+    try:
+        if parent:
+            import_module(parent)
+        spec = find_spec(import_str)
+    except Exception:
+        # Raised again when the module is imported on the calling thread.
+        return False
 
-    result: list[Path] = []
+    if spec is None or not spec.has_location or spec.origin is None:
+        return False
 
-    if "." in scope_import.keys():  # root folder
-        if root_folder_scopes := process_scope(resources_fof, scope_import["."]):
-            result.extend(root_folder_scopes)
+    try:
+        source = Path(spec.origin).read_text(encoding="utf-8")
+    except (OSError, ValueError):
+        return False
 
-    if "*" in scope_import.keys():  # all folders
-        for resource in resources_fof.iterdir():
-            if resource in result:
-                continue
+    return IMP_IMPORT_CALL.search(source) is None
 
-            if all_folders_scopes := process_scope(resource, scope_import["*"]):
-                result.extend(all_folders_scopes)
 
-    else:
-        for resource in resources_fof.iterdir():
-            if resource.name in scope_import.keys():
-                if named_scopes := process_scope(resource, scope_import[resource.name]):
-                    result.extend(named_scopes)
+def preload_modules(
+    import_strs: t.List[str], max_workers: int
+) -> t.Dict[str, Exception]:
+    """
+    !! Private function !!
+
+    Imports the given modules on a thread pool, so they are in sys.modules
+    before being imported again, in order, on the calling thread.
+
+    Modules that import resources, blueprints or models when imported are
+    skipped, so factories and registrations only run on the calling thread.
+
+    Returns the errors of the modules that failed to import, to be raised in
+    place of importing them again, see `raise_preload_failure`.
+    """
+
+    def _try_import(import_str: str) -> t.Optional[Exception]:
+        try:
+            import_module(import_str)
+        except Exception as e:
+            return e
+        return None
+
+    import_strs = [import_str for import_str in import_strs if can_preload(import_str)]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(copy_context().run, _try_import, import_str)
+            for import_str in import_strs
+        ]
+
+    return {
+        import_str: error
+        for import_str, future in zip(import_strs, futures)
+        if (error := future.result()) is not None
+    }
 
-    # clear duplicates
-    return list(set(result))
+
+def raise_preload_failure(failures: t.Dict[str, Exception], import_str: str) -> None:
+    """
+    !! Private function !!
+
+    Raises the error of the module if it failed to import on the thread pool.
+    """
+    error = failures.get(import_str)
+    if error is not None:
+        raise error
+
+
+def import_resource_module(
+    import_str: str, failures: t.Optional[t.Dict[str, Exception]] = None
+) -> ModuleType:
+    """
+    !! Private function !!
+
+    Imports a resource module, raising an ImportError that includes the import string.
+    """
+    try:
+        if failures:
+            raise_preload_failure(failures, import_str)
+
+        with profile("import", import_str):
+            return import_module(import_str)
+    except ImportError as e:
+        raise ImportError(f"Error when importing {import_str}: {e}")
+
+
+def run_resource_factories(
+    imported_modules: t.List[t.Tuple[ModuleType, t.List[str]]],
+    factories: t.List[str],
+    instance: t.Any,
+) -> None:
+    """
+    !! Private function !!
+
+    Calls each factory found in the imported modules with the given instance.
+
+    Modules without any factories cannot be reloaded on their own, so the hot
+    reloader watches them for a full restart instead.
+    """
+    for module, found_factories in imported_modules:
+        if not found_factories:
+            watch_for_restart(module)
+
+    for instance_factory in factories:
+        for module, found_factories in imported_modules:
+            if instance_factory in found_factories:
+                with (
+                    profile("factory", f"{module.__name__}.{instance_factory}"),
+                    track_factory(module, instance_factory, instance),
+                ):
+                    getattr(module, instance_factory)(instance)
+
+
+def profile(kind: str, name: str) -> t.ContextManager[t.Any]:
+    """
+    !! Private function !!
+
+    Records the body of the with block in the startup profile of the
+    current Imp instance, if it has one.
+    """
+    imp_instance = current_imp.get()
+    if imp_instance is None or imp_instance.startup_profile is None:
+        return nullcontext()
+    return imp_instance.startup_profile.record(kind, name)
+
+
+def track_factory(
+    module: ModuleType, factory: str, instance: t.Any
+) -> t.ContextManager[t.Any]:
+    """
+    !! Private function !!
+
+    Records the factory call with the hot reloader of the current Imp
+    instance, if it has one.
+    """
+    imp_instance = current_imp.get()
+    if imp_instance is None or imp_instance.hot_reloader is None:
+        return nullcontext()
+    return imp_instance.hot_reloader.track_factory(module, factory, instance)
+
+
+def watch_for_restart(module: ModuleType) -> None:
+    """
+    !! Private function !!
+
+    Watches the module with the hot reloader of the current Imp instance,
+    if it has one, so a change to it requires a full restart.
+    """
+    imp_instance = current_imp.get()
+    if imp_instance is not None and imp_instance.hot_reloader is not None:
+        imp_instance.hot_reloader.watch(module)
+
+
+def memory_usage() -> t.Dict[str, int]:
+    """
+    !! Private function !!
+
+    Returns the resident memory of the current process in bytes, split into
+    shared and private pages, read from /proc/self/smaps_rollup.
+
+    Returns an empty dict if /proc/self/smaps_rollup is not available (non-Linux).
+    """
+    fields = {
+        "Rss": "rss",
+        "Pss": "pss",
+        "Shared_Clean": "shared_clean",
+        "Shared_Dirty": "shared_dirty",
+        "Private_Clean": "private_clean",
+        "Private_Dirty": "private_dirty",
+    }
+
+    try:
+        with open("/proc/self/smaps_rollup", encoding="ascii") as smaps:
+            lines = smaps.readlines()
+    except OSError:
+        return {}
+
+    usage: t.Dict[str, int] = {}
+    for line in lines:
+        name, _, value = line.partition(":")
+        if name in fields:
+            usage[fields[name]] = int(value.split()[0]) * 1024
+
+    usage["shared"] = usage.get("shared_clean", 0) + usage.get("shared_dirty", 0)
+    usage["private"] = usage.get("private_clean", 0) + usage.get("private_dirty", 0)
+    return usage
@@ -17,6 +17,12 @@ class DatabaseConfig:
     password: str
 
     sqlite_db_extension: str
+    engine_options: t.Dict[str, t.Any]
+    pragmas: t.Dict[str, t.Any]
+    replicas: t.List[t.Union[str, t.Dict[str, t.Any]]]
+    replica_strategy: str
+    engine_policy: str
+    warmup_connections: int
 
     allowed_dialects: t.Tuple[str, ...] = (
         "mysql",
@@ -82,6 +88,15 @@ class DatabaseConfig:
 
         self.sqlite_db_extension = sqlite_db_extension
 
+        # The engine options, PRAGMAs, replicas and engine policies are only
+        # available on the classes that replace this one.
+        self.engine_options = {}
+        self.pragmas = {}
+        self.replicas = []
+        self.replica_strategy = "round-robin"
+        self.engine_policy = "default"
+        self.warmup_connections = 1
+
     def as_dict(self) -> t.Dict[str, t.Any]:
         """
         Return the database configuration as a dictionary.
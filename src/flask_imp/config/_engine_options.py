@@ -0,0 +1,63 @@
+import typing as t
+
+
+def build_engine_options(
+    pool_size: t.Optional[int] = None,
+    max_overflow: t.Optional[int] = None,
+    pool_timeout: t.Optional[float] = None,
+    pool_recycle: t.Optional[int] = None,
+    pool_pre_ping: t.Optional[bool] = None,
+    connect_args: t.Optional[t.Dict[str, t.Any]] = None,
+    query_cache_size: t.Optional[int] = None,
+    engine_options: t.Optional[t.Dict[str, t.Any]] = None,
+) -> t.Dict[str, t.Any]:
+    """
+    !! Private function !!
+
+    Returns the `create_engine` keyword arguments that were set, options in
+    `engine_options` are overridden by the named options.
+    """
+    options = dict(engine_options or {})
+
+    named = {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": pool_timeout,
+        "pool_recycle": pool_recycle,
+        "pool_pre_ping": pool_pre_ping,
+        "connect_args": connect_args,
+        "query_cache_size": query_cache_size,
+    }
+    options.update({key: value for key, value in named.items() if value is not None})
+
+    return options
+
+
+ENGINE_POLICIES = ("default", "lazy", "eager")
+
+
+def check_engine_policy(
+    engine_policy: str, warmup_connections: t.Optional[int]
+) -> t.Tuple[str, int]:
+    """
+    !! Private function !!
+
+    Returns the engine policy, and the number of connections to open when
+    the engine is warmed up, 0 unless the policy is eager.
+    """
+    if engine_policy not in ENGINE_POLICIES:
+        raise ValueError(f"Engine policy must be one of: {', '.join(ENGINE_POLICIES)}")
+
+    if warmup_connections is not None and engine_policy != "eager":
+        raise ValueError("warmup_connections can only be set for eager engines")
+
+    if engine_policy != "eager":
+        return engine_policy, 0
+
+    if warmup_connections is None:
+        return engine_policy, 1
+
+    if warmup_connections < 1:
+        raise ValueError("warmup_connections must be at least 1")
+
+    return engine_policy, warmup_connections
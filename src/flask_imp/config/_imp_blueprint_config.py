@@ -31,6 +31,12 @@ class ImpBlueprintConfig:
         t.Iterable[t.Union[DatabaseConfig, SQLDatabaseConfig, SQLiteDatabaseConfig]]
     ] = None
 
+    static_offload: t.Optional[str] = None
+    static_offload_location: t.Optional[str] = None
+    static_offload_min_size: int = 0
+
+    allowed_static_offloads = ("x-sendfile", "x-accel-redirect")
+
     _blueprint_attrs = {
         "url_prefix",
         "subdomain",
@@ -57,6 +63,9 @@ class ImpBlueprintConfig:
         database_binds: t.Optional[
             t.Iterable[t.Union[DatabaseConfig, SQLDatabaseConfig, SQLiteDatabaseConfig]]
         ] = None,
+        static_offload: t.Optional[str] = None,
+        static_offload_location: t.Optional[str] = None,
+        static_offload_min_size: int = 0,
     ):
         """
         Blueprint configuration class used by the ImpBlueprint class.
@@ -75,7 +84,25 @@ class ImpBlueprintConfig:
         :param cli_group: the blueprint CLI group - defaults to None
         :param init_session: the blueprint initial session - defaults to None
         :param database_binds: the blueprint database binds - defaults to None
+        :param static_offload: hand the transfer of static files to the proxy in front of
+                               the app, using the "x-sendfile" or "x-accel-redirect" header - defaults to None
+        :param static_offload_location: the internal location the proxy serves the static folder from,
+                                        required for "x-accel-redirect" - defaults to None
+        :param static_offload_min_size: the size in bytes static files must reach to be offloaded - defaults to 0
         """
+        if static_offload is not None:
+            static_offload = static_offload.lower()
+
+            if static_offload not in self.allowed_static_offloads:
+                raise ValueError(
+                    f"Static offload must be one of: {', '.join(self.allowed_static_offloads)}"
+                )
+
+            if static_offload == "x-accel-redirect" and not static_offload_location:
+                raise ValueError(
+                    "A static offload location is required for x-accel-redirect"
+                )
+
         self.enabled = enabled
         self.url_prefix = url_prefix
         self.subdomain = subdomain
@@ -86,6 +113,9 @@ class ImpBlueprintConfig:
         self.root_path = root_path
         self.cli_group = cli_group
         self.init_session = init_session
+        self.static_offload = static_offload
+        self.static_offload_location = static_offload_location
+        self.static_offload_min_size = static_offload_min_size
 
         if database_binds is None:
             self.database_binds = []
@@ -20,6 +20,24 @@ class ImpConfig:
         t.Iterable[t.Union[DatabaseConfig, SQLiteDatabaseConfig, SQLDatabaseConfig]]
     ]
 
+    IMP_IMPORT_MANIFEST: bool
+    IMP_PROFILE_STARTUP: bool
+    IMP_PRELOAD: bool
+    IMP_HOT_RELOAD: bool
+    IMP_TEMPLATE_BYTECODE_CACHE: bool
+    IMP_INDEXED_TEMPLATE_LOADER: bool
+    IMP_STATIC_FINGERPRINTS: bool
+    IMP_STATIC_CACHE: bool
+    IMP_STATIC_CACHE_MAX_ENTRIES: int
+    IMP_STATIC_CACHE_MAX_FILE_SIZE: int
+    IMP_LAZY_MODELS: bool
+    IMP_LAZY_MODELS_LOAD_ON_CONFIGURE: bool
+    IMP_QUERY_STATS: bool
+    IMP_QUERY_STATS_REPEAT_THRESHOLD: int
+    IMP_QUERY_CACHE: t.Optional[str]
+    IMP_QUERY_CACHE_MAX_ENTRIES: int
+    IMP_QUERY_CACHE_TTL: t.Optional[float]
+
     def __init__(
         self,
         init_session: t.Optional[t.Dict[str, t.Any]] = None,
@@ -29,6 +47,23 @@ class ImpConfig:
         database_binds: t.Optional[
             t.Iterable[t.Union[DatabaseConfig, SQLiteDatabaseConfig, SQLDatabaseConfig]]
         ] = None,
+        import_manifest: bool = False,
+        profile_startup: bool = False,
+        preload: bool = False,
+        hot_reload: bool = False,
+        template_bytecode_cache: bool = False,
+        indexed_template_loader: bool = False,
+        static_fingerprints: bool = False,
+        static_cache: bool = False,
+        static_cache_max_entries: int = 512,
+        static_cache_max_file_size: int = 256 * 1024,
+        lazy_models: bool = False,
+        lazy_models_load_on_configure: bool = False,
+        query_stats: bool = False,
+        query_stats_repeat_threshold: int = 5,
+        query_cache: t.Optional[str] = None,
+        query_cache_max_entries: int = 1024,
+        query_cache_ttl: t.Optional[float] = None,
     ):
         """
         The Imp configuration class.
@@ -42,7 +77,50 @@ class ImpConfig:
         :param init_session: The initial session dictionary.
         :param database_main: The main database configuration.
         :param database_binds: An iterable of database bind configurations.
+        :param import_manifest: Record the resolved import plan of `import_resources`,
+                                `import_blueprints` and `import_models` to a file in the
+                                instance folder, and replay it on later starts.
+        :param profile_startup: Record the time and memory taken by each import, factory
+                                and blueprint registration, available as
+                                `Imp.startup_profile`.
+        :param preload: Run `Imp.preload()` before the process forks, and `Imp.post_fork()`
+                        in each forked child, including the forks made by multiprocessing.
+                        Calling them from the server's hooks is preferred.
+        :param hot_reload: When the app is in debug mode, reload only the resource modules
+                           that have changed, instead of restarting the app.
+        :param template_bytecode_cache: Store the compiled Jinja templates in the instance
+                                        folder, so they are not compiled again by each process.
+        :param indexed_template_loader: Look up templates named "<blueprint name>/..." in the
+                                        loader of that blueprint, instead of trying every
+                                        blueprint loader in turn.
+        :param static_fingerprints: Serve the fingerprinted static files written by
+                                    `Imp.fingerprint_static`, with far-future cache headers.
+        :param static_cache: Serve small static files of the app and blueprints from memory.
+        :param static_cache_max_entries: The number of files to keep in the static cache.
+        :param static_cache_max_file_size: The size in bytes of the largest file to keep in
+                                           the static cache.
+        :param lazy_models: Scan model files for classes without importing them, and import
+                            each model file the first time one of its models is looked up.
+        :param lazy_models_load_on_configure: With `lazy_models`, import every model file before
+                                              the SQLAlchemy mappers are configured, on the first
+                                              query, so relationships to models in other files
+                                              resolve. Otherwise call `Imp.load_models()`.
+        :param query_stats: Count the queries and database time of each request, by endpoint
+                            and blueprint, available as `Imp.query_stats`. In debug mode the
+                            counts are also sent as response headers.
+        :param query_stats_repeat_threshold: The number of times a statement can run in one
+                                             request before it is flagged as a possible N+1 query.
+        :param query_cache: Cache the results of queries on the models passed to
+                            `Imp.cache_queries`, "memory" for a cache in each process, or
+                            "sqlite" for a cache in the instance folder shared by all processes.
+        :param query_cache_max_entries: The number of results to keep in the query cache.
+        :param query_cache_ttl: The number of seconds to keep a result in the query cache,
+                                no limit if None. Results are removed when their tables are
+                                written to either way.
         """
+        if query_cache is not None and query_cache not in ("memory", "sqlite"):
+            raise ValueError("query_cache must be one of: memory, sqlite")
+
         if not init_session:
             self.IMP_INIT_SESSION = {}
         else:
@@ -54,3 +132,21 @@ class ImpConfig:
             self.IMP_DATABASE_BINDS = database_binds
         else:
             self.IMP_DATABASE_BINDS = []
+
+        self.IMP_IMPORT_MANIFEST = import_manifest
+        self.IMP_PROFILE_STARTUP = profile_startup
+        self.IMP_PRELOAD = preload
+        self.IMP_HOT_RELOAD = hot_reload
+        self.IMP_TEMPLATE_BYTECODE_CACHE = template_bytecode_cache
+        self.IMP_INDEXED_TEMPLATE_LOADER = indexed_template_loader
+        self.IMP_STATIC_FINGERPRINTS = static_fingerprints
+        self.IMP_STATIC_CACHE = static_cache
+        self.IMP_STATIC_CACHE_MAX_ENTRIES = static_cache_max_entries
+        self.IMP_STATIC_CACHE_MAX_FILE_SIZE = static_cache_max_file_size
+        self.IMP_LAZY_MODELS = lazy_models
+        self.IMP_LAZY_MODELS_LOAD_ON_CONFIGURE = lazy_models_load_on_configure
+        self.IMP_QUERY_STATS = query_stats
+        self.IMP_QUERY_STATS_REPEAT_THRESHOLD = query_stats_repeat_threshold
+        self.IMP_QUERY_CACHE = query_cache
+        self.IMP_QUERY_CACHE_MAX_ENTRIES = query_cache_max_entries
+        self.IMP_QUERY_CACHE_TTL = query_cache_ttl
@@ -0,0 +1,50 @@
+import typing as t
+
+REPLICA_STRATEGIES = ("round-robin", "least-recently-used")
+
+
+def check_replica_strategy(strategy: str) -> str:
+    """
+    !! Private function !!
+    """
+    if strategy not in REPLICA_STRATEGIES:
+        raise ValueError(
+            f"Replica strategy must be one of: {', '.join(REPLICA_STRATEGIES)}"
+        )
+    return strategy
+
+
+def server_replica_uri(
+    dialect: str,
+    database_name: str,
+    location: str,
+    port: int,
+    username: str,
+    password: str,
+    replica: t.Union[str, t.Dict[str, t.Any]],
+) -> str:
+    """
+    !! Private function !!
+
+    Returns the URI of a replica of a database server. The replica is the
+    location of the replica, or a dict of the connection details that differ
+    from the primary's: location, port, username, password, database_name.
+    """
+    if isinstance(replica, str):
+        replica = {"location": replica}
+
+    unknown = set(replica) - {
+        "location",
+        "port",
+        "username",
+        "password",
+        "database_name",
+    }
+    if unknown:
+        raise ValueError(f"Unknown replica settings: {', '.join(sorted(unknown))}")
+
+    return (
+        f"{dialect}://{replica.get('username', username)}:"
+        f"{replica.get('password', password)}@{replica.get('location', location)}:"
+        f"{replica.get('port', port)}/{replica.get('database_name', database_name)}"
+    )
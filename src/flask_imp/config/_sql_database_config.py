@@ -1,5 +1,8 @@
 import typing as t
 
+from ._engine_options import build_engine_options, check_engine_policy
+from ._replicas import check_replica_strategy, server_replica_uri
+
 
 class SQLDatabaseConfig:
     dialect: t.Literal["mysql", "postgresql", "oracle", "mssql"]
@@ -10,6 +13,11 @@ class SQLDatabaseConfig:
     password: str
     bind_key: t.Optional[str] = None
     enabled: bool = False
+    engine_options: t.Dict[str, t.Any]
+    replicas: t.List[t.Union[str, t.Dict[str, t.Any]]]
+    replica_strategy: str
+    engine_policy: str
+    warmup_connections: int
 
     allowed_dialects: t.Tuple[str, ...] = ("mysql", "postgresql", "oracle", "mssql")
 
@@ -23,6 +31,18 @@ class SQLDatabaseConfig:
         password: str,
         bind_key: t.Optional[str] = None,
         enabled: bool = True,
+        pool_size: t.Optional[int] = None,
+        max_overflow: t.Optional[int] = None,
+        pool_timeout: t.Optional[float] = None,
+        pool_recycle: t.Optional[int] = None,
+        pool_pre_ping: t.Optional[bool] = None,
+        connect_args: t.Optional[t.Dict[str, t.Any]] = None,
+        query_cache_size: t.Optional[int] = None,
+        engine_options: t.Optional[t.Dict[str, t.Any]] = None,
+        replicas: t.Optional[t.List[t.Union[str, t.Dict[str, t.Any]]]] = None,
+        replica_strategy: str = "round-robin",
+        engine_policy: str = "default",
+        warmup_connections: t.Optional[int] = None,
     ) -> None:
         """
         SQL database configuration
@@ -37,6 +57,24 @@ class SQLDatabaseConfig:
         :param password: password to connect to the database
         :param bind_key: bind key to be used in SQLAlchemy - Optional
         :param enabled: whether the database is available to the application - defaults to True
+        :param pool_size: the number of connections to keep open in the pool - Optional
+        :param max_overflow: the number of connections to open beyond the pool size - Optional
+        :param pool_timeout: the seconds to wait for a connection from the pool - Optional
+        :param pool_recycle: the seconds after which a connection is replaced - Optional
+        :param pool_pre_ping: test connections for liveness when they are taken from the pool - Optional
+        :param connect_args: arguments passed to the database driver's connect function - Optional
+        :param query_cache_size: the size of the compiled statement cache - Optional
+        :param engine_options: any other create_engine arguments - Optional
+        :param replicas: read replicas of the database, each the location of a replica, or
+                         a dict of the location, port, username, password and
+                         database_name that differ from the primary's - Optional
+        :param replica_strategy: how reads are spread over the replicas,
+                                 one of: round-robin, least-recently-used - defaults to round-robin
+        :param engine_policy: when the engine of the database is created, one of: default,
+                              lazy (on first use, binds only), eager (warmed up in the
+                              first app context and after each fork) - defaults to default
+        :param warmup_connections: the number of connections an eager engine opens when it is
+                                   warmed up - defaults to 1
         """
         if dialect not in self.allowed_dialects:
             raise ValueError(
@@ -51,6 +89,22 @@ class SQLDatabaseConfig:
         self.port = port
         self.username = username
         self.password = password
+        self.engine_options = build_engine_options(
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_recycle=pool_recycle,
+            pool_pre_ping=pool_pre_ping,
+            connect_args=connect_args,
+            query_cache_size=query_cache_size,
+            engine_options=engine_options,
+        )
+        self.replicas = list(replicas or [])
+        self.replica_strategy = check_replica_strategy(replica_strategy)
+        self.engine_policy, self.warmup_connections = check_engine_policy(
+            engine_policy, warmup_connections
+        )
+        self.replica_uris()
 
     def as_dict(self) -> t.Dict[str, t.Any]:
         return {
@@ -62,6 +116,11 @@ class SQLDatabaseConfig:
             "port": self.port,
             "username": self.username,
             "password": self.password,
+            "engine_options": self.engine_options,
+            "replicas": self.replicas,
+            "replica_strategy": self.replica_strategy,
+            "engine_policy": self.engine_policy,
+            "warmup_connections": self.warmup_connections,
         }
 
     def uri(self) -> str:
@@ -70,3 +129,17 @@ class SQLDatabaseConfig:
             f"{self.password}@{self.location}:"
             f"{self.port}/{self.database_name}"
         )
+
+    def replica_uris(self) -> t.List[str]:
+        return [
+            server_replica_uri(
+                self.dialect,
+                self.database_name,
+                self.location,
+                self.port,
+                self.username,
+                self.password,
+                replica,
+            )
+            for replica in self.replicas
+        ]
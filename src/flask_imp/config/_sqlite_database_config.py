@@ -1,6 +1,10 @@
 import typing as t
 from pathlib import Path
 
+from ._engine_options import build_engine_options, check_engine_policy
+from ._replicas import check_replica_strategy
+from ._sqlite_pragmas import pragma_connection_factory, sqlite_pragmas
+
 
 class SQLiteDatabaseConfig:
     database_name: str
@@ -8,6 +12,12 @@ class SQLiteDatabaseConfig:
     location: t.Optional[Path]
     bind_key: t.Optional[str]
     enabled: bool
+    engine_options: t.Dict[str, t.Any]
+    pragmas: t.Dict[str, t.Any]
+    replicas: t.List[str]
+    replica_strategy: str
+    engine_policy: str
+    warmup_connections: int
 
     def __init__(
         self,
@@ -16,6 +26,20 @@ class SQLiteDatabaseConfig:
         location: t.Optional[Path] = None,
         bind_key: t.Optional[str] = None,
         enabled: bool = True,
+        pool_size: t.Optional[int] = None,
+        max_overflow: t.Optional[int] = None,
+        pool_timeout: t.Optional[float] = None,
+        pool_recycle: t.Optional[int] = None,
+        pool_pre_ping: t.Optional[bool] = None,
+        connect_args: t.Optional[t.Dict[str, t.Any]] = None,
+        query_cache_size: t.Optional[int] = None,
+        engine_options: t.Optional[t.Dict[str, t.Any]] = None,
+        performance_profile: t.Optional[str] = None,
+        pragmas: t.Optional[t.Dict[str, t.Any]] = None,
+        replicas: t.Optional[t.List[str]] = None,
+        replica_strategy: str = "round-robin",
+        engine_policy: str = "default",
+        warmup_connections: t.Optional[int] = None,
     ):
         """
         SQLite database configuration
@@ -27,12 +51,54 @@ class SQLiteDatabaseConfig:
         :param location: location of the database - Optional - defaults to app instance path
         :param bind_key: bind key to be used in SQLAlchemy - Optional
         :param enabled: whether the database is enabled - defaults to True
+        :param pool_size: the number of connections to keep open in the pool - Optional
+        :param max_overflow: the number of connections to open beyond the pool size - Optional
+        :param pool_timeout: the seconds to wait for a connection from the pool - Optional
+        :param pool_recycle: the seconds after which a connection is replaced - Optional
+        :param pool_pre_ping: test connections for liveness when they are taken from the pool - Optional
+        :param connect_args: arguments passed to the database driver's connect function - Optional
+        :param query_cache_size: the size of the compiled statement cache - Optional
+        :param engine_options: any other create_engine arguments - Optional
+        :param performance_profile: apply the PRAGMAs of a preset to each new connection,
+                                    one of: safe, fast, readonly - Optional
+        :param pragmas: PRAGMAs to apply to each new connection, these override the
+                        PRAGMAs of the profile - Optional
+        :param replicas: database names of read replicas, stored in the same location
+                         with the same extension - Optional
+        :param replica_strategy: how reads are spread over the replicas,
+                                 one of: round-robin, least-recently-used - defaults to round-robin
+        :param engine_policy: when the engine of the database is created, one of: default,
+                              lazy (on first use, binds only), eager (warmed up in the
+                              first app context and after each fork) - defaults to default
+        :param warmup_connections: the number of connections an eager engine opens when it is
+                                   warmed up - defaults to 1
         """
         self.enabled = enabled
         self.database_name = database_name
         self.bind_key = bind_key
         self.sqlite_db_extension = sqlite_db_extension
         self.location = location
+        self.engine_options = build_engine_options(
+            pool_size=pool_size,
+            max_overflow=max_overflow,
+            pool_timeout=pool_timeout,
+            pool_recycle=pool_recycle,
+            pool_pre_ping=pool_pre_ping,
+            connect_args=connect_args,
+            query_cache_size=query_cache_size,
+            engine_options=engine_options,
+        )
+        self.pragmas = sqlite_pragmas(performance_profile, pragmas)
+        if self.pragmas:
+            self.engine_options["connect_args"] = {
+                **self.engine_options.get("connect_args", {}),
+                "factory": pragma_connection_factory(self.pragmas),
+            }
+        self.replicas = list(replicas or [])
+        self.replica_strategy = check_replica_strategy(replica_strategy)
+        self.engine_policy, self.warmup_connections = check_engine_policy(
+            engine_policy, warmup_connections
+        )
 
     def as_dict(self) -> t.Dict[str, t.Any]:
         return {
@@ -41,17 +107,30 @@ class SQLiteDatabaseConfig:
             "bind_key": self.bind_key,
             "location": self.location,
             "sqlite_db_extension": self.sqlite_db_extension,
+            "engine_options": self.engine_options,
+            "pragmas": self.pragmas,
+            "replicas": self.replicas,
+            "replica_strategy": self.replica_strategy,
+            "engine_policy": self.engine_policy,
+            "warmup_connections": self.warmup_connections,
         }
 
     def uri(self, app_instance_path: Path) -> str:
+        return self._database_uri(self.database_name, app_instance_path)
+
+    def replica_uris(self, app_instance_path: Path) -> t.List[str]:
+        return [
+            self._database_uri(database_name, app_instance_path)
+            for database_name in self.replicas
+        ]
+
+    def _database_uri(self, database_name: str, app_instance_path: Path) -> str:
         if isinstance(self.location, Path):
             if not self.location.exists():
                 raise FileNotFoundError(f"Location {self.location} does not exist")
 
-            filepath = self.location / f"{self.database_name}{self.sqlite_db_extension}"
+            filepath = self.location / f"{database_name}{self.sqlite_db_extension}"
         else:
-            filepath = (
-                app_instance_path / f"{self.database_name}{self.sqlite_db_extension}"
-            )
+            filepath = app_instance_path / f"{database_name}{self.sqlite_db_extension}"
 
         return f"sqlite:///{filepath}"
@@ -0,0 +1,75 @@
+import re
+import sqlite3
+import typing as t
+
+SQLITE_PROFILES: t.Dict[str, t.Dict[str, t.Any]] = {
+    "safe": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -16000,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000,
+        "foreign_keys": "ON",
+    },
+    "fast": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -64000,
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+        "foreign_keys": "ON",
+    },
+    "readonly": {
+        "cache_size": -64000,
+        "mmap_size": 268435456,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+        "query_only": "ON",
+    },
+}
+
+_PRAGMA_NAME = re.compile(r"^[a-z_]+$")
+_PRAGMA_VALUE = re.compile(r"^-?[A-Za-z0-9_]+$")
+
+
+def sqlite_pragmas(
+    profile: t.Optional[str], pragmas: t.Optional[t.Dict[str, t.Any]]
+) -> t.Dict[str, t.Any]:
+    """
+    !! Private function !!
+
+    Returns the PRAGMAs of the profile, updated with the given PRAGMAs.
+    """
+    if profile is not None and profile not in SQLITE_PROFILES:
+        raise ValueError(
+            f"SQLite performance profile must be one of: {', '.join(SQLITE_PROFILES)}"
+        )
+
+    merged = {**SQLITE_PROFILES.get(profile or "", {}), **(pragmas or {})}
+
+    for name, value in merged.items():
+        if not _PRAGMA_NAME.match(name) or not _PRAGMA_VALUE.match(str(value)):
+            raise ValueError(f"Invalid SQLite PRAGMA {name}={value}")
+
+    return merged
+
+
+def pragma_connection_factory(
+    pragmas: t.Dict[str, t.Any],
+) -> t.Type[sqlite3.Connection]:
+    """
+    !! Private function !!
+
+    Returns a sqlite3 connection class that applies the PRAGMAs when each
+    connection is opened, used as the `factory` argument of `sqlite3.connect`.
+    """
+    statements = [f"PRAGMA {name}={value}" for name, value in pragmas.items()]
+
+    class PragmaConnection(sqlite3.Connection):
+        def __init__(self, *args: t.Any, **kwargs: t.Any) -> None:
+            super().__init__(*args, **kwargs)
+            for statement in statements:
+                self.execute(statement).close()
+
+    return PragmaConnection
@@ -1,7 +1,7 @@
 from functools import partial
 from typing import Any, Optional
 
-from flask import url_for
+from flask import current_app, request, url_for
 
 from ._utilities import LazySession
 
@@ -68,7 +68,34 @@ def lazy_session_get(key: str, default: Any = None) -> LazySession:
     return LazySession(key, default)
 
 
+def static_url_for(endpoint: str, *, filename: str, **values: Any) -> str:
+    """
+    Works like Flask's url_for function for static endpoints, but returns the
+    URL of the fingerprinted copy of the file, if there is one in the static manifest.
+
+    `static_url_for("static", filename="css/main.css")` -> `/static/css/main.3f2a9c1b7d4e.css`
+
+    Falls back to the file name given, if the file is not in the manifest.
+
+    :param endpoint: The static endpoint, "static" or "<blueprint>.static". If this
+        starts with a ``.``, the current blueprint name will be used.
+    :param filename: The name of the file, relative to the static folder.
+    :param values: Passed to url_for.
+    """
+    imp = current_app.extensions.get("imp")
+
+    if imp is not None and imp.static_files is not None:
+        lookup = endpoint
+        if lookup.startswith(".") and request and request.blueprint:
+            lookup = f"{request.blueprint}{lookup}"
+
+        filename = imp.static_files.resolve(lookup.lstrip("."), filename)
+
+    return url_for(endpoint, filename=filename, **values)
+
+
 __all__ = [
     "lazy_url_for",
     "lazy_session_get",
+    "static_url_for",
 ]
@@ -1,7 +1,12 @@
 from pathlib import Path
+from textwrap import dedent
+from uuid import uuid4
 
 import pytest
+from flask import Flask
 
+from flask_imp import Imp
+from flask_imp.config import ImpConfig
 from test_app import create_app
 
 instance_folder = Path(__file__).parent / "test_app" / "instance"
@@ -29,3 +34,42 @@ def client(app):
 @pytest.fixture()
 def runner(app):
     return app.test_cli_runner()
+
+
+@pytest.fixture()
+def tmp_package(tmp_path, monkeypatch):
+    """
+    Writes the given files into a uniquely named package under tmp_path, and
+    makes it importable. Returns the package name and path.
+    """
+
+    def _tmp_package(files):
+        name = f"imp_pkg_{uuid4().hex[:8]}"
+        package_path = tmp_path / name
+
+        for file, content in {"__init__.py": "", **files}.items():
+            file_path = package_path / file
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            file_path.write_text(dedent(content), encoding="utf-8")
+
+        monkeypatch.syspath_prepend(str(tmp_path))
+        return name, package_path
+
+    return _tmp_package
+
+
+@pytest.fixture()
+def make_app(tmp_path):
+    """
+    Returns a function that creates a Flask app with the given import name,
+    its instance folder under tmp_path, and an Imp set up with the ImpConfig
+    options given. Returns the app and the Imp.
+    """
+
+    def _make_app(import_name, flask_config=None, **config):
+        app = Flask(import_name, instance_path=str(tmp_path / "instance"))
+        app.secret_key = "test"
+        app.config.update(flask_config or {})
+        return app, Imp(app, ImpConfig(**config))
+
+    return _make_app
@@ -0,0 +1,163 @@
+import inspect
+
+import pytest
+from flask import appcontext_pushed
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import text
+
+from flask_imp._bind_policies import LazyEngines
+from flask_imp.config import SQLiteDatabaseConfig
+
+
+def _app(make_app, database_main, database_binds):
+    app, imp = make_app(
+        __name__, database_main=database_main, database_binds=database_binds
+    )
+    db = SQLAlchemy(app)
+    return app, imp, db
+
+
+def test_lazy_bind(make_app):
+    app, imp, db = _app(
+        make_app,
+        SQLiteDatabaseConfig(),
+        [
+            SQLiteDatabaseConfig(
+                bind_key="archive", database_name="archive", engine_policy="lazy"
+            ),
+            SQLiteDatabaseConfig(bind_key="reports", database_name="reports"),
+        ],
+    )
+
+    class Record(db.Model):
+        __bind_key__ = "archive"
+        id = db.Column(db.Integer, primary_key=True)
+
+    assert "archive" not in app.config["SQLALCHEMY_BINDS"]
+    assert "reports" in app.config["SQLALCHEMY_BINDS"]
+
+    with app.app_context():
+        assert set(db.engines) == {None, "reports"}
+        assert "archive" in db.engines
+
+        connection = db.session.connection(bind_arguments={"mapper": Record})
+        assert str(connection.engine.url).endswith("archive.sqlite")
+        assert set(db.engines) == {None, "reports", "archive"}
+
+        db.create_all()
+        db.session.add(Record())
+        db.session.commit()
+        assert db.session.query(Record).count() == 1
+
+
+def test_eager_binds(make_app):
+    app, imp, db = _app(
+        make_app,
+        SQLiteDatabaseConfig(pool_size=3, engine_policy="eager", warmup_connections=3),
+        [
+            SQLiteDatabaseConfig(
+                bind_key="reports",
+                database_name="reports",
+                engine_policy="eager",
+                warmup_connections=10,
+            ),
+            SQLiteDatabaseConfig(bind_key="other", database_name="other"),
+        ],
+    )
+
+    assert imp.warmup_report is None
+
+    # warmed up in the first app context once Flask-SQLAlchemy is set up
+    with app.app_context():
+        assert imp.warmup_report[None]["connections"] == 3
+        assert db.engines[None].pool.checkedin() == 3
+
+    report = imp.warm_binds()
+
+    assert set(report) == {None, "reports"}
+    assert report[None]["connections"] == 3
+    # the default queue pool keeps 5 connections
+    assert report["reports"]["connections"] == 5
+    assert report["reports"]["seconds"] >= 0
+    assert report["reports"]["error"] is None
+    assert imp.warmup_report is report
+
+    with app.app_context():
+        assert db.engines[None].pool.checkedin() == 3
+        assert db.engines["reports"].pool.checkedin() == 5
+        assert db.engines["other"].pool.checkedin() == 0
+
+    imp.post_fork()
+    assert imp.warmup_report is not report
+
+    with app.app_context():
+        assert db.engines[None].pool.checkedin() == 3
+
+
+def test_engine_policy_validation(make_app):
+    with pytest.raises(ValueError):
+        SQLiteDatabaseConfig(engine_policy="sometimes")
+
+    with pytest.raises(ValueError):
+        SQLiteDatabaseConfig(warmup_connections=2)
+
+    with pytest.raises(ValueError):
+        SQLiteDatabaseConfig(engine_policy="eager", warmup_connections=0)
+
+    with pytest.raises(ValueError):
+        _app(make_app, SQLiteDatabaseConfig(engine_policy="lazy"), [])
+
+
+def test_flask_sqlalchemy_internals(make_app):
+    # lazy binds use these private parts of Flask-SQLAlchemy, fails if they change
+    app, imp, db = _app(
+        make_app,
+        SQLiteDatabaseConfig(),
+        [
+            SQLiteDatabaseConfig(
+                bind_key="archive", database_name="archive", engine_policy="lazy"
+            )
+        ],
+    )
+
+    assert isinstance(db._app_engines[app], dict)
+    assert list(inspect.signature(db._make_engine).parameters) == [
+        "bind_key",
+        "options",
+        "app",
+    ]
+    assert list(inspect.signature(db._apply_driver_defaults).parameters) == [
+        "options",
+        "app",
+    ]
+
+    # installed on the first app context, then no longer listening
+    with app.app_context():
+        assert isinstance(db._app_engines[app], LazyEngines)
+
+    assert imp.bind_policies.install not in appcontext_pushed.receivers_for(app)
+
+
+def test_lazy_bind_query_stats(make_app):
+    app, imp = make_app(
+        __name__,
+        database_main=SQLiteDatabaseConfig(),
+        database_binds=[
+            SQLiteDatabaseConfig(
+                bind_key="archive", database_name="archive", engine_policy="lazy"
+            )
+        ],
+        query_stats=True,
+    )
+    db = SQLAlchemy(app)
+
+    @app.route("/")
+    def index():
+        # the archive engine is created in this request
+        db.session.execute(
+            text("SELECT 1"), bind_arguments={"bind": db.engines["archive"]}
+        )
+        return ""
+
+    assert app.test_client().get("/").status_code == 200
+    assert imp.query_stats.endpoints["index"].queries == 1
@@ -0,0 +1,178 @@
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from flask_imp.config import SQLiteDatabaseConfig
+
+FILES = {
+    "__init__.py": """
+        from flask_sqlalchemy import SQLAlchemy
+
+        db = SQLAlchemy()
+    """,
+    "models.py": """
+        from . import db
+
+
+        class Reading(db.Model):
+            id = db.Column(db.Integer, primary_key=True)
+            sensor = db.Column(db.String(50))
+            value = db.Column(db.Numeric(10, 2))
+            active = db.Column(db.Boolean)
+            taken = db.Column(db.DateTime)
+            extra = db.Column(db.JSON)
+
+
+        class ArchivedReading(db.Model):
+            __bind_key__ = "archive"
+            id = db.Column(db.Integer, primary_key=True)
+            sensor = db.Column(db.String(50))
+    """,
+}
+
+
+def _rows(count, sensor="sensor"):
+    return (
+        {
+            "id": i,
+            "sensor": f"{sensor}-{i}",
+            "value": Decimal(f"{i}.25"),
+            "active": i % 2 == 0,
+            "taken": datetime(2024, 1, 1, i % 24),
+            "extra": {"tags": ["a", str(i)]} if i % 3 else None,
+        }
+        for i in range(1, count + 1)
+    )
+
+
+@pytest.fixture()
+def bulk_app(tmp_package, make_app):
+    name, _ = tmp_package(FILES)
+    app, imp = make_app(
+        name,
+        {"SQLALCHEMY_BINDS": {"archive": "sqlite://"}},
+        database_main=SQLiteDatabaseConfig(),
+    )
+    imp.import_models("models.py")
+    db = __import__(name).db
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+
+    return app, imp, db
+
+
+def test_bulk_load(bulk_app, tmp_path):
+    app, imp, db = bulk_app
+    reading = imp.model("Reading")
+
+    with app.app_context():
+        assert imp.bulk_load("Reading", _rows(25), batch_size=10) == 25
+        assert db.session.scalar(db.select(db.func.count()).select_from(reading)) == 25
+
+        row = db.session.get(reading, 3)
+        assert row.value == Decimal("3.25")
+        assert row.active is False
+        assert row.taken == datetime(2024, 1, 1, 3)
+
+        with pytest.raises(
+            ValueError, match="Row 2: Reading has no columns named: colour"
+        ):
+            imp.bulk_load("Reading", [{"id": 100}, {"id": 101, "colour": "red"}])
+        db.session.rollback()
+
+        csv_file = tmp_path / "readings.csv"
+        csv_file.write_text("id,sensor\n200,a\n201,b,extra\n", encoding="utf-8")
+        with pytest.raises(ValueError, match="Row 2 has more cells than the header"):
+            imp.bulk_load("Reading", csv_file)
+        db.session.rollback()
+
+        # rows can leave out columns, which are set to their defaults
+        imp.bulk_load(
+            "Reading",
+            [{"id": 30, "sensor": "a"}, {"id": 31}, {"sensor": "c", "id": 32}],
+            batch_size=10,
+        )
+        assert [db.session.get(reading, i).sensor for i in (30, 31, 32)] == [
+            "a",
+            None,
+            "c",
+        ]
+
+
+def test_bulk_load_conversions():
+    from sqlalchemy import JSON, Column, Integer, String
+
+    from flask_imp._bulk_load import import_converter, insert_statement
+
+    # CSV writes None as an empty cell
+    assert import_converter(Column(JSON, nullable=True))("") is None
+    assert import_converter(Column(JSON, nullable=True))({"a": 1}) == {"a": 1}
+    assert import_converter(Column(JSON), from_csv=True)('{"a": [1]}') == {"a": [1]}
+    assert import_converter(Column(Integer))("") is None
+    assert import_converter(Column(String))("") == ""
+
+    class Connection:
+        class dialect:
+            name = "oracle"
+
+    with pytest.raises(ValueError, match="oracle"):
+        insert_statement(Connection, None, ["id"], ["id", "name"], upsert=True)
+
+
+def test_bulk_load_upsert(bulk_app):
+    app, imp, db = bulk_app
+    reading = imp.model("Reading")
+
+    with app.app_context():
+        imp.bulk_load("Reading", _rows(5))
+
+        with pytest.raises(IntegrityError):
+            imp.bulk_load("Reading", _rows(5))
+        db.session.rollback()
+
+        imp.bulk_load(
+            "Reading",
+            [{"id": 2, "sensor": "renamed"}, {"id": 6, "sensor": "new"}],
+            upsert=True,
+        )
+        db.session.expire_all()
+
+        assert db.session.get(reading, 2).sensor == "renamed"
+        assert db.session.get(reading, 2).value == Decimal("2.25")
+        assert db.session.get(reading, 6).sensor == "new"
+
+
+def test_bulk_load_bind(bulk_app):
+    app, imp, db = bulk_app
+
+    with app.app_context():
+        imp.bulk_load(
+            "ArchivedReading", ({"id": i, "sensor": str(i)} for i in range(1, 4))
+        )
+
+        archive = db.engines["archive"]
+        with archive.connect() as connection:
+            count = connection.execute(db.text("select count(*) from archived_reading"))
+            assert count.scalar() == 3
+
+
+@pytest.mark.parametrize("fmt", ["jsonl", "csv"])
+def test_bulk_load_round_trip(bulk_app, tmp_path, fmt):
+    app, imp, db = bulk_app
+    reading = imp.model("Reading")
+    file = tmp_path / f"readings.{fmt}"
+
+    with app.app_context():
+        imp.bulk_load("Reading", _rows(12))
+        before = db.session.execute(db.select(reading.__table__)).all()
+
+        imp.export_model_to_file("Reading", file)
+        db.session.execute(db.delete(reading))
+        db.session.commit()
+
+        assert imp.bulk_load("Reading", file, batch_size=5) == 12
+        assert db.session.execute(db.select(reading.__table__)).all() == before
@@ -0,0 +1,107 @@
+import threading
+
+import pytest
+
+
+ROUTE = """
+import threading
+
+IMPORTED_ON = threading.current_thread().name
+
+def include(app):
+    app.config.setdefault("FACTORY_THREADS", []).append(
+        threading.current_thread().name
+    )
+
+    @app.route("/{name}")
+    def {name}():
+        return IMPORTED_ON
+"""
+
+BLUEPRINT = """
+import threading
+
+from flask_imp import ImpBlueprint
+from flask_imp.config import ImpBlueprintConfig
+
+bp = ImpBlueprint(__name__, ImpBlueprintConfig())
+bp.import_resources("routes", max_workers=2)
+IMPORTED_ON = threading.current_thread().name
+"""
+
+BLUEPRINT_ROUTE = """
+def include(bp):
+    @bp.route("/")
+    def index():
+        return bp.name
+"""
+
+
+def test_concurrent_import_resources(tmp_package, make_app):
+    name, _ = tmp_package(
+        {f"resources/route_{i}.py": ROUTE.format(name=f"r{i}") for i in range(8)}
+    )
+    app, imp = make_app(name)
+    imp.import_resources(scope_import={".": "*"}, max_workers=4)
+
+    client = app.test_client()
+    imported_on = {client.get(f"/r{i}").data for i in range(8)}
+
+    assert threading.current_thread().name.encode() not in imported_on
+    assert set(app.config["FACTORY_THREADS"]) == {threading.current_thread().name}
+
+
+def test_concurrent_import_blueprints(tmp_package, make_app):
+    files = {}
+    for i in range(4):
+        files[f"blueprints/bp_{i}/__init__.py"] = BLUEPRINT
+        files[f"blueprints/bp_{i}/routes/index.py"] = BLUEPRINT_ROUTE
+
+    name, _ = tmp_package(files)
+    app, imp = make_app(name)
+    imp.import_blueprints("blueprints", max_workers=4)
+
+    client = app.test_client()
+    assert [client.get(f"/bp-{i}/").data for i in range(4)] == [
+        f"bp_{i}".encode() for i in range(4)
+    ]
+
+    # packages that import their own resources are imported on the calling thread
+    for i in range(4):
+        module = __import__(f"{name}.blueprints.bp_{i}", fromlist=["IMPORTED_ON"])
+        assert module.IMPORTED_ON == threading.current_thread().name
+
+
+def test_concurrent_import_error_message(tmp_package, make_app):
+    name, _ = tmp_package({"resources/broken.py": "import not_a_real_module\n"})
+    app, imp = make_app(name)
+
+    with pytest.raises(ImportError) as sequential:
+        imp.import_resources(scope_import={".": "*"})
+
+    with pytest.raises(ImportError) as concurrent:
+        imp.import_resources(scope_import={".": "*"}, max_workers=4)
+
+    assert str(concurrent.value) == str(sequential.value)
+    assert str(concurrent.value).startswith(
+        f"Error when importing {name}.resources.broken:"
+    )
+
+
+def test_concurrent_import_failure_is_raised_once(tmp_package, make_app):
+    name, _ = tmp_package(
+        {
+            "__init__.py": "RUNS = []\n",
+            "resources/a_broken.py": (
+                "from .. import RUNS\nRUNS.append(1)\nraise ValueError('broken')\n"
+            ),
+            "resources/b_route.py": ROUTE.format(name="b"),
+        }
+    )
+    app, imp = make_app(name)
+
+    with pytest.raises(ValueError, match="broken"):
+        imp.import_resources(scope_import={".": "*"}, max_workers=4)
+
+    # the module is not imported a second time on the calling thread
+    assert __import__(name).RUNS == [1]
@@ -0,0 +1,67 @@
+from flask_sqlalchemy import SQLAlchemy
+
+from flask_imp.config import (
+    DatabaseConfig,
+    SQLDatabaseConfig,
+    SQLiteDatabaseConfig,
+)
+
+
+def test_engine_options_are_only_the_ones_set():
+    assert SQLiteDatabaseConfig().engine_options == {}
+    assert DatabaseConfig().engine_options == {}
+
+    config = SQLDatabaseConfig(
+        "postgresql",
+        "app",
+        "localhost",
+        5432,
+        "user",
+        "password",
+        pool_size=20,
+        max_overflow=10,
+        pool_pre_ping=True,
+        connect_args={"connect_timeout": 5},
+        engine_options={"pool_size": 1, "echo_pool": True},
+    )
+    assert config.engine_options == {
+        "pool_size": 20,
+        "max_overflow": 10,
+        "pool_pre_ping": True,
+        "connect_args": {"connect_timeout": 5},
+        "echo_pool": True,
+    }
+
+
+def test_engine_options_are_applied_per_bind(make_app, tmp_path):
+    app, _ = make_app(
+        __name__,
+        {"SQLALCHEMY_ENGINE_OPTIONS": {"pool_timeout": 3}},
+        database_main=SQLiteDatabaseConfig(
+            pool_size=12, pool_timeout=10, pool_pre_ping=True
+        ),
+        database_binds=[
+            SQLiteDatabaseConfig("reports", bind_key="reports", pool_size=2),
+            SQLiteDatabaseConfig("plain", bind_key="plain"),
+        ],
+    )
+
+    assert app.config["SQLALCHEMY_ENGINE_OPTIONS"] == {
+        "pool_size": 12,
+        "pool_timeout": 3,
+        "pool_pre_ping": True,
+    }
+    assert app.config["SQLALCHEMY_BINDS"]["reports"] == {
+        "url": f"sqlite:///{tmp_path / 'instance' / 'reports.sqlite'}",
+        "pool_size": 2,
+    }
+    assert app.config["SQLALCHEMY_BINDS"]["plain"] == (
+        f"sqlite:///{tmp_path / 'instance' / 'plain.sqlite'}"
+    )
+
+    db = SQLAlchemy(app)
+    with app.app_context():
+        assert db.engine.pool.size() == 12
+        assert db.engine.pool._pre_ping
+        assert db.engines["reports"].pool.size() == 2
+        assert db.engines["plain"].pool.size() == 5
@@ -0,0 +1,164 @@
+import logging
+import os
+from textwrap import dedent
+
+
+ROUTES = """
+    def include(app):
+        @app.route("/")
+        def index():
+            return "one"
+
+        @app.route("/old")
+        def old():
+            return "old"
+"""
+
+ROUTES_CHANGED = """
+    from flask import request
+
+    def include(app):
+        @app.before_request
+        def mark():
+            request.environ["marked"] = "marked"
+
+        @app.route("/")
+        def index():
+            return f"two {request.environ['marked']}"
+
+        @app.template_filter("shout")
+        def shout(value):
+            return value.upper()
+"""
+
+BLUEPRINT = """
+    from flask_imp import ImpBlueprint
+    from flask_imp.config import ImpBlueprintConfig
+
+    bp = ImpBlueprint(__name__, ImpBlueprintConfig())
+    bp.import_resources("routes")
+"""
+
+BLUEPRINT_ROUTES = """
+    def include(bp):
+        @bp.route("/")
+        def index():
+            return "bp one"
+"""
+
+BLUEPRINT_ROUTES_CHANGED = """
+    from flask import request
+
+    def include(bp):
+        @bp.before_request
+        def mark():
+            request.environ["marked"] = "marked"
+
+        @bp.route("/")
+        def index():
+            return f"bp two {request.environ['marked']}"
+
+        @bp.route("/new")
+        def new():
+            return "bp new"
+"""
+
+
+def _write(path, content):
+    path.write_text(dedent(content), encoding="utf-8")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000_000))
+
+
+def _boot(tmp_package, make_app, debug=True):
+    name, package_path = tmp_package(
+        {
+            "resources/routes.py": ROUTES,
+            "resources/plain.py": "GREETING = 'hello'\n",
+            "blueprints/shop/__init__.py": BLUEPRINT,
+            "blueprints/shop/routes/index.py": BLUEPRINT_ROUTES,
+            "models/things.py": "class Thing:\n    __tablename__ = 'thing'\n",
+        }
+    )
+    app, imp = make_app(name, {"DEBUG": debug}, hot_reload=True)
+    imp.import_resources()
+    imp.import_blueprints("blueprints")
+    imp.import_models("models")
+    imp.hot_reloader.interval = 0
+    return app, package_path
+
+
+def test_hot_reload_app_resource(tmp_package, make_app):
+    app, package_path = _boot(tmp_package, make_app)
+    client = app.test_client()
+    assert client.get("/").data == b"one"
+
+    _write(package_path / "resources" / "routes.py", ROUTES_CHANGED)
+
+    assert client.get("/").data == b"two marked"
+    assert client.get("/old").status_code == 404
+    assert app.jinja_env.filters["shout"]("a") == "A"
+    assert client.get("/shop/").data == b"bp one"
+
+
+def test_hot_reload_blueprint_resource(tmp_package, make_app):
+    app, package_path = _boot(tmp_package, make_app)
+    client = app.test_client()
+    assert client.get("/shop/").data == b"bp one"
+
+    routes = package_path / "blueprints" / "shop" / "routes" / "index.py"
+    _write(routes, BLUEPRINT_ROUTES_CHANGED)
+
+    assert client.get("/shop/").data == b"bp two marked"
+    assert client.get("/shop/new").data == b"bp new"
+    assert client.get("/").data == b"one"
+
+    _write(routes, BLUEPRINT_ROUTES)
+
+    assert client.get("/shop/").data == b"bp one"
+    assert client.get("/shop/new").status_code == 404
+    assert not app.before_request_funcs.get("shop")
+
+
+def test_hot_reload_syntax_error_keeps_old_code(tmp_package, make_app, caplog):
+    app, package_path = _boot(tmp_package, make_app)
+    client = app.test_client()
+
+    _write(package_path / "resources" / "routes.py", "def include(app:\n")
+
+    with caplog.at_level(logging.ERROR):
+        assert client.get("/").data == b"one"
+    assert "Not reloading" in caplog.text
+
+
+def test_hot_reload_model_change_requires_restart(tmp_package, make_app, caplog):
+    app, package_path = _boot(tmp_package, make_app)
+    client = app.test_client()
+
+    _write(package_path / "models" / "things.py", "class Thing:\n    pass\n")
+
+    with caplog.at_level(logging.WARNING):
+        client.get("/")
+    assert "things.py changed, restart the app" in caplog.text
+
+
+def test_hot_reload_module_without_factory_requires_restart(
+    tmp_package, make_app, caplog
+):
+    app, package_path = _boot(tmp_package, make_app)
+    client = app.test_client()
+
+    _write(package_path / "resources" / "plain.py", "GREETING = 'hi'\n")
+
+    with caplog.at_level(logging.WARNING):
+        client.get("/")
+    assert "plain.py changed, restart the app" in caplog.text
+
+
+def test_hot_reload_only_in_debug(tmp_package, make_app):
+    app, package_path = _boot(tmp_package, make_app, debug=False)
+    client = app.test_client()
+
+    _write(package_path / "resources" / "routes.py", ROUTES_CHANGED)
+
+    assert client.get("/").data == b"one"
@@ -0,0 +1,209 @@
+import pytest
+from sqlalchemy import event
+
+from flask_imp._registries import ModelRegistry
+from flask_imp.config import SQLiteDatabaseConfig
+
+FILES = {
+    "__init__.py": """
+        from flask_sqlalchemy import SQLAlchemy
+
+        db = SQLAlchemy()
+    """,
+    "models.py": """
+        from . import db
+
+
+        class User(db.Model):
+            __imp_identity_cache__ = {"ttl": 60, "max_entries": 2}
+
+            id = db.Column(db.Integer, primary_key=True)
+            name = db.Column(db.String(50))
+            tags = db.Column(db.JSON, default=list)
+
+
+        class Plan(db.Model):
+            __imp_identity_cache__ = {"ttl": 0}
+
+            id = db.Column(db.Integer, primary_key=True)
+            name = db.Column(db.String(50))
+
+
+        class Tenant(db.Model):
+            id = db.Column(db.Integer, primary_key=True)
+            name = db.Column(db.String(50))
+    """,
+}
+
+
+@pytest.fixture
+def app(tmp_package, make_app):
+    name, _ = tmp_package(FILES)
+    app, imp = make_app(name, database_main=SQLiteDatabaseConfig())
+    imp.import_models("models.py")
+    db = __import__(name).db
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        for name in ("Ann", "Bob", "Cat"):
+            db.session.add(imp.model("User")(name=name))
+            db.session.add(imp.model("Plan")(name=name))
+            db.session.add(imp.model("Tenant")(name=name))
+        db.session.commit()
+
+    return app
+
+
+def _count_queries(app):
+    queries = []
+    with app.app_context():
+        engine = app.extensions["sqlalchemy"].engine
+
+    event.listen(engine, "before_cursor_execute", lambda *args: queries.append(args[2]))
+    return queries
+
+
+def test_identity_cache_get(app):
+    imp = app.extensions["imp"]
+    db = app.extensions["sqlalchemy"]
+    User = imp.model("User")
+    queries = _count_queries(app)
+
+    assert imp.model_registry.identity_cached == {
+        "User": {"ttl": 60, "max_entries": 2},
+        "Plan": {"ttl": 0, "max_entries": 1000},
+    }
+
+    with app.app_context():
+        assert db.session.get(User, 1).name == "Ann"
+
+    with app.app_context():
+        user = db.session.get(User, 1)
+        assert user.name == "Ann"
+        assert user in db.session
+        assert db.session.get(User, 1) is user
+        assert db.session.get(User, 4) is None
+
+        # the snapshot is not changed by changes to the instance
+        user.tags.append("admin")
+
+    with app.app_context():
+        user = db.session.get(User, 1)
+        assert user.tags == []
+        user.name = "Amy"
+        db.session.commit()
+
+    assert len(queries) == 3
+
+    with app.app_context():
+        assert db.session.get(User, 1).name == "Amy"
+
+        db.session.delete(db.session.get(User, 2))
+        db.session.commit()
+
+    with app.app_context():
+        assert db.session.get(User, 2) is None
+
+    stats = imp.identity_cache.stats()["User"]
+    assert stats["hits"] == 2
+    assert stats["invalidations"] == 2
+
+
+def test_identity_cache_invalidation(app):
+    imp = app.extensions["imp"]
+    db = app.extensions["sqlalchemy"]
+    User, Plan, Tenant = imp.model("User"), imp.model("Plan"), imp.model("Tenant")
+
+    with app.app_context():
+        for pk in (1, 2, 3):
+            db.session.get(User, pk)
+    assert imp.identity_cache.stats()["User"]["evictions"] == 1
+
+    with app.app_context():
+        db.session.execute(db.update(User).values(name="Zed"))
+        # models written to by the open transaction are not cached
+        assert db.session.get(User, 3).name == "Zed"
+        db.session.commit()
+
+    with app.app_context():
+        assert db.session.get(User, 3).name == "Zed"
+
+    with app.app_context():
+        db.session.get(User, 1)
+        db.session.begin_nested()
+        db.session.get(User, 1).name = "Amy"
+        db.session.flush()
+        db.session.rollback()
+        db.session.get(User, 1).name = "Ann"
+        db.session.commit()
+
+    with app.app_context():
+        assert db.session.get(User, 1).name == "Ann"
+        db.session.get(Plan, 1)
+        db.session.get(Plan, 1)
+        db.session.get(Tenant, 1)
+
+    stats = imp.identity_cache.stats()
+    assert stats["Plan"]["hits"] == 0
+    assert "Tenant" not in stats
+
+    imp.identity_cache.clear()
+    assert imp.identity_cache.stats()["User"]["entries"] == 0
+
+
+def test_identity_cache_load_events(app):
+    imp = app.extensions["imp"]
+    db = app.extensions["sqlalchemy"]
+    User = imp.model("User")
+    loaded = []
+    event.listen(User, "load", lambda target, context: loaded.append(target.id))
+
+    # a cached row would be added without a load event, so it is not cached
+    for _ in range(2):
+        with app.app_context():
+            db.session.get(User, 1)
+
+    assert loaded == [1, 1]
+    assert imp.identity_cache.stats().get("User", {}).get("stores", 0) == 0
+
+
+def test_identity_cache_declaration():
+    class Model:
+        __tablename__ = "model"
+        __imp_identity_cache__ = {"ttl": 60, "size": 10}
+
+    with pytest.raises(ValueError):
+        ModelRegistry().add("Model", Model)
+
+
+def test_identity_cache_listens_once_a_model_opts_in():
+    from flask_sqlalchemy.session import Session
+    from sqlalchemy.orm import Mapper
+
+    from flask_imp import _identity_cache
+
+    listeners = [
+        (Session, "do_orm_execute", _identity_cache.cache_identities),
+        (Session, "after_commit", _identity_cache.invalidate_on_commit),
+        (Session, "after_soft_rollback", _identity_cache.forget_writes),
+        (Mapper, "after_update", _identity_cache.record_row_write),
+        (Mapper, "after_delete", _identity_cache.record_row_write),
+    ]
+    for target, name, listener in listeners:
+        if event.contains(target, name, listener):
+            event.remove(target, name, listener)
+
+    class Plain:
+        __tablename__ = "plain"
+
+    class Cached:
+        __tablename__ = "cached"
+        __imp_identity_cache__ = True
+
+    registry = ModelRegistry()
+    registry.add("Plain", Plain)
+    assert not event.contains(Session, "do_orm_execute", listeners[0][2])
+
+    registry.add("Cached", Cached)
+    assert all(event.contains(*listener) for listener in listeners)
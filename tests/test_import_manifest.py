@@ -0,0 +1,125 @@
+import json
+import logging
+import multiprocessing
+import os
+
+
+from flask_imp import _utilities
+from flask_imp._manifest import ImportManifest
+
+FILES = {
+    "resources/routes/routes.py": """
+        def include(app):
+            @app.route("/")
+            def index():
+                return "index"
+    """,
+    "blueprints/www/__init__.py": """
+        from flask_imp import ImpBlueprint
+        from flask_imp.config import ImpBlueprintConfig
+
+        bp = ImpBlueprint(__name__, ImpBlueprintConfig(url_prefix="/www"))
+        bp.import_resources("routes")
+    """,
+    "blueprints/www/routes/index.py": """
+        def include(bp):
+            @bp.route("/")
+            def index():
+                return "www"
+    """,
+    "models/things.py": """
+        class Thing:
+            __tablename__ = "thing"
+    """,
+}
+
+
+def _boot(package_name, make_app):
+    app, imp = make_app(package_name, import_manifest=True)
+    imp.import_resources()
+    imp.import_blueprints("blueprints")
+    imp.import_models("models")
+    return app, imp
+
+
+def test_manifest_is_recorded(tmp_package, tmp_path, make_app):
+    name, _ = tmp_package(FILES)
+    app, imp = _boot(name, make_app)
+
+    manifest = json.loads(
+        (tmp_path / "instance" / "imp_import_manifest.json").read_text()
+    )
+    plans = [entry["plan"] for entry in manifest["entries"].values()]
+
+    assert [f"{name}.resources.routes.routes", ["include"]] in plans[0]
+    assert [f"{name}.blueprints.www", ["bp"]] in sum(plans, [])
+    assert [f"{name}.models.things", ["Thing"]] in sum(plans, [])
+    assert app.test_client().get("/www/").data == b"www"
+
+
+def test_manifest_is_replayed(tmp_package, make_app, monkeypatch):
+    name, _ = tmp_package(FILES)
+    _boot(name, make_app)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("resources folder was re-scanned")
+
+    monkeypatch.setattr(_utilities, "discover_resources", fail)
+
+    app, imp = _boot(name, make_app)
+    client = app.test_client()
+
+    assert client.get("/").data == b"index"
+    assert client.get("/www/").data == b"www"
+    assert imp.model("Thing").__tablename__ == "thing"
+
+
+def test_manifest_rescans_changed_folder(tmp_package, make_app):
+    name, package_path = tmp_package(FILES)
+    _boot(name, make_app)
+
+    (package_path / "resources" / "extra.py").write_text(
+        "def include(app):\n"
+        "    @app.route('/extra')\n"
+        "    def extra():\n"
+        "        return 'extra'\n"
+    )
+
+    app, _ = _boot(name, make_app)
+    assert app.test_client().get("/extra").data == b"extra"
+
+
+def _save_many(file_path, count):
+    manifest = ImportManifest(file_path, logging.getLogger("test"))
+    for i in range(count):
+        manifest.record(f"key-{os.getpid()}", [file_path.parent], i)
+        manifest.save()
+
+
+def test_manifest_concurrent_saves(tmp_path):
+    file_path = tmp_path / "imp_import_manifest.json"
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=_save_many, args=(file_path, 100)) for _ in range(4)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    assert [process.exitcode for process in processes] == [0, 0, 0, 0]
+    assert json.loads(file_path.read_text())["version"] == 1
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_manifest_save_failure_is_logged(tmp_path, caplog):
+    manifest = ImportManifest(
+        tmp_path / "missing" / "manifest.json", logging.getLogger("test")
+    )
+    manifest.record("key", [tmp_path], [])
+
+    with caplog.at_level(logging.WARNING):
+        manifest.save()
+
+    assert "Could not write the import manifest" in caplog.text
+    assert manifest.changed
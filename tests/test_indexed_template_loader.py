@@ -0,0 +1,77 @@
+from flask import render_template_string
+from jinja2 import FileSystemLoader
+
+from flask_imp._templating import IndexedJinjaLoader
+
+BLUEPRINT = """
+    from flask import render_template
+    from flask_imp import ImpBlueprint
+    from flask_imp.config import ImpBlueprintConfig
+
+    bp = ImpBlueprint(__name__, ImpBlueprintConfig(template_folder="templates"))
+
+    @bp.route("/")
+    def index():
+        return render_template(bp.tmpl("index.html"))
+"""
+
+
+def _files(count):
+    files = {"templates/shared.html": "app shared"}
+    for i in range(count):
+        files[f"blueprints/bp_{i}/__init__.py"] = BLUEPRINT
+        files[f"blueprints/bp_{i}/templates/bp_{i}/index.html"] = f"bp {i}"
+        files[f"blueprints/bp_{i}/templates/bp_{i}/shared.html"] = f"bp {i} shared"
+        files[f"blueprints/bp_{i}/templates/flat_{i}.html"] = f"flat {i}"
+    return files
+
+
+def _boot(tmp_package, make_app, count=5):
+    name, _ = tmp_package(_files(count))
+    app, imp = make_app(name, indexed_template_loader=True)
+    imp.import_blueprints("blueprints")
+    return app, imp
+
+
+def test_indexed_loader_renders(tmp_package, make_app):
+    app, _ = _boot(tmp_package, make_app)
+    client = app.test_client()
+
+    assert isinstance(app.jinja_env.loader, IndexedJinjaLoader)
+    assert client.get("/bp-3/").data == b"bp 3"
+
+    with app.app_context():
+        assert render_template_string("{% include 'shared.html' %}") == "app shared"
+        assert render_template_string("{% include 'flat_2.html' %}") == "flat 2"
+        assert render_template_string("{% include 'bp_1/shared.html' %}") == (
+            "bp 1 shared"
+        )
+
+
+def test_indexed_loader_only_tries_the_owning_blueprint(
+    tmp_package, make_app, monkeypatch
+):
+    app, _ = _boot(tmp_package, make_app, count=20)
+    tried = []
+    get_source = FileSystemLoader.get_source
+
+    def spy(self, environment, template):
+        tried.append(self.searchpath[0])
+        return get_source(self, environment, template)
+
+    monkeypatch.setattr(FileSystemLoader, "get_source", spy)
+
+    with app.app_context():
+        app.jinja_env.get_template("bp_17/index.html")
+        assert len(tried) == 2  # the app loader, then bp_17
+        assert tried[1].endswith("bp_17/templates")
+
+        app.jinja_env.cache.clear()
+        tried.clear()
+        app.jinja_env.get_template("bp_17/index.html")
+        assert tried == []
+
+
+def test_indexed_loader_is_off_by_default(make_app):
+    app, _ = make_app(__name__)
+    assert not isinstance(app.jinja_env.loader, IndexedJinjaLoader)
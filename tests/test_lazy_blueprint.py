@@ -0,0 +1,126 @@
+import logging
+import sys
+
+import pytest
+from flask import url_for
+from flask_sqlalchemy import SQLAlchemy
+from werkzeug.routing import BuildError
+
+from flask_imp.config import SQLiteDatabaseConfig
+
+FILES = {
+    "blueprints/admin/__init__.py": """
+        from flask_imp import ImpBlueprint
+        from flask_imp.config import ImpBlueprintConfig
+
+        bp = ImpBlueprint(__name__, ImpBlueprintConfig())
+        bp.import_resources("routes")
+    """,
+    "blueprints/admin/routes/index.py": """
+        from flask import request
+
+        def include(bp):
+            @bp.before_request
+            def mark():
+                request.environ["bp_before_request"] = True
+
+            @bp.route("/")
+            def index():
+                return "admin"
+
+            @bp.route("/users/<int:user_id>", methods=["GET", "POST"])
+            def user(user_id):
+                return f"{request.method} {user_id} {request.environ['bp_before_request']}"
+    """,
+    "blueprints/reports/__init__.py": """
+        from flask_imp import ImpBlueprint
+        from flask_imp.config import ImpBlueprintConfig, SQLiteDatabaseConfig
+
+        bp = ImpBlueprint(
+            __name__,
+            ImpBlueprintConfig(
+                database_binds=[SQLiteDatabaseConfig("reports", bind_key="reports")]
+            ),
+        )
+
+        @bp.route("/")
+        def index():
+            return "reports"
+    """,
+}
+
+
+def _boot(name, make_app):
+    app, imp = make_app(name)
+    imp.lazy_import_blueprint("blueprints/admin")
+    return app, imp
+
+
+def test_lazy_blueprint_loads_on_first_request(tmp_package, make_app):
+    name, _ = tmp_package(FILES)
+    app, imp = _boot(name, make_app)
+    client = app.test_client()
+
+    assert f"{name}.blueprints.admin" not in sys.modules
+    assert client.get("/").status_code == 404
+
+    assert client.post("/admin/users/7").data == b"POST 7 True"
+    assert f"{name}.blueprints.admin" in sys.modules
+    assert "imp_lazy_blueprint_admin" not in {
+        rule.endpoint for rule in app.url_map.iter_rules()
+    }
+
+    assert client.get("/admin/").data == b"admin"
+    assert client.get("/admin").status_code == 308
+    assert client.get("/admin/missing").status_code == 404
+
+
+def test_lazy_blueprint_loads_on_url_for(tmp_package, make_app):
+    name, _ = tmp_package(FILES)
+    app, imp = _boot(name, make_app)
+
+    with app.test_request_context("/"):
+        assert url_for("admin.user", user_id=1) == "/admin/users/1"
+
+
+def test_lazy_blueprint_replaces_the_url_map(tmp_package, make_app):
+    name, _ = tmp_package(FILES)
+    app, imp = _boot(name, make_app)
+    url_map = app.url_map
+    rules = [rule.rule for rule in url_map.iter_rules()]
+
+    # requests matched against the old map on other threads see it unchanged
+    imp.load_lazy_blueprints()
+    assert app.url_map is not url_map
+    assert [rule.rule for rule in url_map.iter_rules()] == rules
+    assert app.test_client().get("/admin/").data == b"admin"
+
+    with app.test_request_context("/"):
+        with pytest.raises(BuildError):
+            url_for("missing.index")
+
+
+def test_lazy_blueprint_only_loads_for_its_endpoints(tmp_package, make_app):
+    name, _ = tmp_package(FILES)
+    app, imp = _boot(name, make_app)
+
+    with app.test_request_context("/"):
+        with pytest.raises(BuildError):
+            url_for("missing.index")
+
+    assert f"{name}.blueprints.admin" not in sys.modules
+
+
+def test_lazy_blueprint_database_binds(tmp_package, make_app, caplog):
+    name, _ = tmp_package(FILES)
+    app, imp = make_app(name, database_main=SQLiteDatabaseConfig())
+    imp.lazy_import_blueprint("blueprints/admin")
+    imp.lazy_import_blueprint("blueprints/reports")
+    SQLAlchemy(app)
+
+    with caplog.at_level(logging.WARNING, logger=app.logger.name):
+        assert app.test_client().get("/admin/").data == b"admin"
+        assert not caplog.records
+
+        assert app.test_client().get("/reports/").data == b"reports"
+        assert "['reports']" in caplog.records[0].getMessage()
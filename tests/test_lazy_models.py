@@ -0,0 +1,166 @@
+import gc
+import sys
+import weakref
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Mapper, configure_mappers
+
+from flask_imp.config import SQLiteDatabaseConfig
+
+FILES = {
+    "extensions.py": """
+        from flask_sqlalchemy import SQLAlchemy
+
+        db = SQLAlchemy()
+    """,
+    "models/shop.py": """
+        from ..extensions import db
+
+
+        class TimestampMixin:
+            created = db.Column(db.DateTime)
+
+
+        class Customer(db.Model, TimestampMixin):
+            id = db.Column(db.Integer, primary_key=True)
+            orders = db.relationship("Order", back_populates="customer")
+    """,
+    "models/orders.py": """
+        from ..extensions import db
+
+
+        class Order(db.Model):
+            __tablename__ = "orders"
+            id = db.Column(db.Integer, primary_key=True)
+            customer_id = db.Column(db.ForeignKey("customer.id"))
+            customer = db.relationship("Customer", back_populates="orders")
+    """,
+}
+
+
+@pytest.fixture()
+def lazy_app(request, tmp_package, make_app):
+    name, _ = tmp_package(FILES)
+    app, imp = make_app(
+        name,
+        database_main=SQLiteDatabaseConfig(),
+        lazy_models=True,
+        **getattr(request, "param", {}),
+    )
+    imp.import_models("models")
+
+    db = __import__(f"{name}.extensions", fromlist=["db"]).db
+    db.init_app(app)
+    yield name, app, imp, db
+    imp.load_models()
+
+
+def test_models_are_scanned_not_imported(lazy_app):
+    name, _, imp, _ = lazy_app
+
+    assert imp.model_registry.lazy == {
+        "Customer": f"{name}.models.shop",
+        "Order": f"{name}.models.orders",
+    }
+    assert f"{name}.models.shop" not in sys.modules
+    assert f"{name}.models.orders" not in sys.modules
+
+    order = imp.model("Order")
+    assert order.__tablename__ == "orders"
+    assert f"{name}.models.orders" in sys.modules
+    assert f"{name}.models.shop" not in sys.modules
+    assert imp.model_registry.lazy == {"Customer": f"{name}.models.shop"}
+
+
+def test_models_are_not_loaded_on_configure_by_default(lazy_app):
+    _, _, imp, _ = lazy_app
+    assert imp._configure_listener is None
+
+
+@pytest.mark.parametrize(
+    "lazy_app", [{"lazy_models_load_on_configure": True}], indirect=True
+)
+def test_mapper_configuration_loads_all_models(lazy_app):
+    _, app, imp, db = lazy_app
+    order = imp.model("Order")
+
+    # resolving the relationship to "Customer" imports its module
+    configure_mappers()
+    assert imp.model_registry.lazy == {}
+    assert not event.contains(Mapper, "before_configured", imp._configure_listener)
+
+    with app.app_context():
+        db.create_all()
+        db.session.add(order(customer=imp.model("Customer")()))
+        db.session.commit()
+        assert db.session.execute(db.select(order)).scalar_one().customer is not None
+
+
+def test_configure_listener_does_not_keep_imp_alive(tmp_package, make_app):
+    name, _ = tmp_package(FILES)
+    app, imp = make_app(
+        name,
+        database_main=SQLiteDatabaseConfig(),
+        lazy_models=True,
+        lazy_models_load_on_configure=True,
+    )
+    imp.import_models("models")
+    listener = imp._configure_listener
+    imp_ref = weakref.ref(imp)
+    del app, imp
+    gc.collect()
+
+    assert imp_ref() is None
+    __import__(f"{name}.models.shop")
+    __import__(f"{name}.models.orders")
+    configure_mappers()
+    assert not event.contains(Mapper, "before_configured", listener)
+
+
+def test_load_models(lazy_app):
+    _, _, imp, _ = lazy_app
+    imp.load_models()
+
+    assert imp.model_registry.lazy == {}
+    assert set(imp.model_registry.registry) == {"Customer", "Order"}
+    assert imp.model_registry.by_table("customer") is imp.model("Customer")
+
+
+def test_registry_lookups_load_lazy_models(lazy_app):
+    name, _, imp, _ = lazy_app
+    registry = imp.model_registry
+
+    assert registry.by_module(f"{name}.models.orders") == [imp.model("Order")]
+    assert registry.lazy == {"Customer": f"{name}.models.shop"}
+
+    assert registry.by_table("customer") is imp.model("Customer")
+    assert registry.lazy == {}
+
+    assert set(registry.by_bind()) == {imp.model("Customer"), imp.model("Order")}
+
+
+def test_scan_model_classes(tmp_path):
+    from flask_imp._registries import scan_model_classes
+
+    model_file = tmp_path / "models.py"
+    model_file.write_text(
+        "class Mixin:\n    pass\n"
+        "class Base(DeclarativeBase):\n    __abstract__ = True\n"
+        "class User(Base, Mixin):\n    pass\n"
+        "class Admin(User):\n    pass\n"
+        "class Legacy(Mixin):\n    __table__ = legacy_table\n"
+        "class Schema(BaseModel):\n    name: str\n"
+        "class Event(db.Model):\n    pass\n"
+        "Old = declarative_base()\n"
+        "class Record(Old):\n    pass\n",
+        encoding="utf-8",
+    )
+
+    assert scan_model_classes(model_file) == [
+        "User",
+        "Admin",
+        "Legacy",
+        "Event",
+        "Record",
+    ]
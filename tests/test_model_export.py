@@ -0,0 +1,133 @@
+import csv
+import io
+import json
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+from click.testing import CliRunner
+
+from flask_imp._cli import cli
+from flask_imp.config import SQLiteDatabaseConfig
+
+FILES = {
+    "__init__.py": """
+        from flask_sqlalchemy import SQLAlchemy
+
+        db = SQLAlchemy()
+    """,
+    "models.py": """
+        from . import db
+
+
+        class Reading(db.Model):
+            id = db.Column(db.Integer, primary_key=True)
+            sensor = db.Column(db.String(50))
+            value = db.Column(db.Numeric(10, 2))
+            taken = db.Column(db.DateTime)
+    """,
+}
+
+
+@pytest.fixture()
+def export_app(tmp_package, make_app):
+    name, _ = tmp_package(FILES)
+    app, imp = make_app(name, database_main=SQLiteDatabaseConfig())
+    imp.import_models("models.py")
+    package = __import__(name)
+    package.db.init_app(app)
+    # loaded by the CLI tests with --app
+    package.app = app
+
+    with app.app_context():
+        package.db.create_all()
+        package.db.session.add_all(
+            imp.model("Reading")(
+                sensor=f"sensor,{i}",
+                value=Decimal(f"{i}.5"),
+                taken=datetime(2024, 1, 1, i),
+            )
+            for i in range(5)
+        )
+        package.db.session.commit()
+
+    return name, app, imp
+
+
+def test_export_jsonl(export_app):
+    _, app, imp = export_app
+
+    with app.app_context():
+        chunks = list(imp.export_model("Reading", batch_size=2))
+        assert not app.extensions["sqlalchemy"].session.identity_map
+
+    assert len(chunks) == 3
+    rows = [json.loads(line) for line in "".join(chunks).splitlines()]
+    assert rows[0] == {
+        "id": 1,
+        "sensor": "sensor,0",
+        "value": "0.50",
+        "taken": "2024-01-01T00:00:00",
+    }
+    assert [row["id"] for row in rows] == [1, 2, 3, 4, 5]
+
+
+def test_export_csv_to_file(export_app, tmp_path):
+    _, app, imp = export_app
+    csv_file = tmp_path / "readings.csv"
+
+    with app.app_context():
+        written = imp.export_model_to_file(
+            "Reading", csv_file, batch_size=2, columns=["id", "sensor"]
+        )
+
+    content = csv_file.read_text(encoding="utf-8")
+    assert written == len(content)
+    assert list(csv.reader(io.StringIO(content))) == [
+        ["id", "sensor"],
+        *([str(i + 1), f"sensor,{i}"] for i in range(5)),
+    ]
+
+
+def test_export_response(export_app):
+    _, app, imp = export_app
+
+    @app.route("/export")
+    def export():
+        return imp.export_model_response(
+            "Reading", fmt="csv", download_name="readings.csv"
+        )
+
+    response = app.test_client().get("/export")
+    assert response.is_streamed
+    assert response.mimetype == "text/csv"
+    assert response.headers["Content-Disposition"] == (
+        "attachment; filename=readings.csv"
+    )
+    assert len(response.data.decode().splitlines()) == 6
+
+
+def test_export_unknown_format(export_app):
+    _, app, imp = export_app
+
+    with app.app_context(), pytest.raises(ValueError):
+        imp.export_model("Reading", fmt="xml")
+
+
+def test_export_cli(export_app, tmp_path):
+    name, _, _ = export_app
+    output = tmp_path / "readings.jsonl"
+
+    result = CliRunner().invoke(
+        cli,
+        ["export", "--app", f"{name}:app", "-m", "Reading", "-o", str(output)],
+    )
+    assert result.exit_code == 0, result.output
+    assert len(output.read_text().splitlines()) == 5
+
+    result = CliRunner().invoke(
+        cli,
+        ["export", "--app", f"{name}:app", "-m", "Reading", "-f", "csv"],
+    )
+    assert result.exit_code == 0, result.output
+    assert result.output.splitlines()[0] == "id,sensor,value,taken"
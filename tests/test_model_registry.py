@@ -0,0 +1,126 @@
+import pytest
+from flask import Flask
+
+from flask_imp.config import SQLiteDatabaseConfig
+
+FILES = {
+    "extensions.py": """
+        from flask_sqlalchemy import SQLAlchemy
+
+        db = SQLAlchemy()
+    """,
+    "models/shop.py": """
+        from ..extensions import db
+
+
+        class Customer(db.Model):
+            id = db.Column(db.Integer, primary_key=True)
+            name = db.Column(db.String(50))
+            orders = db.relationship("Order", back_populates="customer")
+
+
+        class Order(db.Model):
+            __tablename__ = "orders"
+            id = db.Column(db.Integer, primary_key=True)
+            customer_id = db.Column(db.ForeignKey("customer.id"))
+            customer = db.relationship("Customer", back_populates="orders")
+    """,
+    "blueprints/audit/__init__.py": """
+        from flask_imp import ImpBlueprint
+        from flask_imp.config import ImpBlueprintConfig
+
+        bp = ImpBlueprint(__name__, ImpBlueprintConfig())
+        bp.import_models("models")
+    """,
+    "blueprints/audit/models/log.py": """
+        from ....extensions import db
+
+
+        class AuditLog(db.Model):
+            __bind_key__ = "audit"
+            log_id = db.Column("id", db.Integer, primary_key=True)
+            message = db.Column(db.String(200))
+    """,
+}
+
+
+@pytest.fixture()
+def imp_app(tmp_package, make_app):
+    name, _ = tmp_package(FILES)
+    app, imp = make_app(
+        name,
+        {"SQLALCHEMY_BINDS": {"audit": "sqlite://"}},
+        database_main=SQLiteDatabaseConfig(),
+    )
+    imp.import_models("models")
+    imp.import_blueprints("blueprints")
+
+    db = __import__(f"{name}.extensions", fromlist=["db"]).db
+    db.init_app(app)
+    return name, imp
+
+
+def test_registry_indexes(imp_app):
+    name, imp = imp_app
+    registry = imp.model_registry
+
+    assert registry.by_table("orders") is imp.model("Order")
+    assert registry.by_table("audit_log") is imp.model("AuditLog")
+    with pytest.raises(KeyError):
+        registry.by_table("missing")
+
+    assert set(registry.by_bind()) == {imp.model("Customer"), imp.model("Order")}
+    assert registry.by_bind("audit") == [imp.model("AuditLog")]
+
+    assert len(registry.by_module(f"{name}.models.shop")) == 2
+    assert registry.by_module(f"{name}.blueprints.audit") == [imp.model("AuditLog")]
+    assert len(registry.by_module(name)) == 3
+    assert registry.by_module(f"{name}.models.sh") == []
+
+
+def test_registry_meta(imp_app):
+    name, imp = imp_app
+
+    meta = imp.model_meta("AuditLog")
+    assert meta == {
+        "location": f"{name}.blueprints.audit.models.log",
+        "table_name": "audit_log",
+        "bind_key": "audit",
+        "primary_keys": ["log_id"],
+        "columns": ["log_id", "message"],
+        "relationships": {},
+    }
+    assert imp.model_meta(imp.model("AuditLog")) is meta
+
+    assert imp.model_meta("Customer")["relationships"] == {"orders": "Order"}
+    assert imp.model_meta("Order")["columns"] == ["id", "customer_id"]
+
+    with pytest.raises(AttributeError):
+        imp.model_meta(Flask)
+
+    class Legacy:
+        __tablename__ = "legacy"
+
+    # classes that are not mapped have the metadata of the older versions
+    legacy = {"location": __name__, "table_name": "legacy"}
+    assert imp.model_meta(Legacy) == legacy
+    imp.model_registry.add("Legacy", Legacy)
+    assert imp.model_meta("Legacy") == legacy
+
+
+def test_registry_mutation_clears_meta(imp_app):
+    _, imp = imp_app
+    registry = imp.model_registry
+    audit_log = registry.class_("AuditLog")
+
+    meta = registry.meta("AuditLog")
+    registry.remove("AuditLog")
+
+    with pytest.raises(KeyError):
+        registry.by_table("audit_log")
+    assert registry.by_bind("audit") == []
+
+    registry.add("AuditLog", audit_log)
+    assert registry.meta("AuditLog") is not meta
+    assert registry.meta("AuditLog") == meta
+    assert registry.by_table("audit_log") is audit_log
@@ -0,0 +1,132 @@
+import base64
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from flask import request
+from flask_sqlalchemy import SQLAlchemy
+
+from flask_imp.config import SQLiteDatabaseConfig
+
+
+@pytest.fixture
+def paginate_app(make_app):
+    app, imp = make_app(__name__, database_main=SQLiteDatabaseConfig())
+    db = SQLAlchemy(app)
+
+    class Order(db.Model):
+        id = db.Column(db.Integer, primary_key=True)
+        customer = db.Column(db.String(50))
+        created = db.Column(db.DateTime, nullable=False)
+
+    imp.model_registry.add("Order", Order)
+    start = datetime(2024, 1, 1)
+
+    with app.app_context():
+        db.create_all()
+        imp.bulk_load(
+            Order,
+            [
+                # pairs of orders created at the same time
+                {"customer": f"c{i % 3}", "created": start + timedelta(days=i // 2)}
+                for i in range(25)
+            ],
+        )
+
+    @app.route("/orders")
+    def orders():
+        return imp.paginate(
+            "Order", order_by="-created", after=request.args.get("after"), limit=10
+        ).as_dict(["id", "created"])
+
+    return app, imp, db, Order
+
+
+def _all_pages(imp, **kwargs):
+    pages = [imp.paginate("Order", **kwargs)]
+    while pages[-1].has_next:
+        pages.append(imp.paginate("Order", after=pages[-1].next_cursor, **kwargs))
+    return pages
+
+
+def test_paginate(paginate_app):
+    app, imp, db, Order = paginate_app
+
+    with app.app_context():
+        pages = _all_pages(imp, limit=10)
+        assert [len(page.items) for page in pages] == [10, 10, 5]
+        assert [o.id for page in pages for o in page.items] == list(range(1, 26))
+        assert pages[-1].next_cursor is None
+
+        # ties on created are broken by the primary key, in the same direction
+        pages = _all_pages(imp, order_by="-created", limit=4)
+        orders = [o for page in pages for o in page.items]
+        assert [o.id for o in orders] == sorted(
+            range(1, 26), key=lambda i: (-((i - 1) // 2), -i)
+        )
+
+        pages = _all_pages(imp, order_by=["customer", "-created"], limit=3)
+        orders = [o for page in pages for o in page.items]
+        assert [(o.customer, o.created, o.id) for o in orders] == sorted(
+            ((o.customer, o.created, o.id) for o in orders),
+            key=lambda o: (o[0], -o[1].timestamp(), -o[2]),
+        )
+        assert len(orders) == 25
+
+        pages = _all_pages(imp, limit=5, where=[Order.customer == "c1"])
+        assert [o.id for page in pages for o in page.items] == list(range(2, 26, 3))
+
+
+def test_paginate_cursor_errors(paginate_app):
+    app, imp, db, Order = paginate_app
+
+    with app.app_context():
+        cursor = imp.paginate("Order", order_by="created", limit=2).next_cursor
+
+        with pytest.raises(ValueError, match="different order_by"):
+            imp.paginate("Order", order_by="-created", after=cursor)
+
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            imp.paginate("Order", after="not a cursor")
+
+        # valid base64 JSON, but not the values of a cursor
+        for data in ({"o": ["id"], "v": 5}, {"o": "id", "v": [5]}, [1, 2]):
+            malformed = base64.urlsafe_b64encode(json.dumps(data).encode()).decode()
+            with pytest.raises(ValueError, match="Invalid cursor"):
+                imp.paginate("Order", after=malformed)
+
+        with pytest.raises(ValueError):
+            imp.paginate("Order", order_by="total")
+
+        with pytest.raises(ValueError):
+            imp.paginate("Order", limit=0)
+
+
+def test_paginate_view(paginate_app):
+    app, imp, db, Order = paginate_app
+    client = app.test_client()
+
+    first = client.get("/orders").get_json()
+    assert len(first["items"]) == 10
+    assert first["items"][0] == {"id": 25, "created": "2024-01-13T00:00:00"}
+
+    second = client.get("/orders", query_string={"after": first["next_cursor"]})
+    assert second.get_json()["items"][0]["id"] == 15
+
+
+def test_export_json_list(paginate_app):
+    app, imp, db, Order = paginate_app
+
+    @app.route("/orders.json")
+    def orders_json():
+        return imp.export_model_response("Order", fmt="json", batch_size=10)
+
+    response = app.test_client().get("/orders.json")
+    assert response.is_streamed
+    assert response.mimetype == "application/json"
+    assert [order["id"] for order in json.loads(response.data)] == list(range(1, 26))
+
+    with app.app_context():
+        db.session.execute(db.delete(Order))
+        db.session.commit()
+        assert json.loads("".join(imp.export_model("Order", fmt="json"))) == []
@@ -0,0 +1,103 @@
+import gc
+import os
+import sys
+import weakref
+from pathlib import Path
+
+import pytest
+from flask_sqlalchemy import SQLAlchemy
+
+from flask_imp import Imp
+from flask_imp.config import SQLiteDatabaseConfig
+
+FILES = {
+    "templates/index.html": "{% for i in range(3) %}{{ i }}{% endfor %}",
+    "templates/broken.html": "{% for %}",
+    "blueprints/admin/__init__.py": """
+        from flask_imp import ImpBlueprint
+        from flask_imp.config import ImpBlueprintConfig
+
+        bp = ImpBlueprint(__name__, ImpBlueprintConfig())
+    """,
+}
+
+
+@pytest.fixture()
+def preloaded_app(tmp_package, make_app):
+    name, _ = tmp_package(FILES)
+    app, imp = make_app(name, database_main=SQLiteDatabaseConfig())
+    db = SQLAlchemy(app)
+
+    class Thing(db.Model):
+        id = db.Column(db.Integer, primary_key=True)
+
+    imp.lazy_import_blueprint("blueprints/admin")
+    yield app, imp, db
+    gc.unfreeze()
+
+
+def test_preload(preloaded_app):
+    app, imp, _ = preloaded_app
+    report = imp.preload()
+
+    assert f"{app.name}.blueprints.admin" in sys.modules
+    assert report["templates"] == 1
+    assert report["frozen_objects"] == gc.get_freeze_count() > 0
+    assert imp.preload() is report
+
+    with app.test_request_context("/"):
+        assert app.jinja_env.cache
+        assert len(app.jinja_env.cache) == 1
+
+
+def test_post_fork_replaces_engine_pools(preloaded_app):
+    app, imp, db = preloaded_app
+
+    with app.app_context():
+        pool = db.engine.pool
+        imp.post_fork()
+        assert db.engine.pool is not pool
+
+
+def test_preload_config_registers_fork_hooks(make_app, monkeypatch, caplog):
+    hooks = {}
+    monkeypatch.setattr(os, "register_at_fork", lambda **kwargs: hooks.update(kwargs))
+
+    def _imp():
+        return make_app(__name__, preload=True)[1]
+
+    # the hooks do not keep the Imp instance alive
+    imp_ref = weakref.ref(_imp())
+    gc.collect()
+    assert imp_ref() is None
+    hooks["before"]()
+    hooks["after_in_child"]()
+
+    # and log errors, Python would print and ignore them
+    imp = _imp()
+    monkeypatch.setattr(imp, "preload", lambda: 1 / 0)
+    hooks["before"]()
+    assert "Imp.preload() failed in a fork hook" in caplog.text
+
+
+def test_post_fork_runs_once_per_process(preloaded_app, monkeypatch):
+    app, imp, db = preloaded_app
+
+    with app.app_context():
+        imp.post_fork()
+        pool = db.engine.pool
+        imp.post_fork()
+        assert db.engine.pool is pool
+
+        monkeypatch.setattr(os, "getpid", lambda: -1)
+        imp.post_fork()
+        assert db.engine.pool is not pool
+
+
+@pytest.mark.skipif(
+    not Path("/proc/self/smaps_rollup").exists(), reason="requires smaps_rollup"
+)
+def test_memory_usage():
+    usage = Imp.memory_usage()
+    assert usage["rss"] > 0
+    assert usage["shared"] + usage["private"] == usage["rss"]
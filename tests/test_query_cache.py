@@ -0,0 +1,227 @@
+import pytest
+from sqlalchemy import event
+
+from flask_imp import Imp
+from flask_imp.config import ImpConfig, SQLiteDatabaseConfig
+
+FILES = {
+    "__init__.py": """
+        from flask_sqlalchemy import SQLAlchemy
+
+        db = SQLAlchemy()
+    """,
+    "models.py": """
+        from . import db
+
+
+        class Author(db.Model):
+            id = db.Column(db.Integer, primary_key=True)
+            name = db.Column(db.String(50))
+
+
+        class Book(db.Model):
+            id = db.Column(db.Integer, primary_key=True)
+            title = db.Column(db.String(50))
+            author_id = db.Column(db.ForeignKey("author.id"))
+            author = db.relationship(Author, backref="books")
+
+
+        class Order(db.Model):
+            id = db.Column(db.Integer, primary_key=True)
+    """,
+}
+
+
+@pytest.fixture
+def package(tmp_package):
+    name, _ = tmp_package(FILES)
+    return __import__(name)
+
+
+@pytest.fixture
+def create_app(package, make_app):
+    def _create_app(query_cache="memory", max_entries=1024):
+        app, imp = make_app(
+            package.__name__,
+            database_main=SQLiteDatabaseConfig(),
+            query_cache=query_cache,
+            query_cache_max_entries=max_entries,
+        )
+        imp.import_models("models.py")
+        package.db.init_app(app)
+        imp.cache_queries("Author", "Book")
+
+        with app.app_context():
+            package.db.create_all()
+
+        return app
+
+    return _create_app
+
+
+def _count_queries(app):
+    queries = []
+    with app.app_context():
+        engine = app.extensions["sqlalchemy"].engine
+
+    event.listen(engine, "before_cursor_execute", lambda *args: queries.append(args[2]))
+    return queries
+
+
+def _seed(app, db, models):
+    with app.app_context():
+        for name in ("Ann", "Bob"):
+            author = models.Author(name=name)
+            db.session.add(author)
+            db.session.add(models.Book(title=f"{name}'s book", author=author))
+        db.session.add(models.Order())
+        db.session.commit()
+
+
+def test_query_cache_hits_and_invalidation(package, create_app):
+    app = create_app()
+    imp = app.extensions["imp"]
+    db = package.db
+    models = __import__(f"{package.__name__}.models").models
+    Author, Book, Order = models.Author, models.Book, models.Order
+    _seed(app, db, models)
+    queries = _count_queries(app)
+
+    def names():
+        with app.app_context():
+            return [
+                author.name
+                for author in db.session.execute(db.select(Author).order_by(Author.id))
+                .scalars()
+                .all()
+            ]
+
+    assert names() == ["Ann", "Bob"]
+    assert names() == ["Ann", "Bob"]
+    assert len(queries) == 1
+
+    with app.app_context():
+        # lazy loads are cached per parent
+        titles = [book.author.name for book in db.session.scalars(db.select(Book))]
+        assert titles == ["Ann", "Bob"]
+        db.session.rollback()
+        titles = [book.author.name for book in db.session.scalars(db.select(Book))]
+        assert titles == ["Ann", "Bob"]
+
+        # the cached instances are merged into the session, and can be changed
+        author = db.session.get(Author, 1)
+        assert author.name == "Ann"
+        author.name = "Amy"
+        db.session.flush()
+        # reads of a table written to in the open transaction go to the database
+        assert db.session.scalar(db.select(Author.name).filter_by(id=1)) == "Amy"
+        db.session.commit()
+
+    queries.clear()
+    assert names() == ["Amy", "Bob"]
+    assert len(queries) == 1
+
+    # models that were not passed to cache_queries are not cached
+    with app.app_context():
+        db.session.scalars(db.select(Order)).all()
+        db.session.scalars(db.select(Order)).all()
+        db.session.scalars(db.select(Author).execution_options(imp_cache=False)).all()
+    assert len(queries) == 4
+
+    stats = imp.query_cache.stats()
+    assert stats["hits"] > 0
+    assert stats["misses"] > 0
+    assert stats["invalidations"] > 0
+    assert 0 < stats["hit_ratio"] < 1
+
+    imp.query_cache.clear()
+    assert imp.query_cache.stats()["entries"] == 0
+
+
+def test_query_cache_rollback_and_bulk_load(package, create_app):
+    app = create_app(max_entries=2)
+    imp = app.extensions["imp"]
+    db = package.db
+    models = __import__(f"{package.__name__}.models").models
+    Author = models.Author
+    _seed(app, db, models)
+
+    with app.app_context():
+        assert db.session.scalar(db.select(db.func.count(Author.id))) == 2
+
+        db.session.add(Author(name="Cat"))
+        db.session.flush()
+        db.session.rollback()
+        assert db.session.scalar(db.select(db.func.count(Author.id))) == 2
+
+        imp.bulk_load(Author, [{"name": "Dan"}])
+        assert db.session.scalar(db.select(db.func.count(Author.id))) == 3
+
+        for i in range(3):
+            db.session.scalars(db.select(Author).filter_by(id=i)).all()
+
+    stats = imp.query_cache.stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] > 0
+
+
+def test_query_cache_pending_changes_and_text(package, create_app):
+    app = create_app()
+    imp = app.extensions["imp"]
+    db = package.db
+    models = __import__(f"{package.__name__}.models").models
+    Author = models.Author
+    _seed(app, db, models)
+
+    with app.app_context():
+        assert len(db.session.scalars(db.select(Author)).all()) == 2
+        assert len(db.session.scalars(db.select(Author)).all()) == 2
+
+        # the cache is checked before autoflush, pending rows must not be missed
+        db.session.add(Author(name="Cy"))
+        assert len(db.session.scalars(db.select(Author)).all()) == 3
+        db.session.commit()
+        assert len(db.session.scalars(db.select(Author)).all()) == 3
+
+        # the tables written to by text() are not known, it writes to all of them
+        db.session.execute(db.text("delete from author where name = 'Cy'"))
+        db.session.commit()
+        assert len(db.session.scalars(db.select(Author)).all()) == 2
+
+    assert imp.query_cache.stats()["hits"] == 1
+
+
+def test_sqlite_query_cache_is_shared(package, create_app, tmp_path):
+    first = create_app(query_cache="sqlite")
+    second = create_app(query_cache="sqlite")
+    db = package.db
+    models = __import__(f"{package.__name__}.models").models
+    Author = models.Author
+    _seed(first, db, models)
+
+    assert (tmp_path / "instance" / "imp_query_cache.sqlite").exists()
+
+    def count(app):
+        with app.app_context():
+            return db.session.scalar(db.select(db.func.count(Author.id)))
+
+    queries = _count_queries(second)
+    assert count(first) == 2
+    assert count(second) == 2
+    assert queries == []
+
+    with first.app_context():
+        db.session.add(Author(name="Cat"))
+        db.session.commit()
+
+    assert count(second) == 3
+    assert len(queries) == 1
+    assert second.extensions["imp"].query_cache.stats()["hits"] == 1
+
+
+def test_query_cache_config():
+    with pytest.raises(ValueError):
+        ImpConfig(query_cache="redis")
+
+    with pytest.raises(RuntimeError):
+        Imp().cache_queries("Author")
@@ -0,0 +1,153 @@
+import logging
+
+import pytest
+
+from flask_imp.config import SQLiteDatabaseConfig
+
+FILES = {
+    "__init__.py": """
+        from flask_sqlalchemy import SQLAlchemy
+
+        db = SQLAlchemy()
+    """,
+    "models.py": """
+        from . import db
+
+
+        class Author(db.Model):
+            id = db.Column(db.Integer, primary_key=True)
+            name = db.Column(db.String(50))
+
+
+        class Book(db.Model):
+            id = db.Column(db.Integer, primary_key=True)
+            title = db.Column(db.String(50))
+            author_id = db.Column(db.ForeignKey("author.id"))
+            author = db.relationship(Author)
+
+
+        class Stock(db.Model):
+            __bind_key__ = "stock"
+            id = db.Column(db.Integer, primary_key=True)
+            count = db.Column(db.Integer)
+    """,
+    "blueprints/shop/__init__.py": """
+        from flask_imp import ImpBlueprint
+        from flask_imp.config import ImpBlueprintConfig
+
+        bp = ImpBlueprint(__name__, ImpBlueprintConfig(url_prefix="/shop"))
+
+
+        @bp.route("/books")
+        def books():
+            from ... import db
+            from ...models import Book, Stock
+
+            books = db.session.execute(db.select(Book)).scalars().all()
+            db.session.execute(db.select(Stock)).scalars().all()
+            return ", ".join(f"{book.title} by {book.author.name}" for book in books)
+
+
+        @bp.route("/books/joined")
+        def books_joined():
+            from ... import db
+            from ...models import Book
+
+            books = db.session.execute(
+                db.select(Book).options(db.selectinload(Book.author))
+            ).scalars().all()
+            return ", ".join(f"{book.title} by {book.author.name}" for book in books)
+    """,
+}
+
+
+@pytest.fixture
+def create_app(tmp_package, make_app):
+    name, _ = tmp_package(FILES)
+    db = __import__(name).db
+
+    def _create_app(debug=False):
+        app, imp = make_app(
+            name,
+            {"DEBUG": debug},
+            database_main=SQLiteDatabaseConfig(),
+            database_binds=[
+                SQLiteDatabaseConfig(bind_key="stock", database_name="stock")
+            ],
+            query_stats=True,
+            query_stats_repeat_threshold=3,
+        )
+        imp.import_models("models.py")
+        imp.import_blueprints("blueprints")
+        db.init_app(app)
+        Author, Book, Stock = (imp.model(ref) for ref in ("Author", "Book", "Stock"))
+
+        @app.route("/")
+        def index():
+            return str(db.session.execute(db.select(Author)).scalars().all())
+
+        with app.app_context():
+            db.create_all()
+            for author_name in ("Ann", "Bob", "Cat", "Dan"):
+                author = Author(name=author_name)
+                db.session.add(author)
+                db.session.add(Book(title=f"{author_name}'s book", author=author))
+                db.session.add(Stock(count=1))
+            db.session.commit()
+
+        return app
+
+    return _create_app
+
+
+def test_query_stats_headers_in_debug(create_app, caplog):
+    app = create_app(debug=True)
+    client = app.test_client()
+
+    with caplog.at_level(logging.WARNING):
+        response = client.get("/shop/books")
+
+    # the books, the stock on its bind, then one author per book
+    assert response.headers["X-Imp-Query-Count"] == "6"
+    assert float(response.headers["X-Imp-Query-Time"]) > 0
+    assert response.headers["Server-Timing"].startswith("db;dur=")
+    assert response.headers["X-Imp-N-Plus-One"] == "1"
+    assert "Possible N+1 query in shop.books, run 4 times" in caplog.text
+
+    response = client.get("/shop/books/joined")
+    assert response.headers["X-Imp-Query-Count"] == "2"
+    assert "X-Imp-N-Plus-One" not in response.headers
+
+
+def test_query_stats_report(create_app):
+    app = create_app()
+    imp = app.extensions["imp"]
+    client = app.test_client()
+
+    response = client.get("/shop/books")
+    assert "X-Imp-Query-Count" not in response.headers
+
+    client.get("/shop/books")
+    client.get("/shop/books/joined")
+    client.get("/")
+
+    report = imp.query_stats.report()
+    books = report["shop.books"]
+    assert books["blueprint"] == "shop"
+    assert books["requests"] == 2
+    assert books["queries"] == 12
+    assert books["max_queries"] == 6
+    assert books["n_plus_one_requests"] == 2
+    assert list(books["repeated"].values()) == [4]
+    assert "WHERE author.id = ?" in next(iter(books["repeated"]))
+
+    assert report["shop.books_joined"]["n_plus_one_requests"] == 0
+    assert report["index"]["blueprint"] is None
+
+    blueprints = imp.query_stats.report(group_by="blueprint")
+    assert blueprints["shop"]["requests"] == 3
+    assert blueprints["shop"]["queries"] == 14
+    assert blueprints["<app>"]["requests"] == 1
+
+    imp.query_stats.reset()
+    assert imp.query_stats.report() == {}
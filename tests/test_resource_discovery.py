@@ -0,0 +1,64 @@
+from flask_imp._utilities import discover_resources
+
+FILES = [
+    "root.py",
+    "root.txt",
+    "__init__.py",
+    ".hidden.py",
+    "routes/b.py",
+    "routes/a.py",
+    "routes/notes.md",
+    "routes/__init__.py",
+    "routes/.hidden.py",
+    "routes/package/__init__.py",
+    "cli/commands.py",
+    "cli/other.py",
+    ".hidden/secret.py",
+]
+
+
+def _tree(tmp_path):
+    for file in FILES:
+        path = tmp_path / file
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("")
+    return tmp_path
+
+
+def _names(tmp_path, scope_import):
+    paths, _ = discover_resources(tmp_path, scope_import)
+    return [path.relative_to(tmp_path).as_posix() for path in paths]
+
+
+def test_discover_default_scope(tmp_path):
+    _tree(tmp_path)
+    assert _names(tmp_path, {"*": ["*"]}) == [
+        "cli/commands.py",
+        "cli/other.py",
+        "root.py",
+        "routes/a.py",
+        "routes/b.py",
+    ]
+
+
+def test_discover_root_scope(tmp_path):
+    _tree(tmp_path)
+    assert _names(tmp_path, {".": ["*"]}) == ["root.py"]
+    assert _names(tmp_path, {".": ["routes"]}) == ["routes"]
+
+
+def test_discover_named_scope(tmp_path):
+    _tree(tmp_path)
+    assert _names(tmp_path, {"routes": ["*"]}) == ["routes/a.py", "routes/b.py"]
+    assert _names(tmp_path, {"routes": "b.py"}) == ["routes/b.py"]
+    assert _names(tmp_path, {"routes": ["package"]}) == ["routes/package"]
+    assert _names(tmp_path, {"cli": ["other.py"], "routes": ["a.py"]}) == [
+        "cli/other.py",
+        "routes/a.py",
+    ]
+
+
+def test_discover_scanned_folders(tmp_path):
+    _tree(tmp_path)
+    _, scanned = discover_resources(tmp_path, {"routes": ["*"]})
+    assert scanned == [tmp_path, tmp_path / "routes"]
@@ -0,0 +1,56 @@
+import pytest
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from flask_imp.config import DatabaseConfig, SQLiteDatabaseConfig
+
+
+def _pragma(connection, name):
+    return connection.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def test_sqlite_performance_profiles(make_app):
+    app, _ = make_app(
+        __name__,
+        database_main=SQLiteDatabaseConfig(
+            performance_profile="fast", pragmas={"cache_size": -2000}
+        ),
+        database_binds=[
+            SQLiteDatabaseConfig(bind_key="reports", performance_profile="readonly"),
+            DatabaseConfig(bind_key="legacy", database_name="legacy"),
+        ],
+    )
+    db = SQLAlchemy(app)
+
+    with app.app_context():
+        with db.engine.connect() as connection:
+            assert _pragma(connection, "journal_mode") == "wal"
+            assert _pragma(connection, "synchronous") == 1
+            assert _pragma(connection, "cache_size") == -2000
+            assert _pragma(connection, "temp_store") == 2
+            assert _pragma(connection, "foreign_keys") == 1
+            assert _pragma(connection, "busy_timeout") == 5000
+
+        with db.engines["reports"].connect() as connection:
+            assert _pragma(connection, "query_only") == 1
+            with pytest.raises(OperationalError):
+                connection.execute(text("create table t (id integer)"))
+
+        with db.engines["legacy"].connect() as connection:
+            assert _pragma(connection, "journal_mode") == "delete"
+
+
+def test_sqlite_pragma_validation():
+    with pytest.raises(ValueError):
+        SQLiteDatabaseConfig(performance_profile="turbo")
+
+    with pytest.raises(ValueError):
+        SQLiteDatabaseConfig(pragmas={"cache_size": "1; drop table users"})
+
+    config = SQLiteDatabaseConfig(
+        performance_profile="safe", connect_args={"timeout": 10}
+    )
+    assert config.pragmas["synchronous"] == "FULL"
+    assert config.engine_options["connect_args"]["timeout"] == 10
+    assert "factory" in config.engine_options["connect_args"]
@@ -0,0 +1,108 @@
+import json
+import os
+import tracemalloc
+
+from click.testing import CliRunner
+
+from flask_imp._cli import cli
+
+FILES = {
+    "__init__.py": """
+        from pathlib import Path
+
+        from flask import Flask
+        from flask_imp import Imp
+        from flask_imp.config import ImpConfig
+
+
+        def create_app(profile_startup=False):
+            app = Flask(__name__, instance_path=str(Path(__file__).parent / "instance"))
+            app.secret_key = "test"
+            imp = Imp(app, ImpConfig(profile_startup=profile_startup))
+            imp.import_resources()
+            imp.import_blueprints("blueprints")
+            imp.import_models("models")
+            return app
+    """,
+    "resources/routes.py": """
+        def include(app):
+            @app.route("/")
+            def index():
+                return "index"
+    """,
+    "blueprints/www/__init__.py": """
+        from flask_imp import ImpBlueprint
+        from flask_imp.config import ImpBlueprintConfig
+
+        bp = ImpBlueprint(__name__, ImpBlueprintConfig())
+        bp.import_resources("routes")
+    """,
+    "blueprints/www/routes/index.py": """
+        def include(bp):
+            @bp.route("/")
+            def index():
+                return "www"
+    """,
+    "models/things.py": """
+        class Thing:
+            __tablename__ = "thing"
+    """,
+}
+
+
+def _find(entry, kind, name):
+    if entry["kind"] == kind and entry["name"].endswith(name):
+        return entry
+    for child in entry["children"]:
+        if found := _find(child, kind, name):
+            return found
+    return None
+
+
+def test_startup_profile_tree(tmp_package):
+    name, _ = tmp_package(FILES)
+    package = __import__(name)
+
+    app = package.create_app(profile_startup=True)
+    app.extensions["imp"].startup_profile.stop()
+    report = app.extensions["imp"].startup_profile.as_dict()
+
+    blueprint = _find(report, "blueprint", "blueprints.www")
+    assert _find(blueprint, "import", "www.routes.index")
+    assert _find(blueprint, "factory", "www.routes.index.include")
+    assert _find(blueprint, "register", "www")
+    assert _find(report, "factory", "resources.routes.include")
+    assert _find(_find(report, "models", "models"), "import", "models.things")
+    assert report["seconds"] >= blueprint["seconds"]
+
+
+def test_startup_profile_stops_tracing_on_first_request(tmp_package):
+    name, _ = tmp_package(FILES)
+    app = __import__(name).create_app(profile_startup=True)
+
+    assert tracemalloc.is_tracing()
+    assert app.test_client().get("/").data == b"index"
+    assert not tracemalloc.is_tracing()
+
+
+def test_startup_profile_is_off_by_default(tmp_package):
+    name, _ = tmp_package(FILES)
+    app = __import__(name).create_app()
+    assert app.extensions["imp"].startup_profile is None
+
+
+def test_startup_profile_cli(tmp_package, tmp_path, monkeypatch):
+    name, _ = tmp_package(FILES)
+    monkeypatch.delenv("FLASK_IMP_PROFILE_STARTUP", raising=False)
+    json_file = tmp_path / "profile.json"
+
+    result = CliRunner().invoke(
+        cli, ["profile", "--app", f"{name}:create_app", "--json", str(json_file)]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert _find(json.loads(json_file.read_text()), "blueprint", "blueprints.www")
+
+    result = CliRunner().invoke(cli, ["profile", "--app", f"{name}:create_app"])
+    assert "factory: " in result.output
+    assert "FLASK_IMP_PROFILE_STARTUP" not in os.environ
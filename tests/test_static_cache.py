@@ -0,0 +1,89 @@
+import os
+from pathlib import Path
+
+
+BLUEPRINT = """
+    from flask_imp import ImpBlueprint
+    from flask_imp.config import ImpBlueprintConfig
+
+    bp = ImpBlueprint(__name__, ImpBlueprintConfig(static_folder="static"))
+"""
+
+
+def _boot(tmp_package, make_app, **config):
+    name, package_path = tmp_package(
+        {
+            "static/water.css": "body { color: red; }",
+            "static/large.js": "x" * 2048,
+            "blueprints/www/__init__.py": BLUEPRINT,
+            "blueprints/www/static/main.js": "console.log('www');",
+        }
+    )
+    app, imp = make_app(
+        name, static_cache=True, static_cache_max_file_size=1024, **config
+    )
+    imp.import_blueprints("blueprints")
+    return app, imp, package_path
+
+
+def test_static_cache_serves_from_memory(tmp_package, make_app):
+    app, imp, package_path = _boot(tmp_package, make_app)
+    client = app.test_client()
+    cache = imp.static_files.cache
+
+    response = client.get("/static/water.css")
+    assert response.data == b"body { color: red; }"
+    assert response.mimetype == "text/css"
+    etag = response.headers["ETag"]
+    assert not etag.startswith("W/")
+    assert response.last_modified is not None
+
+    # served from memory, without touching the disk
+    (package_path / "static" / "water.css").unlink()
+
+    response = client.get("/static/water.css", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.data == b""
+
+    response = client.get("/static/water.css")
+    assert response.data == b"body { color: red; }"
+
+    client.get("/www/static/main.js")
+    assert cache.hits == 2
+    assert len(cache) == 2
+
+
+def test_static_cache_skips_large_files(tmp_package, make_app):
+    app, imp, _ = _boot(tmp_package, make_app)
+    client = app.test_client()
+
+    assert client.get("/static/large.js").data == b"x" * 2048
+    assert len(imp.static_files.cache) == 0
+    assert client.get("/static/missing.js").status_code == 404
+
+
+def test_static_cache_is_bounded(tmp_package, make_app):
+    app, imp, _ = _boot(tmp_package, make_app, static_cache_max_entries=1)
+    client = app.test_client()
+
+    client.get("/static/water.css")
+    client.get("/www/static/main.js")
+
+    assert len(imp.static_files.cache) == 1
+
+
+def test_static_cache_reloads_changed_files_in_debug(tmp_package, make_app):
+    app, _, package_path = _boot(tmp_package, make_app)
+    client = app.test_client()
+    css = Path(package_path / "static" / "water.css")
+
+    etag = client.get("/static/water.css").headers["ETag"]
+    css.write_text("body { color: blue; }")
+    os.utime(css, ns=(css.stat().st_atime_ns, css.stat().st_mtime_ns + 10**9))
+
+    assert client.get("/static/water.css").headers["ETag"] == etag
+
+    app.debug = True
+    response = client.get("/static/water.css", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.data == b"body { color: blue; }"
@@ -0,0 +1,144 @@
+import gzip
+import json
+
+import pytest
+from click.testing import CliRunner
+from flask import render_template_string
+
+from flask_imp._cli import cli
+from flask_imp.utilities import static_url_for
+
+CSS = "body { color: red; }\n" * 50
+
+FILES = {
+    "static/css/main.css": CSS,
+    "static/img/logo.png": "not really a png",
+    "blueprints/shop/__init__.py": """
+        from flask import render_template_string
+        from flask_imp import ImpBlueprint
+        from flask_imp.config import ImpBlueprintConfig
+
+        bp = ImpBlueprint(__name__, ImpBlueprintConfig(static_folder="static"))
+
+        @bp.route("/")
+        def index():
+            return render_template_string(
+                "{{ static_url_for('.static', filename='main.js') }}"
+            )
+    """,
+    "blueprints/shop/static/main.js": "console.log('shop');\n" * 50,
+}
+
+
+@pytest.fixture()
+def static_app(tmp_package, make_app):
+    name, package_path = tmp_package(FILES)
+    app, imp = make_app(name, static_fingerprints=True)
+    imp.import_blueprints("blueprints")
+    # loaded by the CLI test with --app
+    __import__(name).app = app
+    return app, imp, package_path
+
+
+def test_fingerprint_static(static_app, tmp_path):
+    _, imp, package_path = static_app
+    files = imp.fingerprint_static()
+
+    css = files["static"]["css/main.css"]
+    assert (
+        css.startswith("css/main.") and css.endswith(".css") and css != "css/main.css"
+    )
+    assert (package_path / "static" / css).read_text() == CSS
+    assert gzip.decompress((package_path / "static" / f"{css}.gz").read_bytes()) == (
+        CSS.encode()
+    )
+    assert not (
+        package_path / "static" / f"{files['static']['img/logo.png']}.gz"
+    ).exists()
+    assert "shop.static" in files
+
+    # Running again does not fingerprint the fingerprinted copies.
+    assert imp.fingerprint_static() == files
+
+    manifest = json.loads(
+        (tmp_path / "instance" / "imp_static_manifest.json").read_text()
+    )
+    assert manifest["files"] == files
+
+
+def test_static_url_for_and_serving(static_app):
+    app, imp, _ = static_app
+    files = imp.fingerprint_static()
+    css = files["static"]["css/main.css"]
+    client = app.test_client()
+
+    with app.test_request_context("/"):
+        assert static_url_for("static", filename="css/main.css") == f"/static/{css}"
+        assert static_url_for("static", filename="missing.css") == "/static/missing.css"
+        assert (
+            render_template_string(
+                "{{ static_url_for('static', filename='css/main.css') }}"
+            )
+            == f"/static/{css}"
+        )
+
+    js = files["shop.static"]["main.js"]
+    assert client.get("/shop/").data.decode() == f"/shop/static/{js}"
+
+    response = client.get(f"/static/{css}", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.mimetype == "text/css"
+    assert "Accept-Encoding" in response.vary
+    assert response.cache_control.immutable
+    assert response.cache_control.max_age == 31536000
+    assert gzip.decompress(response.data).decode() == CSS
+
+    response = client.get(f"/static/{css}")
+    assert "Content-Encoding" not in response.headers
+    assert response.data.decode() == CSS
+
+    response = client.get(f"/shop/static/{js}", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+
+    response = client.get("/static/css/main.css")
+    assert response.status_code == 200
+    assert not response.cache_control.immutable
+
+
+def test_static_cli(static_app, tmp_path):
+    app, _, _ = static_app
+
+    result = CliRunner().invoke(cli, ["static", "--app", f"{app.import_name}:app"])
+
+    assert result.exit_code == 0, result.output
+    assert "2 files (1 gzipped) in static" in result.output
+    assert (tmp_path / "instance" / "imp_static_manifest.json").exists()
+
+
+def test_static_before_request_handlers_run(static_app):
+    app, imp, _ = static_app
+    css = imp.fingerprint_static()["static"]["css/main.css"]
+
+    @app.before_request
+    def guard():
+        return "denied", 403
+
+    response = app.test_client().get(f"/static/{css}")
+    assert response.status_code == 403
+
+
+def test_fingerprint_static_prunes_old_copies(static_app):
+    _, imp, package_path = static_app
+    static = package_path / "static"
+
+    first = imp.fingerprint_static()["static"]["css/main.css"]
+    (static / "css" / "main.css").write_text("body { color: blue; }\n" * 50)
+    second = imp.fingerprint_static()["static"]["css/main.css"]
+    (static / "css" / "main.css").write_text("body { color: green; }\n" * 50)
+    third = imp.fingerprint_static()["static"]["css/main.css"]
+
+    # the copies of the previous build are kept, older ones are removed
+    assert not (static / first).exists()
+    assert not (static / f"{first}.gz").exists()
+    assert (static / second).exists() and (static / f"{second}.gz").exists()
+    assert (static / third).exists() and (static / f"{third}.gz").exists()
@@ -0,0 +1,99 @@
+import pytest
+
+from flask_imp.config import ImpBlueprintConfig
+
+BLUEPRINT = """
+    from flask_imp import ImpBlueprint
+    from flask_imp.config import ImpBlueprintConfig
+
+    bp = ImpBlueprint(
+        __name__,
+        ImpBlueprintConfig(
+            static_folder="static",
+            static_offload={offload!r},
+            static_offload_location={location!r},
+            static_offload_min_size=1024,
+        ),
+    )
+"""
+
+
+def _boot(tmp_package, make_app, offload, location=None, **config):
+    name, package_path = tmp_package(
+        {
+            "static/app.iso": "x" * 4096,
+            "blueprints/downloads/__init__.py": BLUEPRINT.format(
+                offload=offload, location=location
+            ),
+            "blueprints/downloads/static/large file.iso": "x" * 4096,
+            "blueprints/downloads/static/small.txt": "small",
+        }
+    )
+    app, imp = make_app(name, **config)
+    imp.import_blueprints("blueprints")
+    return app, package_path
+
+
+def test_x_accel_redirect(tmp_package, make_app):
+    app, _ = _boot(tmp_package, make_app, "X-Accel-Redirect", "/_internal/downloads/")
+    client = app.test_client()
+
+    response = client.get("/downloads/static/large file.iso")
+    assert response.status_code == 200
+    assert response.headers["X-Accel-Redirect"] == (
+        "/_internal/downloads/large%20file.iso"
+    )
+    assert response.content_length == 4096
+    assert response.last_modified is not None
+    assert response.data == b""
+
+    # smaller than the threshold, served by the app
+    response = client.get("/downloads/static/small.txt")
+    assert "X-Accel-Redirect" not in response.headers
+    assert response.data == b"small"
+    response.close()
+
+    # the app static folder is not offloaded
+    response = client.get("/static/app.iso")
+    assert "X-Accel-Redirect" not in response.headers
+    response.close()
+
+    assert client.get("/downloads/static/missing.iso").status_code == 404
+
+
+def test_x_sendfile(tmp_package, make_app):
+    app, package_path = _boot(tmp_package, make_app, "x-sendfile")
+
+    response = app.test_client().get("/downloads/static/large file.iso")
+    assert response.headers["X-Sendfile"] == str(
+        package_path / "blueprints" / "downloads" / "static" / "large file.iso"
+    )
+    assert response.data == b""
+
+
+def test_offload_with_static_cache(tmp_package, make_app):
+    app, _ = _boot(
+        tmp_package,
+        make_app,
+        "x-accel-redirect",
+        "/_internal/downloads",
+        static_cache=True,
+    )
+    client = app.test_client()
+
+    response = client.get("/downloads/static/large file.iso")
+    assert response.headers["X-Accel-Redirect"] == (
+        "/_internal/downloads/large%20file.iso"
+    )
+
+    response = client.get("/downloads/static/small.txt")
+    assert "X-Accel-Redirect" not in response.headers
+    assert response.data == b"small"
+
+
+def test_offload_config_validation():
+    with pytest.raises(ValueError):
+        ImpBlueprintConfig(static_offload="x-lighttpd-send-file")
+
+    with pytest.raises(ValueError):
+        ImpBlueprintConfig(static_offload="x-accel-redirect")
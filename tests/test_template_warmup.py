@@ -0,0 +1,76 @@
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from flask_imp._cli import cli
+
+FILES = {
+    "templates/index.html": "{% include 'includes/header.html' %}",
+    "templates/includes/header.html": "<h1>{{ title }}</h1>",
+    "templates/broken.html": "{% if %}",
+    "blueprints/shop/__init__.py": """
+        from flask_imp import ImpBlueprint
+        from flask_imp.config import ImpBlueprintConfig
+
+        bp = ImpBlueprint(__name__, ImpBlueprintConfig(template_folder="templates"))
+    """,
+    "blueprints/shop/templates/shop/index.html": "{{ bp_name }}",
+}
+
+
+@pytest.fixture()
+def create_app(tmp_package, make_app):
+    name, _ = tmp_package(FILES)
+
+    def _create_app(template_bytecode_cache=True):
+        app, imp = make_app(name, template_bytecode_cache=template_bytecode_cache)
+        imp.import_blueprints("blueprints")
+        return app
+
+    return _create_app
+
+
+def test_warm_templates(create_app, tmp_path):
+    app = create_app()
+    report = app.extensions["imp"].warm_templates()
+
+    assert report["templates"] == 3
+    assert report["errors"] == ["broken.html"]
+    assert report["folders"] == {app.import_name: 3, "shop": 1}
+    assert report["seconds"] > 0
+
+    cache_folder = tmp_path / "instance" / "jinja_bytecode_cache"
+    assert len(list(cache_folder.iterdir())) == 3
+
+
+def test_template_bytecode_cache_is_used(create_app):
+    create_app().extensions["imp"].warm_templates()
+
+    app = create_app()
+    with app.app_context():
+        assert app.jinja_env.bytecode_cache is not None
+        assert app.jinja_env.get_template("shop/index.html").render(bp_name="x") == "x"
+
+
+def test_template_bytecode_cache_is_off_by_default(create_app):
+    app = create_app(template_bytecode_cache=False)
+    assert app.jinja_env.bytecode_cache is None
+
+
+def test_templates_cli(create_app, tmp_path):
+    app = create_app()
+    # loaded by the CLI with --app
+    __import__(app.import_name).app = app
+    json_file = tmp_path / "templates.json"
+
+    result = CliRunner().invoke(cli, ["templates", "--app", f"{app.import_name}:app"])
+    assert result.exit_code == 0, result.output
+    assert "Compiled 3 templates" in result.output
+    assert "broken.html" in result.output
+
+    result = CliRunner().invoke(
+        cli, ["templates", "--app", f"{app.import_name}:app", "--json", str(json_file)]
+    )
+    assert json.loads(Path(json_file).read_text())["templates"] == 3